@@ -10,16 +10,21 @@ from quiver.airframe_structure.beams.assembly import make_assembly as beams
 from quiver.airframe_structure.landing_gear.assembly import make_assembly as landing_gear
 from quiver.airframe_structure.motor_arm.assembly import make_assembly as motor_arm
 
+LABEL = "Airframe Structure"
+
+# Subcategory builders, keyed by BOM number
+SUBASSEMBLIES = {
+    1100: plates,
+    1200: beams,
+    1300: landing_gear,
+    1400: motor_arm,
+}
+
 
 def make_assembly() -> Compound | None:
     """Build the complete airframe structure from all subcategories."""
-    subassemblies = [
-        plates(),
-        beams(),
-        landing_gear(),
-        motor_arm(),
-    ]
+    subassemblies = [build() for build in SUBASSEMBLIES.values()]
     children = [s for s in subassemblies if s is not None]
     if not children:
         return None
-    return Compound(children=children, label="Airframe Structure")
+    return Compound(children=children, label=LABEL)
@@ -50,9 +50,18 @@ Generated parts:
 import math
 from pathlib import Path
 
-from build123d import Axis, Compound, Cylinder, Location, Part
-
-from quiver.common import ALUMINUM, CARBON_FIBER, FOAM, PETG, load_step
+from build123d import Axis, Compound, Location
+
+from quiver.common import (
+    ALUMINUM,
+    CARBON_FIBER,
+    FOAM,
+    PETG,
+    load_step,
+    make_tube,
+    place,
+    rotate_instance,
+)
 
 _DIR = Path(__file__).parent
 
@@ -94,6 +103,28 @@ _HORIZ_TUBE_Z = -527.89 # Z position
 # Foam sleeves sit near the ends of each horizontal tube
 _FOAM_Y = 217.00    # 250 - 66/2: flush with tube ends
 
+
+def _leg_offset(x: float, z: float) -> tuple[float, float]:
+    """Express a right-leg point as (along, across) the leg axis from the adapter.
+
+    Uses the tilt the positions above were measured at, so that
+    _on_leg() reproduces them exactly at that tilt.
+    """
+    tilt = math.radians(_TILT_ANGLE)
+    dx, dz = x - _ADAPTER_X, z - _ADAPTER_Z
+    return (
+        dx * math.sin(tilt) - dz * math.cos(tilt),
+        dx * math.cos(tilt) + dz * math.sin(tilt),
+    )
+
+
+# The leg parts below the adapter, in the leg frame. The leg pivots about
+# the adapter center, so overriding _TILT_ANGLE (quiver.sweep) swings the
+# tube, joint, horizontal tubes and foam sleeves with it.
+_VERT_TUBE_OFFSET = _leg_offset(_VERT_TUBE_X, _VERT_TUBE_Z)
+_JOINT_OFFSET = _leg_offset(_JOINT_X, _JOINT_Z)
+_HORIZ_TUBE_OFFSET = _leg_offset(_HORIZ_TUBE_X, _HORIZ_TUBE_Z)
+
 # Corner definitions: (X sign, Y sign)
 _CORNERS = [
     ( 1,  1),   # FR -- front right
@@ -103,37 +134,48 @@ _CORNERS = [
 ]
 
 
-def _make_tube(length: float, label: str) -> Part:
+def _make_tube(length: float, label: str) -> Compound:
     """Generate a carbon-fiber tube (hollow cylinder, centered at origin)."""
-    outer = Cylinder(radius=_TUBE_OD / 2, height=length)
-    inner = Cylinder(radius=_TUBE_OD / 2 - _TUBE_WALL, height=length)
-    tube = outer - inner
+    tube = make_tube(_TUBE_OD, _TUBE_WALL, length)
     tube.label = label
     return tube
 
 
+def _on_leg(offset: tuple[float, float]) -> tuple[float, float]:
+    """Return the right-leg (X, Z) of a leg-frame offset at the current _TILT_ANGLE."""
+    along, across = offset
+    tilt = math.radians(_TILT_ANGLE)
+    return (
+        _ADAPTER_X + along * math.sin(tilt) + across * math.cos(tilt),
+        _ADAPTER_Z - along * math.cos(tilt) + across * math.sin(tilt),
+    )
+
+
 def make_assembly() -> Compound | None:
     """Build the landing gear subassembly from imported STEP files."""
     children = []
+    vert_tube_x, vert_tube_z = _on_leg(_VERT_TUBE_OFFSET)
+    joint_x, joint_z = _on_leg(_JOINT_OFFSET)
+    horiz_tube_x, horiz_tube_z = _on_leg(_HORIZ_TUBE_OFFSET)
 
     for sx, sy in _CORNERS:
         # --- Main adapter (vendor, bolted to lower plate) ---
         # The STEP file is exported at a neutral orientation. We first
         # rotate it into the XZ plane (rotZ), then tilt it to match the
         # leg angle (rotY). Because the STEP geometry isn't centered at
-        # the origin, the rotation shifts the center of mass — so we
-        # compute the actual CoM after rotation and correct the offset.
+        # the origin, the rotation shifts the center of mass — so place()
+        # moves the rotated part's CoM onto the target position.
         adapter = load_step(_DIR, "1330_main_adapter", vendor=True)
         if adapter:
             adapter.color = ALUMINUM
-            adapter = adapter.rotate(Axis.Z, 90 * sx)
-            adapter = adapter.rotate(Axis.Y, -_TILT_ANGLE * sx)
-            com = adapter.center()
-            adapter.move(Location((
-                sx * _ADAPTER_X - com.X,
-                sy * _LEG_Y - com.Y,
-                _ADAPTER_Z - com.Z,
-            )))
+            adapter = place(
+                adapter,
+                rotations=[
+                    (Axis.Z, 90 * sx),
+                    (Axis.Y, -_TILT_ANGLE * sx),
+                ],
+                com=(sx * _ADAPTER_X, sy * _LEG_Y, _ADAPTER_Z),
+            )
             children.append(adapter)
 
         # --- Vertical tube (generated, angled outward) ---
@@ -141,11 +183,11 @@ def make_assembly() -> Compound | None:
         # so no CoM correction is needed — just tilt and translate.
         v_tube = _make_tube(_VERT_TUBE_LENGTH, "1310-VerticalTube")
         v_tube.color = CARBON_FIBER
-        v_tube = v_tube.rotate(Axis.Y, -_TILT_ANGLE * sx)
+        v_tube = rotate_instance(v_tube, Axis.Y, -_TILT_ANGLE * sx)
         v_tube.move(Location((
-            sx * _VERT_TUBE_X,
+            sx * vert_tube_x,
             sy * _LEG_Y,
-            _VERT_TUBE_Z,
+            vert_tube_z,
         )))
         children.append(v_tube)
 
@@ -154,39 +196,37 @@ def make_assembly() -> Compound | None:
         joint = load_step(_DIR, "1340_tube_joint")
         if joint:
             joint.color = PETG
-            joint = joint.rotate(Axis.Z, 90 * sx)
-            joint = joint.rotate(Axis.Y, -_TILT_ANGLE * sx)
-            com = joint.center()
-            joint.move(Location((
-                sx * _JOINT_X - com.X,
-                sy * _LEG_Y - com.Y,
-                _JOINT_Z - com.Z,
-            )))
+            joint = place(
+                joint,
+                rotations=[
+                    (Axis.Z, 90 * sx),
+                    (Axis.Y, -_TILT_ANGLE * sx),
+                ],
+                com=(sx * joint_x, sy * _LEG_Y, joint_z),
+            )
             children.append(joint)
 
     # --- Horizontal cross-tubes (generated, running front-to-back) ---
     for sx in [1, -1]:
         h_tube = _make_tube(_HORIZ_TUBE_LENGTH, "1320-HorizontalTube")
         h_tube.color = CARBON_FIBER
-        h_tube = h_tube.rotate(Axis.X, 90)  # orient along Y
+        h_tube = rotate_instance(h_tube, Axis.X, 90)  # orient along Y
         h_tube.move(Location((
-            sx * _HORIZ_TUBE_X,
+            sx * horiz_tube_x,
             0,
-            _HORIZ_TUBE_Z,
+            horiz_tube_z,
         )))
         children.append(h_tube)
 
     # --- Foam sleeves (generated, cushioning at landing points) ---
     # Cylindrical sleeves that wrap around the horizontal tubes near each leg.
     for sx, sy in _CORNERS:
-        foam_outer = Cylinder(radius=_FOAM_OD / 2, height=_FOAM_LENGTH)
-        foam_inner = Cylinder(radius=_TUBE_OD / 2, height=_FOAM_LENGTH)
-        foam = foam_outer - foam_inner
-        foam = foam.rotate(Axis.X, 90)  # orient along Y
+        foam = make_tube(_FOAM_OD, (_FOAM_OD - _TUBE_OD) / 2, _FOAM_LENGTH)
+        foam = rotate_instance(foam, Axis.X, 90)  # orient along Y
         foam.move(Location((
-            sx * _HORIZ_TUBE_X,
+            sx * horiz_tube_x,
             sy * _FOAM_Y,
-            _HORIZ_TUBE_Z,
+            horiz_tube_z,
         )))
         foam.label = "1350-Foam"
         foam.color = FOAM
@@ -27,9 +27,16 @@ Generated parts:
 
 from pathlib import Path
 
-from build123d import Axis, Compound, Cylinder, Location, Part
+from build123d import Axis, Compound, Location
 
-from quiver.common import ALUMINUM, CARBON_FIBER, load_step
+from quiver.common import (
+    ALUMINUM,
+    CARBON_FIBER,
+    load_step,
+    make_tube,
+    place,
+    rotate_instance,
+)
 
 _DIR = Path(__file__).parent
 
@@ -51,12 +58,11 @@ _ARM_POSITIONS = [
 ]
 
 
-def _make_arm_tube() -> Part:
+def _make_arm_tube() -> Compound:
     """Generate a carbon-fiber arm tube (hollow cylinder along Y)."""
-    outer = Cylinder(radius=_TUBE_OD / 2, height=_TUBE_LENGTH, align=None)
-    inner = Cylinder(radius=_TUBE_OD / 2 - _TUBE_WALL, height=_TUBE_LENGTH, align=None)
-    tube = outer - inner
-    tube = tube.rotate(Axis.X, -90)
+    tube = make_tube(_TUBE_OD, _TUBE_WALL, _TUBE_LENGTH)
+    # Start the tube at the origin rather than centering it, then lay it along +Y
+    tube = place(tube, rotations=[(Axis.X, -90)], origin=(0, 0, -_TUBE_LENGTH / 2))
     tube.label = "1412-Arm"
     return tube
 
@@ -69,13 +75,13 @@ def make_assembly() -> Compound | None:
         connector = load_step(_DIR, "1411_arm_connector", vendor=True)
         if connector:
             connector.color = ALUMINUM
-            connector = connector.rotate(Axis.Z, angle)
+            connector = rotate_instance(connector, Axis.Z, angle)
             connector.move(Location((sx * _CONNECTOR_OFFSET, sy * _CONNECTOR_OFFSET, 0)))
             children.append(connector)
 
         tube = _make_arm_tube()
         tube.color = CARBON_FIBER
-        tube = tube.rotate(Axis.Z, angle)
+        tube = rotate_instance(tube, Axis.Z, angle)
         tube.move(Location((sx * _TUBE_OFFSET, sy * _TUBE_OFFSET, 0)))
         children.append(tube)
 
@@ -21,50 +21,19 @@ Expected STEP files in steps/:
     1111_upper_plate.step       1mm aluminum upper plate (300x300mm)
     1112_middle_plate.step      1mm aluminum middle plate (300x300mm)
     1113_lower_plate.step       4mm aluminum lower plate (300x300mm)
+
+Part placements are listed in parts.toml (see quiver.manifest).
 """
 
 from pathlib import Path
 
-from build123d import Compound, Location
+from build123d import Compound
 
-from quiver.common import ALUMINUM, load_step
+from quiver.manifest import build_from_manifest
 
 _DIR = Path(__file__).parent
 
-# Z positions for each plate (bottom surface, measured from drone center)
-UPPER_PLATE_Z = 20      # top of beam sandwich
-MIDDLE_PLATE_Z = -21     # bottom of beam sandwich
-LOWER_PLATE_Z = -125     # below battery compartment
-
-# The STEP files have baked-in Z offsets from the Fusion 360 export.
-# We undo those and reapply the correct positions explicitly.
-# All offsets reference the bottom surface of each plate.
-_UPPER_STEP_OFFSET = 20   # STEP file is at Z=20..21
-_MIDDLE_STEP_OFFSET = -21  # STEP file is at Z=-21..-20
-_LOWER_STEP_OFFSET = -20   # STEP file is at Z=-20..-16
-
 
 def make_assembly() -> Compound | None:
-    """Build the plates subassembly from imported STEP files."""
-    upper = load_step(_DIR, "1111_upper_plate")
-    middle = load_step(_DIR, "1112_middle_plate")
-    lower = load_step(_DIR, "1113_lower_plate")
-
-    children = []
-
-    if upper:
-        upper.color = ALUMINUM
-        dz = UPPER_PLATE_Z - _UPPER_STEP_OFFSET
-        children.append(upper.move(Location((0, 0, dz))))
-    if middle:
-        middle.color = ALUMINUM
-        dz = MIDDLE_PLATE_Z - _MIDDLE_STEP_OFFSET
-        children.append(middle.move(Location((0, 0, dz))))
-    if lower:
-        lower.color = ALUMINUM
-        dz = LOWER_PLATE_Z - _LOWER_STEP_OFFSET
-        children.append(lower.move(Location((0, 0, dz))))
-
-    if not children:
-        return None
-    return Compound(children=children, label="Plates")
+    """Build the plates subassembly from its placement manifest."""
+    return build_from_manifest(_DIR)
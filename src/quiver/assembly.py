@@ -7,64 +7,258 @@ the full assembly or view it in ocp-vscode.
 Usage:
     python -m quiver.assembly              # export full assembly STEP
     python -m quiver.assembly --show       # open in ocp-vscode viewer
+    python -m quiver.assembly --no-cache   # re-parse every STEP file
+    python -m quiver.assembly --no-instancing  # write every part's geometry
+    python -m quiver.assembly --jobs 8     # build subassemblies in parallel
+    python -m quiver.assembly --only 1300,3100 --show  # build a subset
+    python -m quiver.assembly --stream     # one STEP file per subassembly, one at a time
+    python -m quiver.assembly --profile trace.json  # write timing spans
+    python -m quiver.assembly --show --lod coarse   # fastest viewing
+    python -m quiver.assembly --glb        # export a meshed GLB for viewers
 """
 
 import argparse
+import os
 from pathlib import Path
 
 from build123d import Compound, export_step
 
-from quiver.airframe_structure.assembly import make_assembly as airframe_structure
-from quiver.supporting_structure.assembly import make_assembly as supporting_structure
-from quiver.equipment.assembly import make_assembly as equipment
-from quiver.harness.assembly import make_assembly as harness
+from quiver import profiling
+from quiver.common import LODS, use_lod
+from quiver.build import (
+    LazyAssembly,
+    build_parallel,
+    build_serial,
+    lazy_tree,
+    stream_leaves,
+)
+from quiver.export import export_step_instanced, export_step_streamed
+from quiver.mesh import export_glb, mesh_assembly
+
+import quiver.airframe_structure.assembly as airframe_structure
+import quiver.supporting_structure.assembly as supporting_structure
+import quiver.equipment.assembly as equipment
+import quiver.harness.assembly as harness
 
 EXPORT_DIR = Path(__file__).parent.parent / "export"
 
+LABEL = "Quiver Drone"
+
+_NO_PARTS = (
+    "No STEP files found in any subassembly. "
+    "Export parts from Fusion 360 and place them in the "
+    "appropriate steps/ directories."
+)
+
+# BOM categories, keyed by BOM number
+CATEGORIES = {
+    1000: airframe_structure,
+    2000: supporting_structure,
+    3000: equipment,
+    4000: harness,
+}
+
+
+def assembly_tree() -> LazyAssembly:
+    """Return the drone's BOM tree without building any geometry."""
+    return lazy_tree(LABEL, CATEGORIES)
+
+
+def selected_tree(only: list[int] | None) -> LazyAssembly:
+    """Return the BOM tree, pruned to `only` when given.
+
+    Raises:
+        ValueError: If `only` names a BOM number that isn't in the tree.
+    """
+    tree = assembly_tree()
+    if only:
+        unknown = set(only) - set(tree.boms())
+        if unknown:
+            raise ValueError(
+                f"Unknown BOM numbers {sorted(unknown)}; "
+                f"choose from {sorted(tree.boms())}"
+            )
+        tree = tree.select(set(only))
+    return tree
+
+
+def make_assembly(
+    jobs: int = 1,
+    only: list[int] | None = None,
+    lod: str | None = None,
+) -> Compound | None:
+    """Build the complete Quiver drone assembly.
+
+    Args:
+        jobs: Number of worker processes. With more than one, every leaf
+            subassembly is built in its own process and the hierarchy is
+            recomposed in this one.
+        only: BOM numbers to build (e.g. [1300, 3100]). A category number
+            selects all of its subcategories. Everything else is skipped
+            without loading any STEP files.
+        lod: Level of detail ("full", "medium" or "coarse", see
+            quiver.common.current_lod). None keeps the current tier.
+
+    Raises:
+        ValueError: If `only` names a BOM number that isn't in the tree.
+    """
+    tree = selected_tree(only)
+    with use_lod(lod):
+        if jobs > 1:
+            return build_parallel(tree, jobs)
+        return build_serial(tree)
+
 
-def make_assembly() -> Compound | None:
-    """Build the complete Quiver drone assembly."""
-    subassemblies = [
-        airframe_structure(),
-        supporting_structure(),
-        equipment(),
-        harness(),
-    ]
-    children = [s for s in subassemblies if s is not None]
-    if not children:
-        return None
-    return Compound(children=children, label="Quiver Drone")
+def _default_path(only: list[int] | None, lod: str, suffix: str) -> Path:
+    """Name an export after the selected BOMs and, unless full, the LOD."""
+    name = "quiver_assembly" if not only else "quiver_" + "-".join(map(str, only))
+    if lod != "full":
+        name = f"{name}_{lod}"
+    return EXPORT_DIR / f"{name}{suffix}"
 
 
-def export(output: Path | None = None) -> Path:
-    """Export the full assembly as a STEP file."""
-    assembly = make_assembly()
+def export(
+    output: Path | None = None,
+    instancing: bool = True,
+    jobs: int = 1,
+    only: list[int] | None = None,
+    stream: bool = False,
+    lod: str = "full",
+) -> Path:
+    """Export the full assembly as a STEP file.
+
+    With instancing (the default), parts used more than once are written
+    as STEP product instances that reference one copy of the geometry.
+    Without it, every part is written out in full by build123d. With
+    `only`, just the selected BOM subtrees are built and exported.
+
+    With `stream`, leaf subassemblies are built and written one at a time
+    (always instanced, serially), each to its own STEP file named by BOM
+    number (e.g. 1300_landing_gear.step) in the `output` directory, and
+    released before the next, so peak memory follows the largest
+    subassembly.
+
+    The engineering export defaults to the "full" level of detail; other
+    tiers get a suffix in the default file or directory name.
+    """
+    EXPORT_DIR.mkdir(exist_ok=True)
+    out = output or _default_path(only, lod, "" if stream else ".step")
+    if stream:
+        with use_lod(lod):
+            leaves = stream_leaves(selected_tree(only))
+            written = bool(export_step_streamed(
+                ((f"{leaf.bom}_{leaf.label}", leaf.compound) for leaf in leaves), out
+            ))
+    else:
+        assembly = make_assembly(jobs, only, lod)
+        written = assembly is not None
+        with profiling.span("export_step", instancing=instancing):
+            if written and instancing:
+                export_step_instanced(assembly, out)
+            elif written:
+                export_step(assembly, str(out))
+    if not written:
+        raise RuntimeError(_NO_PARTS)
+    return out
+
+
+def export_mesh(
+    output: Path | None = None,
+    jobs: int = 1,
+    only: list[int] | None = None,
+    lod: str = "medium",
+) -> Path:
+    """Export the assembly as a binary glTF (GLB) file for fast viewing.
+
+    Each unique part is tessellated once (and cached), and every instance
+    is written as a node referencing that mesh; see quiver.mesh.
+    """
+    assembly = make_assembly(jobs, only, lod)
     if assembly is None:
-        raise RuntimeError(
-            "No STEP files found in any subassembly. "
-            "Export parts from Fusion 360 and place them in the "
-            "appropriate steps/ directories."
-        )
+        raise RuntimeError(_NO_PARTS)
     EXPORT_DIR.mkdir(exist_ok=True)
-    out = output or EXPORT_DIR / "quiver_assembly.step"
-    export_step(assembly, str(out))
+    out = output or _default_path(only, lod, ".glb")
+    with profiling.span("export_glb"):
+        export_glb(assembly, out)
     return out
 
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Quiver drone assembly")
     parser.add_argument("--show", action="store_true", help="Open in ocp-vscode viewer")
-    parser.add_argument("-o", "--output", type=Path, help="Output STEP file path")
+    parser.add_argument("-o", "--output", type=Path, help="Output file path")
+    parser.add_argument(
+        "--no-cache", action="store_true", help="Bypass the on-disk STEP geometry cache"
+    )
+    parser.add_argument(
+        "--no-instancing",
+        action="store_true",
+        help="Write repeated parts as full copies instead of STEP instances",
+    )
+    parser.add_argument(
+        "-j", "--jobs", type=int, default=1, help="Build subassemblies in N processes"
+    )
+    parser.add_argument(
+        "--only",
+        type=lambda s: [int(bom) for bom in s.split(",")],
+        metavar="BOM[,BOM...]",
+        help="Build only these BOM categories/subcategories (e.g. 1300,3100)",
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Write one STEP file per subassembly into the output directory, "
+        "building one at a time (serial and instanced only)",
+    )
+    parser.add_argument(
+        "--profile",
+        type=Path,
+        metavar="TRACE.json",
+        help="Record timing spans and write them as a Chrome trace",
+    )
+    parser.add_argument(
+        "--lod",
+        choices=LODS,
+        help="Level of detail (default: medium for --show, full for export)",
+    )
+    parser.add_argument(
+        "--glb",
+        action="store_true",
+        help="Export a tessellated GLB (default LOD medium) instead of STEP",
+    )
     args = parser.parse_args()
+    if args.stream and args.jobs > 1:
+        parser.error("--stream builds serially; it can't be combined with --jobs")
+    if args.stream and args.no_instancing:
+        parser.error("--stream always writes instances; it can't be combined with --no-instancing")
+
+    if args.no_cache:
+        os.environ["QUIVER_NO_CACHE"] = "1"
+    if args.profile:
+        os.environ["QUIVER_PROFILE"] = str(args.profile)
 
     if args.show:
         from ocp_vscode import show
 
-        assembly = make_assembly()
+        assembly = make_assembly(args.jobs, args.only, args.lod or "medium")
         if assembly is None:
             print("No parts loaded. Add STEP files to subassembly steps/ directories.")
         else:
-            show(assembly, deviation=0.5, angular_tolerance=0.5)
+            # Show the cached per-part meshes rather than re-meshing the B-rep
+            show(mesh_assembly(assembly))
+    elif args.glb:
+        out = export_mesh(args.output, args.jobs, args.only, args.lod or "medium")
+        print(f"Exported mesh to {out}")
     else:
-        out = export(args.output)
+        out = export(
+            args.output,
+            instancing=not args.no_instancing,
+            jobs=args.jobs,
+            only=args.only,
+            stream=args.stream,
+            lod=args.lod or "full",
+        )
         print(f"Exported assembly to {out}")
+
+    if profiling.enabled():
+        print(f"Wrote profile to {profiling.write_trace()}")
@@ -0,0 +1,282 @@
+"""Benchmarks for the load, flatten, place and export phases.
+
+Times every STEP file and every leaf subassembly of the drone and writes
+the results as JSON, so a change to the flattening code or a subassembly
+layout can be compared against a stored baseline.
+
+Per STEP file:
+    parse_s      import_step
+    flatten_s    placement baking (common._flatten)
+    extract_s    solid extraction and volume filtering (_flatten_solids,
+                 with the file's manifest filter options)
+    center_s     center of mass of the flattened shape
+    solids, faces, peak_mb
+
+Per leaf subassembly (keyed by BOM number):
+    build_s             make_assembly (loading, placing, composing)
+    export_s            build123d export_step of the subassembly
+    export_instanced_s  export_step_instanced of the subassembly
+    parts, solids, faces, peak_mb
+
+peak_mb is the peak resident set size during that entry. On Linux the
+high-water mark is reset before each entry; elsewhere it is the process
+peak so far and only meaningful for the first entries.
+
+The geometry cache is disabled unless --warm is given, so every run
+measures real STEP parsing.
+
+Usage:
+    python -m quiver.bench                          # print results
+    python -m quiver.bench -o bench.json            # save results
+    python -m quiver.bench --baseline bench.json    # exit 1 on regressions
+    python -m quiver.bench --only 3300 --repeat 3   # best of 3, PCBs only
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from importlib.metadata import PackageNotFoundError, version
+from pathlib import Path
+
+from build123d import Compound, export_step, import_step
+
+from quiver.assembly import selected_tree
+from quiver.build import LazyAssembly, module_dir
+from quiver.common import STEPS_DIR, VENDOR_DIR, _flatten, _flatten_solids, clear_part_cache
+from quiver.export import export_step_instanced
+from quiver.manifest import MANIFEST_FILE, load_manifest
+
+BENCH_VERSION = 1
+
+# Metrics compared against a baseline, with the smallest absolute change
+# that counts (below it, differences are noise).
+_METRICS = {
+    "parse_s": 0.05,
+    "flatten_s": 0.05,
+    "extract_s": 0.05,
+    "center_s": 0.05,
+    "build_s": 0.05,
+    "export_s": 0.05,
+    "export_instanced_s": 0.05,
+    "peak_mb": 16.0,
+}
+
+_PACKAGE_DIR = Path(__file__).parent
+
+
+def _reset_peak() -> None:
+    """Reset the kernel's peak RSS counter (Linux only; no-op elsewhere)."""
+    try:
+        Path("/proc/self/clear_refs").write_text("5")
+    except OSError:
+        pass
+
+
+def _peak_mb() -> float:
+    """Return the peak resident set size in MB."""
+    try:
+        for line in Path("/proc/self/status").read_text().splitlines():
+            if line.startswith("VmHWM:"):
+                return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    import resource
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS, kilobytes elsewhere
+    return peak / (1024 * 1024 if sys.platform == "darwin" else 1024)
+
+
+@contextmanager
+def _timed(result: dict, metric: str):
+    """Record the wall time of a block in result[metric], keeping the best."""
+    start = time.perf_counter()
+    yield
+    elapsed = time.perf_counter() - start
+    result[metric] = min(elapsed, result.get(metric, elapsed))
+
+
+def _counts(shape: Compound) -> dict:
+    return {"solids": len(shape.solids()), "faces": len(shape.faces())}
+
+
+def _manifest_filters(subassembly_dir: Path) -> dict[Path, dict]:
+    """Map each manifest STEP path to its _flatten_solids filter options."""
+    if not (subassembly_dir / MANIFEST_FILE).exists():
+        return {}
+    filters = {}
+    for spec in load_manifest(subassembly_dir).get("part", []):
+        steps = subassembly_dir / STEPS_DIR
+        if spec.get("vendor", False):
+            steps = steps / VENDOR_DIR
+        filters[steps / f"{spec['file']}.step"] = {
+            "min_volume": spec.get("min_solid_volume", 0.0),
+            "volume_mode": spec.get("volume_mode", "bbox"),
+            "max_solids": spec.get("max_solids"),
+        }
+    return filters
+
+
+def bench_file(step_path: Path, filters: dict | None = None, repeat: int = 1) -> dict:
+    """Time the load phases of one STEP file.
+
+    Args:
+        step_path: STEP file to load.
+        filters: Keyword arguments for _flatten_solids.
+        repeat: Number of runs; the best time of each phase is kept.
+    """
+    result = {}
+    _reset_peak()
+    for _ in range(repeat):
+        with _timed(result, "parse_s"):
+            raw = import_step(str(step_path))
+        with _timed(result, "flatten_s"):
+            flat = _flatten(raw)
+        with _timed(result, "extract_s"):
+            _flatten_solids(raw, **(filters or {}))
+        with _timed(result, "center_s"):
+            flat.center()
+    result.update(_counts(flat))
+    result["peak_mb"] = _peak_mb()
+    return result
+
+
+def bench_subassembly(leaf: LazyAssembly, repeat: int = 1) -> dict:
+    """Time building and exporting one leaf subassembly."""
+    result = {"label": leaf.label}
+    _reset_peak()
+    with tempfile.TemporaryDirectory() as tmp:
+        out = Path(tmp) / "bench.step"
+        for _ in range(repeat):
+            clear_part_cache()
+            with _timed(result, "build_s"):
+                node = leaf.builder()
+            if node is None:
+                return result
+            with _timed(result, "export_s"):
+                export_step(node, str(out))
+            with _timed(result, "export_instanced_s"):
+                result["parts"] = export_step_instanced(node, out)
+    clear_part_cache()
+    result.update(_counts(node))
+    result["peak_mb"] = _peak_mb()
+    return result
+
+
+def run(tree: LazyAssembly, repeat: int = 1) -> dict:
+    """Benchmark every STEP file and leaf subassembly in a BOM tree."""
+    try:
+        build123d_version = version("build123d")
+    except PackageNotFoundError:
+        build123d_version = "unknown"
+    results = {
+        "version": BENCH_VERSION,
+        "python": platform.python_version(),
+        "build123d": build123d_version,
+        "machine": platform.machine(),
+        "files": {},
+        "subassemblies": {},
+    }
+    for leaf in tree.leaves():
+        subassembly_dir = module_dir(leaf.builder)
+        filters = _manifest_filters(subassembly_dir)
+        steps = subassembly_dir / STEPS_DIR
+        for step_path in sorted(steps.glob("*.step")) + sorted(steps.glob(f"{VENDOR_DIR}/*.step")):
+            name = step_path.relative_to(_PACKAGE_DIR).as_posix()
+            results["files"][name] = bench_file(step_path, filters.get(step_path), repeat)
+        results["subassemblies"][str(leaf.bom)] = bench_subassembly(leaf, repeat)
+    return results
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list[str]:
+    """List every metric that regressed by more than `threshold` (a fraction).
+
+    Changes smaller than the metric's noise floor in _METRICS are ignored,
+    as are entries missing from either side.
+    """
+    regressions = []
+    for section in ("files", "subassemblies"):
+        for name, new in results[section].items():
+            old = baseline.get(section, {}).get(name)
+            if old is None:
+                continue
+            for metric, floor in _METRICS.items():
+                if metric not in new or metric not in old:
+                    continue
+                before, after = old[metric], new[metric]
+                if after - before > floor and after > before * (1 + threshold):
+                    regressions.append(
+                        f"{section}/{name} {metric}: {before:.3f} -> {after:.3f} "
+                        f"(+{(after / before - 1) * 100 if before else float('inf'):.0f}%)"
+                    )
+    return regressions
+
+
+def _print_results(results: dict) -> None:
+    header = ("parse", "flatten", "extract", "center", "solids", "faces", "MB")
+    print(f"{'STEP file':<64}" + "".join(f"{h:>9}" for h in header))
+    for name, r in results["files"].items():
+        row = (r["parse_s"], r["flatten_s"], r["extract_s"], r["center_s"])
+        print(
+            f"{name:<64}" + "".join(f"{v:9.3f}" for v in row)
+            + f"{r['solids']:9d}{r['faces']:9d}{r['peak_mb']:9.0f}"
+        )
+    print()
+    header = ("build", "export", "inst.", "parts", "MB")
+    print(f"{'BOM':<6}{'subassembly':<28}" + "".join(f"{h:>9}" for h in header))
+    for bom, r in results["subassemblies"].items():
+        if "export_s" not in r:
+            print(f"{bom:<6}{r['label']:<28}   (no STEP files)")
+            continue
+        row = (r["build_s"], r["export_s"], r["export_instanced_s"])
+        print(
+            f"{bom:<6}{r['label']:<28}" + "".join(f"{v:9.3f}" for v in row)
+            + f"{r['parts']:9d}{r['peak_mb']:9.0f}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the Quiver assembly build")
+    parser.add_argument("-o", "--output", type=Path, help="Write results as JSON")
+    parser.add_argument("--baseline", type=Path, help="Compare against a saved JSON result")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.10,
+        help="Fractional slowdown that counts as a regression (default 0.10)",
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=1, help="Run each phase N times and keep the best"
+    )
+    parser.add_argument(
+        "--only",
+        type=lambda s: [int(bom) for bom in s.split(",")],
+        metavar="BOM[,BOM...]",
+        help="Benchmark only these BOM categories/subcategories",
+    )
+    parser.add_argument(
+        "--warm", action="store_true", help="Keep the on-disk geometry cache enabled"
+    )
+    args = parser.parse_args()
+
+    if not args.warm:
+        os.environ["QUIVER_NO_CACHE"] = "1"
+
+    results = run(selected_tree(args.only), args.repeat)
+    _print_results(results)
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2) + "\n")
+        print(f"\nWrote results to {args.output}")
+    if args.baseline:
+        regressions = compare(results, json.loads(args.baseline.read_text()), args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) against {args.baseline}:")
+            for line in regressions:
+                print(f"  {line}")
+            sys.exit(1)
+        print(f"\nNo regressions against {args.baseline}")
@@ -0,0 +1,355 @@
+"""Build orchestration for the BOM hierarchy.
+
+The top-level assembly is a registry of BOM categories. A category module
+either lists its subcategory builders in SUBASSEMBLIES (keyed by BOM
+number) or is itself a leaf with a make_assembly function, like the
+harness. This module turns that registry into a tree of LazyAssembly
+nodes, which build their geometry only when it is first accessed. That
+lets callers build a subset of the drone (select) or build the leaves in
+parallel and recompose the same labeled Compound hierarchy.
+
+Leaves are shipped between processes as binary BREP plus a small metadata
+tree (labels and colors), since neither survives BREP serialization. The
+same packed form is persisted in the on-disk cache under a fingerprint of
+the leaf's inputs (its STEP files, manifest and module source, plus the
+shared quiver code), so a rebuild only re-executes the leaves whose inputs
+changed. stream_leaves builds one leaf at a time for exports that should
+not hold the whole drone in memory.
+"""
+
+import hashlib
+import json
+import sys
+from collections.abc import Callable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from importlib.metadata import PackageNotFoundError, version
+from pathlib import Path
+from types import ModuleType
+
+from build123d import Color, Compound
+from OCP.TopoDS import TopoDS_Iterator, TopoDS_Shape
+
+from quiver import cache, profiling
+from quiver.cache import shape_from_bytes, shape_to_bytes
+from quiver.common import clear_part_cache, current_lod, rgba
+
+Builder = Callable[[], Compound | None]
+
+_UNBUILT = object()
+
+# Files under a leaf's own directory that feed its fingerprint
+_INPUT_SUFFIXES = {".py", ".toml", ".step"}
+
+# Shared modules every leaf builds on, relative to the quiver package
+_SHARED_SOURCES = ("cache.py", "common.py", "manifest.py")
+
+
+class LazyAssembly:
+    """A BOM node whose geometry is built on first access.
+
+    Leaf nodes wrap a subassembly builder; group nodes hold child nodes and
+    compose their results into a labeled Compound. Walking the tree (bom,
+    label, children) never loads any STEP file; only `compound` does, and
+    only for the nodes it reaches.
+    """
+
+    def __init__(
+        self,
+        bom: int | None,
+        label: str,
+        builder: Builder | None = None,
+        children: list["LazyAssembly"] | None = None,
+    ):
+        self.bom = bom
+        self.label = label
+        self.builder = builder
+        self.children = children or []
+        self._compound = _UNBUILT
+
+    def __repr__(self) -> str:
+        return f"LazyAssembly({self.bom}, {self.label!r})"
+
+    @property
+    def is_leaf(self) -> bool:
+        return self.builder is not None
+
+    @property
+    def built(self) -> bool:
+        """True once this node's geometry has been materialized."""
+        return self._compound is not _UNBUILT
+
+    @property
+    def compound(self) -> Compound | None:
+        """Build (once) and return this node's Compound, or None if empty."""
+        if self._compound is _UNBUILT:
+            if self.is_leaf:
+                self._compound = _run(self.builder, self.bom)
+            else:
+                built = [child.compound for child in self.children]
+                built = [c for c in built if c is not None]
+                with profiling.span(f"Compound {self.label}"):
+                    self._compound = Compound(children=built, label=self.label) if built else None
+        return self._compound
+
+    def set_compound(self, compound: Compound | None) -> None:
+        """Provide a leaf's geometry built elsewhere (e.g. in a worker)."""
+        self._compound = compound
+
+    def release(self) -> None:
+        """Drop this node's geometry so it can be garbage collected."""
+        self._compound = _UNBUILT
+
+    def leaves(self) -> Iterator["LazyAssembly"]:
+        """Yield every leaf node below (or at) this node."""
+        if self.is_leaf:
+            yield self
+        for child in self.children:
+            yield from child.leaves()
+
+    def boms(self) -> Iterator[int]:
+        """Yield every BOM number in this subtree."""
+        if self.bom is not None:
+            yield self.bom
+        for child in self.children:
+            yield from child.boms()
+
+    def select(self, boms: set[int]) -> "LazyAssembly | None":
+        """Return a pruned tree containing only the selected BOM subtrees.
+
+        Selecting a category (e.g. 1000) keeps all of its subcategories;
+        selecting a subcategory (e.g. 1300) keeps just that one. Group
+        nodes on the way down keep their labels so the result has the same
+        shape as the full hierarchy.
+        """
+        if self.bom in boms:
+            return self
+        children = [child.select(boms) for child in self.children]
+        children = [c for c in children if c is not None]
+        if not children:
+            return None
+        return LazyAssembly(self.bom, self.label, children=children)
+
+
+def _leaf_label(build: Builder) -> str:
+    """Name a leaf before it is built, from its module path."""
+    return build.__module__.removesuffix(".assembly").rsplit(".", 1)[-1]
+
+
+def _run(build: Builder, bom: int | None) -> Compound | None:
+    """Call a leaf builder inside a profiling span named by its BOM."""
+    with profiling.span(f"{bom} {_leaf_label(build)}", bom=bom):
+        return build()
+
+
+def lazy_tree(label: str, categories: dict[int, ModuleType]) -> LazyAssembly:
+    """Build the LazyAssembly tree for a category registry."""
+    nodes = []
+    for bom, category in categories.items():
+        subassemblies = getattr(category, "SUBASSEMBLIES", None)
+        if subassemblies is None:
+            build = category.make_assembly
+            nodes.append(LazyAssembly(bom, _leaf_label(build), builder=build))
+        else:
+            children = [
+                LazyAssembly(sub, _leaf_label(build), builder=build)
+                for sub, build in subassemblies.items()
+            ]
+            nodes.append(LazyAssembly(bom, category.LABEL, children=children))
+    return LazyAssembly(None, label, children=nodes)
+
+
+def _meta(node) -> dict:
+    """Describe a node's label, color, and children (recursively)."""
+    color = rgba(node.color) if node.color is not None else None
+    return {
+        "label": node.label,
+        "color": color,
+        "children": [_meta(child) for child in node.children],
+    }
+
+
+def pack(node: Compound) -> tuple[bytes, dict]:
+    """Serialize a built subassembly for another process or the disk.
+
+    The whole node is written as one BREP, so parts that share a TShape
+    inside it are still shared after unpack.
+    """
+    return shape_to_bytes(node.wrapped), _meta(node)
+
+
+def _rebuild(shape: TopoDS_Shape, meta: dict) -> Compound:
+    if meta["children"]:
+        subshapes = []
+        it = TopoDS_Iterator(shape)
+        while it.More():
+            subshapes.append(it.Value())
+            it.Next()
+        children = [_rebuild(s, m) for s, m in zip(subshapes, meta["children"])]
+        node = Compound(children=children, label=meta["label"])
+    else:
+        node = Compound(shape)
+        node.label = meta["label"]
+    if meta["color"] is not None:
+        node.color = Color(*meta["color"])
+    return node
+
+
+def unpack(data: bytes, meta: dict) -> Compound:
+    """Rebuild a subassembly serialized with pack."""
+    return _rebuild(shape_from_bytes(data), meta)
+
+
+def module_dir(build: Builder) -> Path:
+    """Return the directory of the subassembly module defining a builder."""
+    return Path(sys.modules[build.__module__].__file__).parent
+
+
+def fingerprint(build: Builder) -> str:
+    """Hash everything a leaf builder's output depends on.
+
+    Covers every STEP file, manifest and Python file under the leaf's
+    module directory, the shared quiver modules it builds on, the current
+    LOD tier, and the installed build123d version.
+    """
+    package_dir = Path(__file__).parent
+    leaf_dir = module_dir(build)
+    inputs = [
+        (p.relative_to(leaf_dir).as_posix(), p)
+        for p in sorted(leaf_dir.rglob("*"))
+        if p.suffix in _INPUT_SUFFIXES and p.is_file()
+    ]
+    inputs += [(f"quiver/{name}", package_dir / name) for name in _SHARED_SOURCES]
+    try:
+        build123d_version = version("build123d")
+    except PackageNotFoundError:
+        build123d_version = "unknown"
+    payload = {
+        "version": cache.CACHE_VERSION,
+        "build123d": build123d_version,
+        "builder": f"{build.__module__}.{build.__qualname__}",
+        "lod": current_lod(),
+        "inputs": [(name, cache.file_digest(p)) for name, p in inputs],
+    }
+    return hashlib.sha256(json.dumps(payload).encode()).hexdigest()
+
+
+def _load_leaf(key: str):
+    """Return a cached leaf (None for an empty one), or _UNBUILT on a miss."""
+    meta = cache.get_json("leaves", key)
+    if meta is None:
+        return _UNBUILT
+    if meta.get("empty"):
+        return None
+    data = cache.get_bytes("leaves", key)
+    if data is None:
+        return _UNBUILT
+    return unpack(data, meta["tree"])
+
+
+def _store_leaf(key: str, packed: tuple[bytes, dict] | None) -> None:
+    if packed is None:
+        cache.put_json("leaves", key, {"empty": True})
+    else:
+        data, meta = packed
+        cache.put_bytes("leaves", key, data)
+        cache.put_json("leaves", key, {"tree": meta})
+
+
+def _leaf_key(leaf: LazyAssembly) -> str | None:
+    return fingerprint(leaf.builder) if cache.enabled() else None
+
+
+def _restore(leaf: LazyAssembly, key: str | None) -> bool:
+    """Fill in a leaf from the cache; return False on a miss."""
+    hit = _load_leaf(key) if key else _UNBUILT
+    if hit is _UNBUILT:
+        return False
+    leaf.set_compound(hit)
+    return True
+
+
+def _build_leaf(leaf: LazyAssembly) -> None:
+    """Restore a leaf from the cache, or build it here and store it."""
+    key = _leaf_key(leaf)
+    if not _restore(leaf, key):
+        node = _run(leaf.builder, leaf.bom)
+        if key:
+            _store_leaf(key, pack(node) if node is not None else None)
+        leaf.set_compound(node)
+
+
+def _restore_clean(tree: LazyAssembly) -> list[tuple[LazyAssembly, str | None]]:
+    """Fill in leaves whose fingerprint is cached; return the dirty ones.
+
+    Each dirty leaf comes with its fingerprint (None when the cache is
+    disabled), so its result can be stored once built.
+    """
+    dirty = []
+    for leaf in tree.leaves():
+        if leaf.built:
+            continue
+        key = _leaf_key(leaf)
+        if not _restore(leaf, key):
+            dirty.append((leaf, key))
+    return dirty
+
+
+def _build_packed(build: Builder, bom: int | None) -> tuple[tuple[bytes, dict] | None, list]:
+    """Run one leaf builder in a worker; return it packed, with its spans."""
+    try:
+        node = _run(build, bom)
+    finally:
+        clear_part_cache()
+    return (pack(node) if node is not None else None), profiling.take_events()
+
+
+def build_serial(tree: LazyAssembly) -> Compound | None:
+    """Build the dirty leaves of a tree in this process and compose it."""
+    try:
+        for leaf in tree.leaves():
+            if not leaf.built:
+                _build_leaf(leaf)
+        return tree.compound
+    finally:
+        clear_part_cache()
+
+
+def build_parallel(tree: LazyAssembly, jobs: int) -> Compound | None:
+    """Build the dirty leaves of a tree in a process pool and compose it.
+
+    Args:
+        tree: Root of the (possibly pruned) LazyAssembly tree.
+        jobs: Number of worker processes.
+    """
+    dirty = _restore_clean(tree)
+    if dirty:
+        with ProcessPoolExecutor(max_workers=min(jobs, len(dirty))) as pool:
+            futures = [
+                (leaf, key, pool.submit(_build_packed, leaf.builder, leaf.bom))
+                for leaf, key in dirty
+            ]
+            for leaf, key, future in futures:
+                packed, events = future.result()
+                profiling.add_events(events)
+                if key:
+                    _store_leaf(key, packed)
+                leaf.set_compound(unpack(*packed) if packed is not None else None)
+    return tree.compound
+
+
+def stream_leaves(tree: LazyAssembly) -> Iterator[LazyAssembly]:
+    """Build the leaves of a tree one at a time, releasing each after use.
+
+    Each leaf is yielded once its compound is available (restored from the
+    cache or built here). When the consumer asks for the next one, the
+    previous leaf's geometry and the memoized STEP masters are dropped, so
+    only one leaf's shapes are alive at a time.
+    """
+    for leaf in tree.leaves():
+        try:
+            if not leaf.built:
+                _build_leaf(leaf)
+            yield leaf
+        finally:
+            leaf.release()
+            clear_part_cache()
@@ -0,0 +1,262 @@
+"""Persistent on-disk cache for imported STEP geometry.
+
+Parsing a STEP file and flattening it is by far the most expensive part of
+building the assembly, yet the source files rarely change. This module
+stores the already-flattened shapes as native OCCT binary BREP, keyed by
+a hash of the STEP file contents plus the load options, so a warm build
+never touches the STEP parser.
+
+Entries live under ``$QUIVER_CACHE_DIR`` (default ``~/.cache/quiver``).
+The cache is bounded by ``$QUIVER_CACHE_MAX_MB`` (default 2048 MB); when
+a write pushes it over the limit, the least recently used entries are
+evicted. Set ``QUIVER_NO_CACHE=1`` to bypass it entirely.
+
+OCP is only imported by the BREP helpers, so byte and JSON entries (e.g.
+decoded flight logs) work without the CAD kernel installed.
+"""
+
+import hashlib
+import io
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from OCP.TopoDS import TopoDS_Shape
+
+# Bump when the flattening code changes in a way that invalidates
+# previously cached geometry.
+CACHE_VERSION = 3
+
+_DEFAULT_MAX_MB = 2048
+
+# Rescan the cache directory at least this often (in writes), to notice
+# entries written by other processes
+_RESCAN_WRITES = 256
+
+# Estimated size in bytes per cache root: the last scan plus what this
+# process wrote since (missing until the first write scans it)
+_sizes: dict[Path, int] = {}
+_writes_since_scan = 0
+
+# Digest memo keyed by (path, mtime_ns, size) so unchanged files are
+# hashed at most once per process.
+_digests: dict[tuple[str, int, int], str] = {}
+
+
+def cache_dir() -> Path:
+    """Return the cache root directory (not created until first write)."""
+    env = os.environ.get("QUIVER_CACHE_DIR")
+    if env:
+        return Path(env)
+    xdg = os.environ.get("XDG_CACHE_HOME")
+    base = Path(xdg) if xdg else Path.home() / ".cache"
+    return base / "quiver"
+
+
+def enabled() -> bool:
+    """Return False when caching is disabled via QUIVER_NO_CACHE."""
+    return os.environ.get("QUIVER_NO_CACHE", "") in ("", "0")
+
+
+def max_bytes() -> int:
+    """Return the cache size limit in bytes."""
+    return int(os.environ.get("QUIVER_CACHE_MAX_MB", _DEFAULT_MAX_MB)) * 1024 * 1024
+
+
+def file_digest(path: Path) -> str:
+    """Return the SHA-256 hex digest of a file's contents.
+
+    The result is memoized on the file's mtime and size, so a file is only
+    re-hashed after it changes on disk.
+    """
+    st = path.stat()
+    memo_key = (str(path.resolve()), st.st_mtime_ns, st.st_size)
+    digest = _digests.get(memo_key)
+    if digest is None:
+        h = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                h.update(chunk)
+        digest = h.hexdigest()
+        _digests[memo_key] = digest
+    return digest
+
+
+def make_key(path: Path, **options) -> str:
+    """Build a cache key from a file's contents and the options applied to it."""
+    payload = json.dumps(
+        {"version": CACHE_VERSION, "digest": file_digest(path), "options": options},
+        sort_keys=True,
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def make_shape_key(shape: "TopoDS_Shape", **options) -> str:
+    """Build a cache key from a shape's B-rep and the options applied to it.
+
+    For data derived from built geometry (meshes, mass properties), which
+    may come from the leaf cache or generated code rather than a file.
+    """
+    h = hashlib.sha256(shape_to_bytes(shape, triangles=False))
+    h.update(json.dumps({"version": CACHE_VERSION, "options": options}, sort_keys=True).encode())
+    return h.hexdigest()
+
+
+def shape_to_bytes(shape: "TopoDS_Shape", triangles: bool = True) -> bytes:
+    """Serialize a shape to OCCT binary BREP.
+
+    With triangles=False any triangulation on the faces is left out, so
+    the bytes depend on the B-rep alone (e.g. for hashing).
+    """
+    from OCP.BinTools import BinTools, BinTools_FormatVersion
+
+    buffer = io.BytesIO()
+    BinTools.Write_s(
+        shape, buffer, triangles, False, BinTools_FormatVersion.BinTools_FormatVersion_CURRENT
+    )
+    return buffer.getvalue()
+
+
+def shape_from_bytes(data: bytes) -> "TopoDS_Shape":
+    """Deserialize a shape written by shape_to_bytes."""
+    from OCP.BinTools import BinTools
+    from OCP.TopoDS import TopoDS_Shape
+
+    shape = TopoDS_Shape()
+    BinTools.Read_s(shape, io.BytesIO(data))
+    return shape
+
+
+def _entry(kind: str, key: str, suffix: str) -> Path:
+    return cache_dir() / kind / key[:2] / f"{key}{suffix}"
+
+
+def _touch(path: Path) -> None:
+    """Mark an entry as recently used (mtime drives LRU eviction)."""
+    try:
+        os.utime(path)
+    except OSError:
+        pass
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    """Write via a temp file + rename so readers never see partial entries."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+
+
+def get_bytes(kind: str, key: str, suffix: str = ".bin") -> bytes | None:
+    """Return a cached blob, or None on a miss."""
+    if not enabled():
+        return None
+    path = _entry(kind, key, suffix)
+    try:
+        data = path.read_bytes()
+    except OSError:
+        return None
+    _touch(path)
+    return data
+
+
+def put_bytes(kind: str, key: str, data: bytes, suffix: str = ".bin") -> None:
+    """Store a blob, evicting old entries if the cache grows too large.
+
+    The cache directory is only walked when the estimated size goes over
+    the limit, or every _RESCAN_WRITES writes, not on every write.
+    """
+    global _writes_since_scan
+    if not enabled():
+        return
+    try:
+        _write_atomic(_entry(kind, key, suffix), data)
+    except OSError:
+        return  # a read-only or full cache must never break the build
+    _writes_since_scan += 1
+    root = cache_dir()
+    if root in _sizes and _writes_since_scan < _RESCAN_WRITES:
+        _sizes[root] += len(data)
+        if _sizes[root] <= max_bytes():
+            return
+    evict()
+
+
+def get_json(kind: str, key: str):
+    """Return a cached JSON document, or None on a miss."""
+    data = get_bytes(kind, key, suffix=".json")
+    if data is None:
+        return None
+    try:
+        return json.loads(data)
+    except ValueError:
+        return None
+
+
+def put_json(kind: str, key: str, value) -> None:
+    """Store a JSON-serializable document."""
+    put_bytes(kind, key, json.dumps(value).encode(), suffix=".json")
+
+
+def get_shape(kind: str, key: str) -> tuple["TopoDS_Shape", dict] | None:
+    """Return a cached shape and its metadata, or None on a miss."""
+    meta = get_json(kind, key)
+    if meta is None:
+        return None
+    data = get_bytes(kind, key)
+    if data is None:
+        return None
+    return shape_from_bytes(data), meta
+
+
+def put_shape(kind: str, key: str, shape: "TopoDS_Shape", meta: dict | None = None) -> None:
+    """Store a shape as binary BREP with a small JSON metadata sidecar."""
+    # The BREP goes first: get_shape checks the sidecar, so a reader never
+    # sees metadata without its geometry.
+    put_bytes(kind, key, shape_to_bytes(shape))
+    put_json(kind, key, meta or {})
+
+
+def evict(limit: int | None = None) -> None:
+    """Delete least recently used entries until the cache fits in `limit` bytes."""
+    global _writes_since_scan
+    _writes_since_scan = 0
+    root = cache_dir()
+    _sizes[root] = 0
+    if not root.exists():
+        return
+    limit = max_bytes() if limit is None else limit
+    entries = []
+    total = 0
+    for path in root.rglob("*"):
+        try:
+            st = path.stat()
+        except OSError:
+            continue
+        if not path.is_file():
+            continue
+        entries.append((st.st_mtime, st.st_size, path))
+        total += st.st_size
+    _sizes[root] = total
+    if total <= limit:
+        return
+    entries.sort()
+    for _, size, path in entries:
+        path.unlink(missing_ok=True)
+        total -= size
+        if total <= limit:
+            break
+    _sizes[root] = total
+
+
+def clear() -> None:
+    """Remove every cache entry."""
+    evict(limit=0)
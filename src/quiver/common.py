@@ -1,11 +1,40 @@
 """Shared utilities for Quiver CAD assembly."""
 
+import math
+import os
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
 from pathlib import Path
 
-from build123d import Color, Compound, Solid, import_step
-from OCP.BRepBuilderAPI import BRepBuilderAPI_Copy
+import numpy as np
+from build123d import (
+    Axis,
+    Color,
+    Compound,
+    Cylinder,
+    Location,
+    Shape,
+    Solid,
+    Vector,
+    import_step,
+)
+from OCP.Bnd import Bnd_Box
+from OCP.BRepAdaptor import BRepAdaptor_Surface
+from OCP.BRepAlgoAPI import BRepAlgoAPI_Defeaturing
+from OCP.BRepBndLib import BRepBndLib
+from OCP.BRep import BRep_Builder
+from OCP.BRepBuilderAPI import BRepBuilderAPI_Transform
+from OCP.BRepGProp import BRepGProp
+from OCP.BRepPrimAPI import BRepPrimAPI_MakeBox
+from OCP.GeomAbs import GeomAbs_SurfaceType
+from OCP.GProp import GProp_GProps
+from OCP.gp import gp_Pnt, gp_Trsf, gp_Vec
 from OCP.TopAbs import TopAbs_ShapeEnum
-from OCP.TopoDS import TopoDS_Iterator
+from OCP.TopExp import TopExp_Explorer
+from OCP.TopLoc import TopLoc_Location
+from OCP.TopoDS import TopoDS, TopoDS_Compound, TopoDS_Iterator, TopoDS_Shape
+
+from quiver import cache, profiling
 
 # Material colors for visualization
 ALUMINUM = Color(0.75, 0.75, 0.76)
@@ -14,9 +43,80 @@ PCB_GREEN = Color(0.0, 0.5, 0.2)
 PETG = Color(0.30, 0.32, 0.38)
 FOAM = Color(0.85, 0.55, 0.2)  # orange EPP foam
 
+# Material colors by name, for data files such as placement manifests
+COLORS = {
+    "ALUMINUM": ALUMINUM,
+    "CARBON_FIBER": CARBON_FIBER,
+    "PCB_GREEN": PCB_GREEN,
+    "PETG": PETG,
+    "FOAM": FOAM,
+}
+
+# Material densities in g/cm³, keyed like COLORS (see quiver.mass)
+DENSITIES = {
+    "ALUMINUM": 2.70,  # 6061-T6
+    "CARBON_FIBER": 1.55,  # woven CF/epoxy tube and plate
+    "PCB_GREEN": 1.85,  # FR-4
+    "PETG": 1.27,  # solid; printed parts are lighter with infill
+    "FOAM": 0.03,  # EPP 30 g/L
+}
+
+# Density for parts without a material color (vendor parts), in g/cm³
+DEFAULT_DENSITY = 1.20
+
 STEPS_DIR = "steps"
 VENDOR_DIR = "vendor"
 
+# How _flatten_solids measures a solid against min_solid_volume
+VOLUME_MODES = ("bbox", "true")
+
+# Level-of-detail tiers, finest first (see current_lod)
+LODS = ("full", "medium", "coarse")
+DEFAULT_LOD = "medium"
+
+# Coarse LOD: solids with a smaller bounding-box volume (mm³) become boxes
+_PROXY_VOLUME = 1000.0
+
+# Coarse LOD: cylindrical and toroidal faces up to this radius (mm), i.e.
+# small holes and fillets, are removed by defeaturing
+_FEATURE_RADIUS = 2.0
+
+# Upper bound for TopoDS_Shape.HashCode on OCCT < 7.8
+_HASH_UPPER = 2**31 - 1
+
+# Flattened master shapes parsed during the current build, keyed by file
+# identity and load options. Parts used several times (motors, adapters,
+# attach plates) are parsed once and handed out as lightweight instances.
+# Values pair the master with its on-disk cache key (None when disabled).
+_masters: dict[tuple, tuple[Compound, str | None]] = {}
+
+# Local (unplaced) centers of mass of master shapes, keyed like _masters.
+_centers: dict[tuple, Vector] = {}
+
+# Generated tubes, keyed by (outer diameter, wall, length), see make_tube.
+_tubes: dict[tuple[float, float, float], Compound] = {}
+
+
+def rgba(color: Color) -> tuple[float, float, float, float]:
+    """Return a color's (red, green, blue, alpha) components.
+
+    Read from the OCCT color, since Color.to_tuple() is gone in newer
+    build123d releases.
+    """
+    rgb = color.wrapped.GetRGB()
+    return (rgb.Red(), rgb.Green(), rgb.Blue(), color.wrapped.Alpha())
+
+
+def material_name(color: Color | None) -> str | None:
+    """Return the COLORS name of a material color, or None if unnamed."""
+    if color is None:
+        return None
+    components = rgba(color)
+    for name, named in COLORS.items():
+        if rgba(named) == components:
+            return name
+    return None
+
 
 def _load_from(directory: Path) -> dict[str, Compound]:
     """Load all STEP files from a directory."""
@@ -24,76 +124,389 @@ def _load_from(directory: Path) -> dict[str, Compound]:
         return {}
     parts = {}
     for step_file in sorted(directory.glob("*.step")):
-        parts[step_file.stem] = _flatten(import_step(str(step_file)))
+        parts[step_file.stem] = _import(step_file)
     return parts
 
 
-def _collect_solids(shape):
-    """Recursively collect all Solid shapes from a TopoDS hierarchy."""
-    solids = []
-    if shape.ShapeType() == TopAbs_ShapeEnum.TopAbs_SOLID:
-        solids.append(shape)
-    else:
-        it = TopoDS_Iterator(shape)
-        while it.More():
-            solids.extend(_collect_solids(it.Value()))
-            it.Next()
-    return solids
+def _shape_hash(shape: TopoDS_Shape) -> int:
+    """Hash a shape by its TShape and location, across OCP versions."""
+    if hasattr(shape, "HashCode"):  # OCCT < 7.8
+        return shape.HashCode(_HASH_UPPER)
+    if type(shape).__hash__ is not object.__hash__:  # OCCT 7.8+: std::hash
+        return hash(shape)
+    return 0  # no value hash: one bucket, compared with IsSame
+
+
+def iter_solids(shape: TopoDS_Shape) -> Iterator[TopoDS_Shape]:
+    """Yield every distinct solid in a TopoDS hierarchy, placed.
+
+    TopExp_Explorer walks the hierarchy iteratively, so deeply nested
+    vendor assemblies cannot hit the recursion limit, and solids can be
+    consumed as they are found. A solid reached more than once through
+    shared sub-shapes (same TShape and location) is yielded only once.
+    """
+    seen: dict[int, list[TopoDS_Shape]] = {}
+    explorer = TopExp_Explorer(shape, TopAbs_ShapeEnum.TopAbs_SOLID)
+    while explorer.More():
+        solid = explorer.Current()
+        bucket = seen.setdefault(_shape_hash(solid), [])
+        if not any(solid.IsSame(other) for other in bucket):
+            bucket.append(solid)
+            yield solid
+        explorer.Next()
+
+
+def _collect_solids(shape: TopoDS_Shape) -> list[TopoDS_Shape]:
+    """Collect all distinct solids from a TopoDS hierarchy."""
+    return list(iter_solids(shape))
+
+
+def _children(shape: TopoDS_Shape) -> Iterator[TopoDS_Shape]:
+    """Yield a shape's direct sub-shapes with their own (relative) locations."""
+    it = TopoDS_Iterator(shape, True, False)
+    while it.More():
+        yield it.Value()
+        it.Next()
+
 
+def _has_locations(shape: TopoDS_Shape) -> bool:
+    """Return True if the shape or any compound/solid below it is located."""
+    stack = [shape]
+    while stack:
+        current = stack.pop()
+        if not current.Location().IsIdentity():
+            return True
+        if current.ShapeType() == TopAbs_ShapeEnum.TopAbs_COMPOUND:
+            stack.extend(_children(current))
+    return False
 
+
+def _bake(shape: TopoDS_Shape, parent: TopLoc_Location | None = None) -> TopoDS_Shape:
+    """Return a shape with every compound/solid location baked into geometry.
+
+    Subtrees without placements are reused as they are. A located child is
+    transformed with BRepBuilderAPI_Transform (copying only its geometry),
+    and the compounds above it are rebuilt to hold the result.
+    """
+    location = shape.Location() if parent is None else parent.Multiplied(shape.Location())
+    if location.IsIdentity() and not _has_locations(shape):
+        return shape
+    if shape.ShapeType() == TopAbs_ShapeEnum.TopAbs_COMPOUND:
+        rebuilt = TopoDS_Compound()
+        builder = BRep_Builder()
+        builder.MakeCompound(rebuilt)
+        for child in _children(shape):
+            builder.Add(rebuilt, _bake(child, location))
+        return rebuilt
+    unplaced = shape.Located(TopLoc_Location())
+    return BRepBuilderAPI_Transform(unplaced, location.Transformation(), True).Shape()
+
+
+@profiling.traced
 def _flatten(compound: Compound) -> Compound:
-    """Deep-copy a Compound to bake internal placement transforms into geometry.
+    """Bake a Compound's internal placement transforms into geometry.
 
     STEP files can carry nested placement transforms on sub-parts. These
     interact badly with subsequent rotate/move calls in the OCP CAD Viewer
     (the viewer may not correctly compose parent and child transforms).
-    Deep-copying with BRepBuilderAPI_Copy collapses all transforms into the
-    vertex data so the geometry is self-contained.
+    Only the located sub-shapes are transformed, so the geometry is
+    self-contained; parts without nested placements (single-solid plates,
+    beams, ...) are used as imported, with no copy at all.
     """
-    copier = BRepBuilderAPI_Copy(compound.wrapped, True, True)
-    copier.Perform(compound.wrapped)
-    flat = Compound(copier.Shape())
+    flat = Compound(_bake(compound.wrapped))
     flat.label = compound.label
     return flat
 
 
-def _flatten_solids(compound: Compound, min_volume: float = 0.0) -> Compound:
+def box_bounds(box: Bnd_Box) -> tuple[float, float, float, float, float, float]:
+    """Return a non-void box as (xmin, ymin, zmin, xmax, ymax, zmax).
+
+    Read from its corners, since Bnd_Box.Get() no longer returns the
+    bounds on OCP 8.
+    """
+    lo, hi = box.CornerMin(), box.CornerMax()
+    return (lo.X(), lo.Y(), lo.Z(), hi.X(), hi.Y(), hi.Z())
+
+
+def _solid_volumes(shapes: list, volume_mode: str = "bbox") -> np.ndarray:
+    """Measure raw TopoDS solids in one pass, without build123d wrappers.
+
+    In "bbox" mode each solid's optimal bounding box (the same box
+    Shape.bounding_box() computes) is collected into an (n, 6) array and
+    the volumes come from one vectorized product. In "true" mode the exact
+    volume is integrated per solid.
+    """
+    volumes = np.zeros(len(shapes))
+    if volume_mode == "true":
+        for i, shape in enumerate(shapes):
+            props = GProp_GProps()
+            BRepGProp.VolumeProperties_s(shape, props)
+            volumes[i] = abs(props.Mass())
+        return volumes
+    bounds = np.zeros((len(shapes), 6))
+    for i, shape in enumerate(shapes):
+        box = Bnd_Box()
+        BRepBndLib.AddOptimal_s(shape, box)
+        if not box.IsVoid():
+            bounds[i] = box_bounds(box)
+    return np.prod(bounds[:, 3:] - bounds[:, :3], axis=1)
+
+
+@profiling.traced
+def _flatten_solids(
+    compound: Compound,
+    min_volume: float = 0.0,
+    volume_mode: str = "bbox",
+    max_solids: int | None = None,
+) -> Compound:
     """Flatten by extracting all solids and rebuilding a simple compound.
 
     Some vendor STEP files (e.g. GNSS receivers) have deeply nested compound
     hierarchies that crash the OCP CAD Viewer tessellator. This function
-    extracts every solid from the shape, deep-copies each to bake transforms,
-    and rebuilds a flat compound the viewer can handle.
-
-    When min_volume > 0, solids with bounding-box volume below the threshold
-    (in mm³) are dropped. This is useful for large PCB assemblies where
-    hundreds of tiny SMD component solids overwhelm the viewer.
-    """
-    copier = BRepBuilderAPI_Copy(compound.wrapped, True, True)
-    copier.Perform(compound.wrapped)
-    solids = [Solid(s) for s in _collect_solids(copier.Shape())]
-    if min_volume > 0:
-        def _bb_volume(s):
-            bb = s.bounding_box()
-            return (bb.max.X - bb.min.X) * (bb.max.Y - bb.min.Y) * (bb.max.Z - bb.min.Z)
-        solids = [s for s in solids if _bb_volume(s) >= min_volume]
-    flat = Compound(children=solids) if solids else Compound(copier.Shape())
+    extracts every solid from the shape with its placement baked in (see
+    _bake), and rebuilds a flat compound the viewer can handle.
+
+    When min_volume > 0, solids whose volume (bounding-box or true, per
+    volume_mode) is below the threshold (in mm³) are dropped. When
+    max_solids is set, only that many of the largest remaining solids are
+    kept. This is useful for large PCB assemblies where hundreds of tiny
+    SMD component solids overwhelm the viewer. Solid wrappers are only
+    built for the survivors, which keep their original order.
+    """
+    baked = _bake(compound.wrapped)
+    shapes = _collect_solids(baked)
+    if min_volume > 0 or (max_solids is not None and len(shapes) > max_solids):
+        volumes = _solid_volumes(shapes, volume_mode)
+        keep = np.flatnonzero(volumes >= min_volume)
+        if max_solids is not None and len(keep) > max_solids:
+            largest = np.argsort(-volumes[keep], kind="stable")[:max_solids]
+            keep = np.sort(keep[largest])
+        shapes = [shapes[i] for i in keep]
+    solids = [Solid(s) for s in shapes]
+    flat = Compound(children=solids) if solids else Compound(baked)
     flat.label = compound.label
     return flat
 
 
+def _instance(master: Compound) -> Compound:
+    """Return a new Compound sharing the master's underlying geometry.
+
+    The returned shape is a separate TopoDS handle, so move/color/label on
+    the instance never affect the master or its other instances.
+    """
+    part = Compound(master.wrapped.Moved(TopLoc_Location()))
+    part.label = master.label
+    return part
+
+
+def current_lod() -> str:
+    """Return the level of detail parts are loaded at.
+
+    The tier comes from ``$QUIVER_LOD`` so worker processes inherit it:
+
+    - "full": every solid, ignoring min_solid_volume and max_solids
+      (engineering export).
+    - "medium": the load options as given (the viewer default).
+    - "coarse": medium, then small solids replaced by bounding-box
+      proxies and small holes and fillets removed from the rest.
+
+    Raises:
+        ValueError: If ``$QUIVER_LOD`` is not one of LODS.
+    """
+    lod = os.environ.get("QUIVER_LOD", DEFAULT_LOD)
+    if lod not in LODS:
+        raise ValueError(f"QUIVER_LOD must be one of {LODS}, not {lod!r}")
+    return lod
+
+
+@contextmanager
+def use_lod(lod: str | None):
+    """Load parts at `lod` inside the block (None keeps the current tier)."""
+    if lod is None:
+        yield
+        return
+    if lod not in LODS:
+        raise ValueError(f"lod must be one of {LODS}, not {lod!r}")
+    previous = os.environ.get("QUIVER_LOD")
+    os.environ["QUIVER_LOD"] = lod
+    try:
+        yield
+    finally:
+        if previous is None:
+            del os.environ["QUIVER_LOD"]
+        else:
+            os.environ["QUIVER_LOD"] = previous
+
+
+def _box_proxy(shape: TopoDS_Shape) -> TopoDS_Shape:
+    """Return a solid's optimal bounding box as a box solid."""
+    box = Bnd_Box()
+    BRepBndLib.AddOptimal_s(shape, box)
+    if box.IsVoid():
+        return shape
+    xmin, ymin, zmin, xmax, ymax, zmax = box_bounds(box)
+    if min(xmax - xmin, ymax - ymin, zmax - zmin) <= 0:
+        return shape  # flat parts (stickers, foils) have no box
+    return BRepPrimAPI_MakeBox(gp_Pnt(xmin, ymin, zmin), gp_Pnt(xmax, ymax, zmax)).Shape()
+
+
+def _small_feature_faces(shape: TopoDS_Shape) -> list[TopoDS_Shape]:
+    """Find the faces of small holes and fillets (see _FEATURE_RADIUS)."""
+    faces = []
+    explorer = TopExp_Explorer(shape, TopAbs_ShapeEnum.TopAbs_FACE)
+    while explorer.More():
+        face = TopoDS.Face_s(explorer.Current())
+        surface = BRepAdaptor_Surface(face)
+        kind = surface.GetType()
+        if kind == GeomAbs_SurfaceType.GeomAbs_Cylinder:
+            radius = surface.Cylinder().Radius()
+        elif kind == GeomAbs_SurfaceType.GeomAbs_Torus:
+            radius = surface.Torus().MinorRadius()
+        else:
+            radius = math.inf
+        if radius <= _FEATURE_RADIUS:
+            faces.append(face)
+        explorer.Next()
+    return faces
+
+
+def _defeature(shape: TopoDS_Shape) -> TopoDS_Shape:
+    """Remove small holes and fillets from a solid.
+
+    Faces the algorithm cannot remove cleanly are left in place; if it
+    fails outright, the solid is returned unchanged.
+    """
+    faces = _small_feature_faces(shape)
+    if not faces:
+        return shape
+    algo = BRepAlgoAPI_Defeaturing()
+    algo.SetShape(shape)
+    for face in faces:
+        algo.AddFaceToRemove(face)
+    algo.SetRunParallel(True)
+    algo.SetToFillHistory(False)
+    algo.Build()
+    if not algo.IsDone() or algo.HasErrors():
+        return shape
+    return algo.Shape()
+
+
+@profiling.traced
+def _coarsen(flat: Compound) -> Compound:
+    """Reduce a flattened part to its coarse LOD.
+
+    Solids smaller than _PROXY_VOLUME become bounding-box proxies; larger
+    ones lose their small holes and fillets.
+    """
+    shapes = _collect_solids(flat.wrapped)
+    if not shapes:
+        return flat
+    volumes = _solid_volumes(shapes)
+    coarse = [
+        _box_proxy(shape) if volume < _PROXY_VOLUME else _defeature(shape)
+        for shape, volume in zip(shapes, volumes)
+    ]
+    result = Compound(children=[Solid(s) for s in coarse])
+    result.label = flat.label
+    return result
+
+
+def clear_part_cache() -> None:
+    """Release the master shapes memoized by load_step and make_tube.
+
+    Their memoized local centers go too, so a part loaded again never
+    gets the center of the master it replaces.
+    """
+    _masters.clear()
+    _centers.clear()
+    _tubes.clear()
+
+
+def _import(
+    step_path: Path,
+    extract_solids: bool = False,
+    min_solid_volume: float = 0.0,
+    volume_mode: str = "bbox",
+    max_solids: int | None = None,
+) -> Compound:
+    """Import and flatten a STEP file, returning an instance of its master.
+
+    Each (file, options) combination is parsed at most once per build; later
+    calls hand out cheap instances that share the same geometry. Misses go
+    through the on-disk cache, whose key covers the file contents and every
+    option that changes the flattened result, including the LOD tier.
+    """
+    if volume_mode not in VOLUME_MODES:
+        raise ValueError(f"volume_mode must be one of {VOLUME_MODES}, not {volume_mode!r}")
+    lod = current_lod()
+    if lod == "full":
+        min_solid_volume, max_solids = 0.0, None
+    options = {"extract_solids": extract_solids}
+    if extract_solids:
+        options["min_solid_volume"] = min_solid_volume
+        options["volume_mode"] = volume_mode
+        options["max_solids"] = max_solids
+    if lod == "coarse":
+        options["coarse"] = True
+    st = step_path.stat()
+    memo_key = (str(step_path.resolve()), st.st_mtime_ns, st.st_size, *options.items())
+    entry = _masters.get(memo_key)
+    if entry is None:
+        key = cache.make_key(step_path, **options) if cache.enabled() else None
+        entry = (_load_master(step_path, options, key), key)
+        _masters[memo_key] = entry
+    return _instance(entry[0])
+
+
+def _load_master(step_path: Path, options: dict, key: str | None) -> Compound:
+    """Import and flatten a STEP file, going through the on-disk cache."""
+    if key:
+        hit = cache.get_shape("steps", key)
+        if hit:
+            shape, meta = hit
+            flat = Compound(shape)
+            flat.label = meta.get("label", "")
+            return flat
+
+    with profiling.span("import_step", file=step_path.name):
+        raw = import_step(str(step_path))
+    if options["extract_solids"]:
+        flat = _flatten_solids(
+            raw,
+            min_volume=options["min_solid_volume"],
+            volume_mode=options["volume_mode"],
+            max_solids=options["max_solids"],
+        )
+    else:
+        flat = _flatten(raw)
+    if options.get("coarse"):
+        flat = _coarsen(flat)
+    if key:
+        cache.put_shape("steps", key, flat.wrapped, {"label": flat.label})
+    return flat
+
+
 def load_step(
     subassembly_dir: Path,
     filename: str,
     vendor: bool = False,
     extract_solids: bool = False,
     min_solid_volume: float = 0.0,
+    volume_mode: str = "bbox",
+    max_solids: int | None = None,
 ) -> Compound | None:
     """Import a STEP file from a subassembly's steps/ directory.
 
     The imported geometry is flattened (internal placement transforms are
     baked into vertices) so that subsequent rotate/move calls render
-    correctly in the OCP CAD Viewer.
+    correctly in the OCP CAD Viewer. Flattened shapes are cached on disk
+    (see quiver.cache), so unchanged files are only parsed once. The
+    current_lod tier decides how much detail is kept: "full" ignores the
+    solid filters below, "coarse" also simplifies the result.
+
+    Repeated loads of the same file with the same options return separate
+    instances of one in-memory master, so loading a part four times costs
+    a single parse.
 
     Args:
         subassembly_dir: Path to the subassembly module directory.
@@ -103,8 +516,12 @@ def load_step(
             the compound. Use for STEP files with deeply nested compound
             hierarchies that crash the viewer tessellator.
         min_solid_volume: When extract_solids is True, drop solids with
-            bounding-box volume below this threshold (mm³). Useful for
-            large PCB assemblies with many tiny SMD components.
+            volume below this threshold (mm³). Useful for large PCB
+            assemblies with many tiny SMD components.
+        volume_mode: "bbox" measures solids by bounding-box volume (fast),
+            "true" by their exact volume.
+        max_solids: When extract_solids is True, keep at most this many
+            of the largest solids.
 
     Returns:
         The imported Compound, or None if the file doesn't exist yet.
@@ -117,10 +534,134 @@ def load_step(
     step_path = steps_path / filename
     if not step_path.exists():
         return None
-    raw = import_step(str(step_path))
-    if extract_solids:
-        return _flatten_solids(raw, min_volume=min_solid_volume)
-    return _flatten(raw)
+    with profiling.span(f"load_step {filename}", vendor=vendor):
+        return _import(step_path, extract_solids, min_solid_volume, volume_mode, max_solids)
+
+
+def _local_center(memo_key: tuple) -> Vector:
+    """Return a master's center of mass in its own (unplaced) frame.
+
+    Computing a center of mass integrates over every face, so the result is
+    memoized per process and stored in the on-disk cache next to the
+    flattened geometry, keyed by the same file hash.
+    """
+    center = _centers.get(memo_key)
+    if center is None:
+        master, key = _masters[memo_key]
+        cached = cache.get_json("centers", key) if key else None
+        if cached:
+            center = Vector(*cached)
+        else:
+            center = master.center()
+            if key:
+                cache.put_json("centers", key, [center.X, center.Y, center.Z])
+        _centers[memo_key] = center
+    return center
+
+
+def _current_center(part: Shape) -> gp_Pnt:
+    """Return a part's center of mass at its current placement.
+
+    Instances of a loaded master reuse the master's cached local center,
+    moved by the instance's location. Anything else (e.g. generated
+    geometry) falls back to integrating the shape.
+    """
+    for memo_key, (master, _) in _masters.items():
+        if part.wrapped.IsPartner(master.wrapped):
+            local = _local_center(memo_key).to_pnt()
+            return local.Transformed(part.wrapped.Location().Transformation())
+    return part.center().to_pnt()
+
+
+def place(
+    part: Shape,
+    rotations: Iterable[tuple[Axis, float]] = (),
+    com: tuple[float, float, float] | None = None,
+    move: tuple[float, float, float] | None = None,
+    origin: tuple[float, float, float] | None = None,
+) -> Shape:
+    """Rotate a part and move its center of mass to a target, in one step.
+
+    The rotations and the final translation are composed into a single
+    gp_Trsf and applied as a location, so no geometry is rebuilt and the
+    center of mass comes from the part's cached local value rather than a
+    fresh integration. Equivalent to rotating in order, then moving by
+    `com - part.center()`.
+
+    Args:
+        part: Shape to place (modified in place).
+        rotations: (axis, degrees) pairs, applied in order.
+        com: Target center-of-mass position after rotating.
+        move: Plain translation after rotating (instead of `com`).
+        origin: Point of the part moved to the origin before rotating.
+
+    Returns:
+        The same part, for chaining.
+    """
+    if com is not None and move is not None:
+        raise ValueError("place() takes either com or move, not both")
+    trsf = gp_Trsf()
+    if origin is not None:
+        trsf.SetTranslation(gp_Vec(*origin).Reversed())
+    for axis, angle in rotations:
+        rotation = gp_Trsf()
+        rotation.SetRotation(axis.wrapped, math.radians(angle))
+        trsf.PreMultiply(rotation)
+    if com is not None:
+        center = _current_center(part).Transformed(trsf)
+        shift = gp_Trsf()
+        shift.SetTranslation(gp_Vec(center, gp_Pnt(*com)))
+        trsf.PreMultiply(shift)
+    elif move is not None:
+        shift = gp_Trsf()
+        shift.SetTranslation(gp_Vec(*move))
+        trsf.PreMultiply(shift)
+    part.move(Location(TopLoc_Location(trsf)))
+    return part
+
+
+def make_tube(outer_diameter: float, wall: float, length: float) -> Compound:
+    """Return an instance of a hollow cylinder, centered at the origin along Z.
+
+    Each (outer_diameter, wall, length) is built with the `outer - inner`
+    boolean once per build; later calls hand out instances sharing its
+    geometry, like load_step does for parts, so identical tubes are
+    meshed, integrated and exported once.
+
+    Args:
+        outer_diameter: Outer diameter (mm).
+        wall: Wall thickness (mm).
+        length: Length along Z (mm).
+    """
+    key = (float(outer_diameter), float(wall), float(length))
+    master = _tubes.get(key)
+    if master is None:
+        with profiling.span("make_tube", od=key[0], wall=key[1], length=key[2]):
+            outer = Cylinder(radius=outer_diameter / 2, height=length)
+            inner = Cylinder(radius=outer_diameter / 2 - wall, height=length)
+            master = _tubes[key] = Compound((outer - inner).wrapped)
+    return _instance(master)
+
+
+def rotate_instance(part: Shape, axis: Axis, angle: float) -> Shape:
+    """Rotate a part in place by changing its location, not its geometry.
+
+    Unlike Shape.rotate, which rebuilds the B-rep with the rotation baked
+    in, this only updates the part's TopLoc_Location. Instances returned by
+    load_step therefore keep sharing one TShape with their master, which
+    lets the STEP export write them as product instances. The location sits
+    on the part itself, above the flattened geometry, so it renders the same
+    way a move() does.
+
+    Args:
+        part: Shape to rotate (modified in place).
+        axis: Rotation axis.
+        angle: Rotation angle in degrees.
+
+    Returns:
+        The same part, for chaining like Shape.rotate.
+    """
+    return place(part, [(axis, angle)])
 
 
 def load_all_steps(subassembly_dir: Path) -> dict[str, Compound]:
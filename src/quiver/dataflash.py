@@ -0,0 +1,142 @@
+"""Minimal reader for ArduPilot DataFlash binary (.BIN) logs.
+
+A .BIN log is a stream of records. Each record starts with the two
+bytes A3 95 and a message type byte, followed by a fixed-size payload
+whose layout is declared by an earlier FMT record (type 128):
+
+    Type, Length, Name, Format, Columns
+
+Format is one character per column (see FORMAT_CODES); Length covers
+the 3-byte header too. Everything needed to walk and edit a log is
+therefore inside the log itself.
+
+Stdlib only: records are addressed by offset in a memory-mapped file,
+so walking a log never copies its payloads. quiver.flightlog decodes
+logs with it, and so does the standalone GPS log anonymizer under
+task-grant-bounty/Tools/, which imports it from this source tree.
+"""
+
+import struct
+from functools import lru_cache
+from typing import NamedTuple
+
+HEAD = b"\xa3\x95"
+HEADER_SIZE = 3
+
+FMT_TYPE = 128
+FMT_STRUCT = struct.Struct("<BB4s16s64s")
+
+# DataFlash format characters as struct codes (little-endian)
+FORMAT_CODES = {
+    "a": "64s",  # int16[32]
+    "b": "b",
+    "B": "B",
+    "h": "h",
+    "H": "H",
+    "i": "i",
+    "I": "I",
+    "f": "f",
+    "d": "d",
+    "n": "4s",
+    "N": "16s",
+    "Z": "64s",
+    "c": "h",  # int16 * 100
+    "C": "H",  # uint16 * 100
+    "e": "i",  # int32 * 100
+    "E": "I",  # uint32 * 100
+    "L": "i",  # latitude/longitude, degrees * 1e7
+    "M": "B",  # flight mode
+    "q": "q",
+    "Q": "Q",
+}
+
+
+def _text(raw: bytes) -> str:
+    return raw.split(b"\0", 1)[0].decode("ascii", errors="replace")
+
+
+@lru_cache(maxsize=None)
+def _struct(format_: str) -> struct.Struct:
+    return struct.Struct("<" + "".join(FORMAT_CODES[char] for char in format_))
+
+
+class MessageFormat(NamedTuple):
+    """Layout of one message type, as declared by its FMT record."""
+
+    type: int
+    length: int  # bytes, including the 3-byte header
+    name: str
+    format: str
+    columns: tuple[str, ...]
+
+    def struct_format(self) -> str:
+        """Return the struct format of the payload (after the header)."""
+        return _struct(self.format).format
+
+    def unpack(self, buf, pos: int) -> dict:
+        """Decode the record starting at `pos` into {column: value}.
+
+        Strings (n, N, Z) are returned as text, without NUL padding.
+        """
+        values = _struct(self.format).unpack_from(buf, pos + HEADER_SIZE)
+        return {
+            column: _text(value) if char in "nNZ" else value
+            for column, char, value in zip(self.columns, self.format, values)
+        }
+
+    def column_slices(self) -> list[slice]:
+        """Return the byte range of each column within a whole record."""
+        slices = []
+        offset = HEADER_SIZE
+        for char in self.format:
+            size = struct.calcsize("<" + FORMAT_CODES[char])
+            slices.append(slice(offset, offset + size))
+            offset += size
+        return slices
+
+    def field_slices(self) -> dict[str, slice]:
+        """Return each column's byte range within a whole record, by name."""
+        return dict(zip(self.columns, self.column_slices()))
+
+
+def parse_fmt(buf, pos: int) -> MessageFormat:
+    """Decode the FMT record starting at `pos`."""
+    type_, length, name, format_, columns = FMT_STRUCT.unpack_from(buf, pos + HEADER_SIZE)
+    return MessageFormat(
+        type_, length, _text(name), _text(format_), tuple(_text(columns).split(","))
+    )
+
+
+def iter_records(buf, formats: dict[int, MessageFormat] | None = None):
+    """Yield (offset, MessageFormat) for every record of a log buffer.
+
+    FMT records are decoded as they are met, so `formats` fills up with
+    the log's schema during the walk. Bytes that don't start a known,
+    complete record (corruption, a truncated tail) are skipped up to the
+    next record header.
+
+    Args:
+        buf: The log contents (bytes, mmap or memoryview).
+        formats: Known message formats by type; updated in place.
+    """
+    if formats is None:
+        formats = {}
+    formats.setdefault(FMT_TYPE, MessageFormat(
+        FMT_TYPE, HEADER_SIZE + FMT_STRUCT.size, "FMT", "BBnNZ",
+        ("Type", "Length", "Name", "Format", "Columns"),
+    ))
+    size = len(buf)
+    pos = 0
+    while pos + HEADER_SIZE <= size:
+        fmt = formats.get(buf[pos + 2]) if buf[pos:pos + 2] == HEAD else None
+        if fmt is None or pos + fmt.length > size:
+            pos = buf.find(HEAD, pos + 1)
+            if pos < 0:
+                return
+            continue
+        if fmt.type == FMT_TYPE:
+            declared = parse_fmt(buf, pos)
+            if declared.type != FMT_TYPE:
+                formats[declared.type] = declared
+        yield pos, fmt
+        pos += fmt.length
@@ -10,16 +10,21 @@ from quiver.equipment.peripheral.assembly import make_assembly as peripheral
 from quiver.equipment.pcb.assembly import make_assembly as pcb
 from quiver.equipment.battery.assembly import make_assembly as battery
 
+LABEL = "Equipment"
+
+# Subcategory builders, keyed by BOM number
+SUBASSEMBLIES = {
+    3100: propulsion,
+    3200: peripheral,
+    3300: pcb,
+    3400: battery,
+}
+
 
 def make_assembly() -> Compound | None:
     """Build the complete equipment assembly from all subcategories."""
-    subassemblies = [
-        propulsion(),
-        peripheral(),
-        pcb(),
-        battery(),
-    ]
+    subassemblies = [build() for build in SUBASSEMBLIES.values()]
     children = [s for s in subassemblies if s is not None]
     if not children:
         return None
-    return Compound(children=children, label="Equipment")
+    return Compound(children=children, label=LABEL)
@@ -5,20 +5,19 @@ No transform needed — exported with correct position baked in.
 
 Vendor parts in steps/vendor/:
     3410_battery.step       Tattu 4.0 30Ah battery pack (no transform)
+
+Part placements are listed in parts.toml (see quiver.manifest).
 """
 
 from pathlib import Path
 
 from build123d import Compound
 
-from quiver.common import load_step
+from quiver.manifest import build_from_manifest
 
 _DIR = Path(__file__).parent
 
 
 def make_assembly() -> Compound | None:
-    """Build the battery subassembly from imported STEP files."""
-    battery = load_step(_DIR, "3410_battery", vendor=True)
-    if not battery:
-        return None
-    return Compound(children=[battery], label="Battery")
+    """Build the battery subassembly from its placement manifest."""
+    return build_from_manifest(_DIR)
@@ -0,0 +1,209 @@
+"""STEP export with true part instancing.
+
+build123d's export_step writes every leaf of the assembly as its own copy
+of the geometry. This module builds the XCAF document by hand instead:
+every leaf whose TShape is shared with an earlier leaf (the four motors,
+the three attach plates, ...) becomes another instance (a STEP
+NEXT_ASSEMBLY_USAGE_OCCURRENCE) of one product, placed by its
+TopLoc_Location. The geometry is written once per unique part. Each
+instance keeps its own name, and its own color where it differs from the
+part's.
+
+Sharing comes from load_step, which hands out instances of one master
+shape, and from rotate_instance/move, which only change locations.
+
+export_step_streamed writes each subassembly to its own STEP file instead,
+with its own writer, so the shapes, XCAF document and STEP model of only
+one subassembly are alive at once.
+"""
+
+from collections.abc import Iterable
+from pathlib import Path
+
+from build123d import Color, Compound, Shape
+from OCP.IFSelect import IFSelect_ReturnStatus
+from OCP.Interface import Interface_Static
+from OCP.STEPCAFControl import STEPCAFControl_Writer
+from OCP.STEPControl import STEPControl_StepModelType
+from OCP.TCollection import TCollection_ExtendedString
+from OCP.TDataStd import TDataStd_Name
+from OCP.TDF import TDF_Label
+from OCP.TDocStd import TDocStd_Document
+from OCP.TopLoc import TopLoc_Location
+from OCP.TopoDS import TopoDS_Shape
+from OCP.XCAFApp import XCAFApp_Application
+from OCP.XCAFDoc import XCAFDoc_ColorType, XCAFDoc_DocumentTool
+
+
+class PrototypeIndex:
+    """Map shapes to the unique parts (TShapes) they are instances of.
+
+    Two shapes are instances of the same part when they share a TShape and
+    differ only by location (TopoDS_Shape.IsPartner). Assemblies hold a few
+    dozen unique parts, so a linear scan is plenty fast.
+    """
+
+    def __init__(self):
+        self.prototypes: list[TopoDS_Shape] = []
+
+    def find(self, shape: TopoDS_Shape) -> int | None:
+        """Return the index of the prototype `shape` instances, if any."""
+        for i, proto in enumerate(self.prototypes):
+            if shape.IsPartner(proto):
+                return i
+        return None
+
+    def add(self, shape: TopoDS_Shape) -> int:
+        """Return the prototype index for `shape`, registering it if new.
+
+        Prototypes are stored at the identity location, so an instance's
+        own Location() is its placement relative to the prototype.
+        """
+        index = self.find(shape)
+        if index is None:
+            index = len(self.prototypes)
+            self.prototypes.append(shape.Located(TopLoc_Location()))
+        return index
+
+
+def _set_name(label: TDF_Label, name: str | None) -> None:
+    if name:
+        TDataStd_Name.Set_s(label, TCollection_ExtendedString(name))
+
+
+def _same_color(a: Color | None, b: Color | None) -> bool:
+    if a is None or b is None:
+        return a is b
+    return a.wrapped.IsEqual(b.wrapped)
+
+
+class _XdeDocument:
+    """An XCAF document that stores each unique part once."""
+
+    def __init__(self):
+        self.doc = TDocStd_Document(TCollection_ExtendedString("XmlOcaf"))
+        XCAFApp_Application.GetApplication_s().InitDocument(self.doc)
+        self.shape_tool = XCAFDoc_DocumentTool.ShapeTool_s(self.doc.Main())
+        self.color_tool = XCAFDoc_DocumentTool.ColorTool_s(self.doc.Main())
+        self.shape_tool.SetAutoNaming_s(False)
+        self.index = PrototypeIndex()
+        self.part_labels: list[TDF_Label] = []
+        self.part_colors: list[Color | None] = []  # as set on each part label
+
+    def _set_color(self, label: TDF_Label, color: Color) -> None:
+        self.color_tool.SetColor(label, color.wrapped, XCAFDoc_ColorType.XCAFDoc_ColorSurf)
+
+    def _part_index(self, leaf: Shape) -> int:
+        """Return the index of the part `leaf` is an instance of, adding it if new.
+
+        A new part takes its name and color from this first instance.
+        """
+        index = self.index.add(leaf.wrapped)
+        if index == len(self.part_labels):
+            label = self.shape_tool.AddShape(self.index.prototypes[index], False)
+            _set_name(label, leaf.label)
+            if leaf.color is not None:
+                self._set_color(label, leaf.color)
+            self.part_labels.append(label)
+            self.part_colors.append(leaf.color)
+        return index
+
+    def add_assembly(self, node: Shape) -> TDF_Label:
+        """Add an assembly node and, recursively, all of its children."""
+        label = self.shape_tool.NewShape()
+        _set_name(label, node.label)
+        for child in node.children:
+            self.add(child, label)
+        return label
+
+    def add(self, node: Shape, parent: TDF_Label) -> TDF_Label:
+        """Add `node` as a component of the assembly at `parent`."""
+        if node.children:
+            component = self.shape_tool.AddComponent(
+                parent, self.add_assembly(node), node.wrapped.Location()
+            )
+            _set_name(component, node.label)
+            return component
+        index = self._part_index(node)
+        component = self.shape_tool.AddComponent(
+            parent, self.part_labels[index], node.wrapped.Location()
+        )
+        # Each instance keeps its own name, and its own color where it
+        # differs from the one the part took from its first instance
+        _set_name(component, node.label)
+        if node.color is not None and not _same_color(node.color, self.part_colors[index]):
+            self._set_color(component, node.color)
+        return component
+
+    def transfer(self, writer: STEPCAFControl_Writer) -> None:
+        """Translate the document into a STEP writer's model."""
+        self.shape_tool.UpdateAssemblies()
+        writer.Transfer(self.doc, STEPControl_StepModelType.STEPControl_AsIs)
+
+    def write(self, path: Path) -> None:
+        """Write the document as an AP214 STEP file."""
+        writer = _step_writer()
+        self.transfer(writer)
+        _write(writer, path)
+
+
+def _step_writer() -> STEPCAFControl_Writer:
+    Interface_Static.SetCVal_s("write.step.unit", "MM")
+    writer = STEPCAFControl_Writer()
+    writer.SetColorMode(True)
+    writer.SetNameMode(True)
+    return writer
+
+
+def _write(writer: STEPCAFControl_Writer, path: Path) -> None:
+    status = writer.Write(str(path))
+    if status != IFSelect_ReturnStatus.IFSelect_RetDone:
+        raise RuntimeError(f"STEP export to {path} failed ({status})")
+
+
+def export_step_instanced(assembly: Compound, path: Path) -> int:
+    """Export an assembly as STEP, writing repeated parts as instances.
+
+    Args:
+        assembly: Root of the labeled Compound hierarchy.
+        path: Output STEP file path.
+
+    Returns:
+        The number of unique parts written.
+    """
+    xde = _XdeDocument()
+    xde.add_assembly(assembly)
+    xde.write(path)
+    return len(xde.part_labels)
+
+
+def export_step_streamed(
+    subassemblies: Iterable[tuple[str, Compound | None]], directory: Path
+) -> list[Path]:
+    """Export subassemblies to one STEP file each, without holding them all.
+
+    Each subassembly gets its own XCAF document and STEP writer, which are
+    written out and dropped before the next subassembly is requested, so
+    peak memory follows the largest subassembly rather than the whole
+    drone. Pair it with quiver.build.stream_leaves, which builds leaves
+    lazily and releases their shapes. Repeated parts are still written as
+    instances within each file.
+
+    Args:
+        subassemblies: (file stem, labeled Compound) pairs; None compounds
+            are skipped.
+        directory: Output directory, created if needed.
+
+    Returns:
+        The paths written, in order.
+    """
+    directory = Path(directory)
+    written = []
+    for stem, node in subassemblies:
+        if node is None:
+            continue
+        directory.mkdir(parents=True, exist_ok=True)
+        path = directory / f"{stem}.step"
+        export_step_instanced(node, path)
+        written.append(path)
+    return written
@@ -0,0 +1,281 @@
+"""Multi-format export from a single build.
+
+Builds the assembly once, tessellates each unique part once, and then
+writes every requested format, for the whole drone and optionally for
+each unique part:
+
+    step    STEP with part instancing (quiver.export)
+    brep    OCCT BREP
+    stl     binary STL (whole drone merged, or one part)
+    3mf     3MF with one object per unique part, placed by build items
+    glb     binary glTF (quiver.mesh)
+
+STL, 3MF and GLB share the same cached meshes. Per-part files sit in a
+parts/ subdirectory, named after the part label, at the part's own frame
+(as exported from CAD), which is what the slicer wants for printed parts.
+
+Files are written one at a time by default; with --jobs N the writers
+run on a pool of N threads. The mesh writers spend most of their time in
+NumPy and zlib and overlap well; the OCCT writers (STEP, BREP) hold the
+GIL and mostly run one at a time.
+
+Usage:
+    python -m quiver.formats                                # all formats
+    python -m quiver.formats --formats stl,3mf --per-part --material PETG
+    python -m quiver.formats --formats glb --lod medium
+    python -m quiver.formats -j 4                           # write 4 files at a time
+"""
+
+import argparse
+import os
+import re
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from build123d import Color, Compound, export_brep
+from OCP.gp import gp_Trsf
+
+from quiver import profiling
+from quiver.common import COLORS, LODS, rgba
+from quiver.export import export_step_instanced
+from quiver.mesh import (
+    ANGULAR_TOLERANCE,
+    TOLERANCE,
+    Mesh,
+    export_glb,
+    merged,
+    placed_parts,
+    tessellate,
+    transformed,
+    write_3mf,
+    write_stl,
+)
+
+FORMATS = ("step", "brep", "stl", "3mf", "glb")
+
+PARTS_DIR = "parts"
+
+
+def _format_list(text: str) -> list[str]:
+    """Parse --formats, rejecting unknown formats before anything is built."""
+    formats = text.split(",")
+    unknown = set(formats) - set(FORMATS)
+    if unknown:
+        raise argparse.ArgumentTypeError(
+            f"unknown formats {sorted(unknown)}; choose from {','.join(FORMATS)}"
+        )
+    return formats
+
+
+def _file_stem(label: str) -> str:
+    return re.sub(r"[^\w-]+", "_", label).strip("_") or "part"
+
+
+def _whole_drone_writers(
+    assembly: Compound, meshes: list[Mesh], formats: list[str], stem: Path
+) -> dict[Path, Callable[[], object]]:
+    """Return a writer per requested format for the whole assembly."""
+    _, leaves = placed_parts(assembly)
+    writers = {}
+    if "step" in formats:
+        writers[stem.with_suffix(".step")] = lambda: export_step_instanced(
+            assembly, stem.with_suffix(".step")
+        )
+    if "brep" in formats:
+        writers[stem.with_suffix(".brep")] = lambda: export_brep(
+            assembly, stem.with_suffix(".brep")
+        )
+    if "stl" in formats:
+        writers[stem.with_suffix(".stl")] = lambda: write_stl(
+            merged([transformed(meshes[proto], world) for _, proto, world in leaves]),
+            stem.with_suffix(".stl"),
+        )
+    if "3mf" in formats:
+        def write_assembly_3mf():
+            objects, ids, items = [], {}, []
+            for leaf, proto, world in leaves:
+                key = (proto, rgba(leaf.color) if leaf.color is not None else None)
+                if key not in ids:
+                    ids[key] = len(objects)
+                    objects.append((leaf.label or f"part{proto}", meshes[proto], leaf.color))
+                items.append((ids[key], world))
+            write_3mf(objects, items, stem.with_suffix(".3mf"))
+
+        writers[stem.with_suffix(".3mf")] = write_assembly_3mf
+    if "glb" in formats:
+        writers[stem.with_suffix(".glb")] = lambda: export_glb(
+            assembly, stem.with_suffix(".glb"), meshes=meshes
+        )
+    return writers
+
+
+def _part_writers(
+    assembly: Compound,
+    meshes: list[Mesh],
+    formats: list[str],
+    directory: Path,
+    material: Color | None = None,
+) -> dict[Path, Callable[[], object]]:
+    """Return a writer per requested format for each unique part.
+
+    Args:
+        material: Only export parts of this color (e.g. PETG prints).
+    """
+    index, leaves = placed_parts(assembly)
+    firsts = {}
+    for leaf, proto, _ in leaves:
+        firsts.setdefault(proto, leaf)
+    writers = {}
+    used_stems = set()
+    for proto, leaf in firsts.items():
+        if material is not None and (
+            leaf.color is None or rgba(leaf.color) != rgba(material)
+        ):
+            continue
+        stem = _file_stem(leaf.label or f"part{proto}")
+        if stem in used_stems:
+            stem = f"{stem}_{proto}"
+        used_stems.add(stem)
+        path = directory / stem
+        part = Compound(index.prototypes[proto])
+        part.label, part.color = leaf.label, leaf.color
+        mesh = meshes[proto] if meshes else None
+        if "step" in formats:
+            writers[path.with_suffix(".step")] = (
+                lambda part=part, out=path.with_suffix(".step"): export_step_instanced(
+                    Compound(children=[part], label=part.label), out
+                )
+            )
+        if "brep" in formats:
+            writers[path.with_suffix(".brep")] = (
+                lambda part=part, out=path.with_suffix(".brep"): export_brep(part, out)
+            )
+        if "stl" in formats:
+            writers[path.with_suffix(".stl")] = (
+                lambda mesh=mesh, out=path.with_suffix(".stl"): write_stl(mesh, out)
+            )
+        if "3mf" in formats:
+            writers[path.with_suffix(".3mf")] = (
+                lambda part=part, mesh=mesh, out=path.with_suffix(".3mf"): write_3mf(
+                    [(part.label or out.stem, mesh, part.color)], [(0, gp_Trsf())], out
+                )
+            )
+        if "glb" in formats:
+            writers[path.with_suffix(".glb")] = (
+                lambda part=part, mesh=mesh, out=path.with_suffix(".glb"): export_glb(
+                    part, out, meshes=[mesh]
+                )
+            )
+    return writers
+
+
+def export_formats(
+    assembly: Compound,
+    directory: Path,
+    formats: list[str] = FORMATS,
+    name: str = "quiver_assembly",
+    per_part: bool = False,
+    material: Color | None = None,
+    jobs: int = 1,
+    tolerance: float = TOLERANCE,
+    angular_tolerance: float = ANGULAR_TOLERANCE,
+) -> list[Path]:
+    """Write an already built assembly in several formats at once.
+
+    Args:
+        assembly: Root of the labeled Compound hierarchy.
+        directory: Output directory (created if needed).
+        formats: Any of FORMATS.
+        name: File stem for the whole-assembly files.
+        per_part: Also write each unique part to directory/parts/.
+        material: With per_part, only write parts of this color.
+        jobs: Number of writer threads.
+        tolerance: Chordal meshing deviation in mm (STL, 3MF, GLB).
+        angular_tolerance: Angular meshing deviation in radians.
+
+    Returns:
+        The paths written.
+
+    Raises:
+        ValueError: If a format is not one of FORMATS.
+    """
+    unknown = set(formats) - set(FORMATS)
+    if unknown:
+        raise ValueError(f"Unknown formats {sorted(unknown)}; choose from {FORMATS}")
+    index, _ = placed_parts(assembly)
+    if {"stl", "3mf", "glb"} & set(formats):
+        meshes = tessellate(index.prototypes, tolerance, angular_tolerance)
+    else:
+        meshes = []
+    directory.mkdir(parents=True, exist_ok=True)
+    writers = _whole_drone_writers(assembly, meshes, formats, directory / name)
+    if per_part:
+        (directory / PARTS_DIR).mkdir(exist_ok=True)
+        writers.update(
+            _part_writers(assembly, meshes, formats, directory / PARTS_DIR, material)
+        )
+
+    def run(path: Path, write: Callable[[], object]) -> Path:
+        with profiling.span(f"write {path.name}"):
+            write()
+        return path
+
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        futures = [pool.submit(run, path, write) for path, write in writers.items()]
+        return [future.result() for future in futures]
+
+
+if __name__ == "__main__":
+    from quiver.assembly import EXPORT_DIR, make_assembly
+
+    parser = argparse.ArgumentParser(description="Export the Quiver drone in several formats")
+    parser.add_argument(
+        "--formats",
+        type=_format_list,
+        default=list(FORMATS),
+        metavar="FMT[,FMT...]",
+        help=f"Formats to write (default: all of {','.join(FORMATS)})",
+    )
+    parser.add_argument("-o", "--output", type=Path, default=EXPORT_DIR, help="Output directory")
+    parser.add_argument(
+        "--per-part", action="store_true", help="Also write every unique part to parts/"
+    )
+    parser.add_argument(
+        "--material",
+        choices=sorted(COLORS),
+        help="With --per-part, only write parts of this material (e.g. PETG)",
+    )
+    parser.add_argument(
+        "-j", "--jobs", type=int, default=1, help="Build and write with N processes/threads"
+    )
+    parser.add_argument(
+        "--only",
+        type=lambda s: [int(bom) for bom in s.split(",")],
+        metavar="BOM[,BOM...]",
+        help="Build only these BOM categories/subcategories (e.g. 1300,3100)",
+    )
+    parser.add_argument("--lod", choices=LODS, default="full", help="Level of detail")
+    parser.add_argument(
+        "--no-cache", action="store_true", help="Bypass the on-disk geometry cache"
+    )
+    args = parser.parse_args()
+
+    if args.no_cache:
+        os.environ["QUIVER_NO_CACHE"] = "1"
+
+    assembly = make_assembly(args.jobs, args.only, args.lod)
+    if assembly is None:
+        raise SystemExit("No parts loaded. Add STEP files to subassembly steps/ directories.")
+    name = "quiver_assembly" if not args.only else "quiver_" + "-".join(map(str, args.only))
+    written = export_formats(
+        assembly,
+        args.output,
+        args.formats,
+        name=name,
+        per_part=args.per_part,
+        material=COLORS.get(args.material),
+        jobs=args.jobs,
+    )
+    for path in written:
+        print(f"Wrote {path}")
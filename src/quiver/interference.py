@@ -0,0 +1,345 @@
+"""Interference and clearance checking across the assembly.
+
+Exact checks between B-reps are expensive, so candidate pairs are pruned
+first. Every placed part gets an axis-aligned bounding box (its unique
+part's optimal box, moved by the placement), grown by the clearance
+margin. A bounding-volume hierarchy over those boxes then yields only
+the pairs whose boxes overlap. Just those pairs get the exact checks, in
+a process pool:
+
+    BRepExtrema_DistShapeShape   minimum distance (or one part inside
+                                 the other)
+    BRepAlgoAPI_Common           overlap volume, when the parts touch
+
+Pairs whose overlap exceeds _MIN_OVERLAP mm³ are collisions; parts that
+touch without overlapping (bolted faces) are contacts. Pairs whose exact
+distance check fails are reported as failed, never as clear. Pairs that the
+BVH prunes are at least `clearance` mm apart, so the reported minimum
+clearance per BOM pair only covers parts closer than that.
+
+Usage:
+    python -m quiver.interference                  # exit 1 on collisions or failures
+    python -m quiver.interference --clearance 2 -j 8
+    python -m quiver.interference --only 1300,1400 --json clashes.json
+"""
+
+import argparse
+import json
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import product
+from pathlib import Path
+from typing import NamedTuple
+
+import numpy as np
+from OCP.Bnd import Bnd_Box
+from OCP.BRepAlgoAPI import BRepAlgoAPI_Common
+from OCP.BRepBndLib import BRepBndLib
+from OCP.BRepExtrema import BRepExtrema_DistShapeShape
+from OCP.BRepGProp import BRepGProp
+from OCP.gp import gp_Trsf
+from OCP.GProp import GProp_GProps
+from OCP.TopLoc import TopLoc_Location
+from OCP.TopoDS import TopoDS_Shape
+
+from quiver import profiling
+from quiver.build import LazyAssembly
+from quiver.cache import shape_from_bytes, shape_to_bytes
+from quiver.common import box_bounds, use_lod
+from quiver.export import PrototypeIndex
+from quiver.mesh import placed_parts
+
+# Overlap volume (mm³) above which touching parts count as colliding
+_MIN_OVERLAP = 1.0
+
+# Parts per BVH leaf
+_LEAF_SIZE = 4
+
+
+class PlacedPart(NamedTuple):
+    """One placed part of the assembly."""
+
+    bom: int | None
+    label: str
+    prototype: int
+    placement: gp_Trsf
+
+
+class Contact(NamedTuple):
+    """Result of the exact check of one candidate pair."""
+
+    first: int  # index into the placed parts
+    second: int
+    distance: float  # mm, 0 when touching or overlapping, NaN if the check failed
+    overlap: float  # mm³
+
+    @property
+    def failed(self) -> bool:
+        """True when the exact distance could not be computed."""
+        return math.isnan(self.distance)
+
+
+def _placed_box(box: np.ndarray, trsf: gp_Trsf) -> np.ndarray:
+    """Return the axis-aligned box of a (min, max) box moved by `trsf`."""
+    lo, hi = box[:3], box[3:]
+    corners = np.array(list(product(*zip(lo, hi))))
+    matrix = np.array([[trsf.Value(r, c) for c in (1, 2, 3)] for r in (1, 2, 3)])
+    offset = np.array([trsf.Value(r, 4) for r in (1, 2, 3)])
+    moved = corners @ matrix.T + offset
+    return np.concatenate([moved.min(axis=0), moved.max(axis=0)])
+
+
+class _Node(NamedTuple):
+    lo: np.ndarray
+    hi: np.ndarray
+    items: np.ndarray | None  # leaf
+    children: tuple["_Node", "_Node"] | None  # inner node
+
+
+def _build_bvh(boxes: np.ndarray, items: np.ndarray) -> _Node:
+    """Build a BVH by splitting at the median center along the longest axis."""
+    lo = boxes[items, :3].min(axis=0)
+    hi = boxes[items, 3:].max(axis=0)
+    if len(items) <= _LEAF_SIZE:
+        return _Node(lo, hi, items, None)
+    axis = int(np.argmax(hi - lo))
+    centers = boxes[items, axis] + boxes[items, axis + 3]
+    ordered = items[np.argsort(centers, kind="stable")]
+    middle = len(ordered) // 2
+    children = (_build_bvh(boxes, ordered[:middle]), _build_bvh(boxes, ordered[middle:]))
+    return _Node(lo, hi, None, children)
+
+
+def _overlap(lo_a, hi_a, lo_b, hi_b) -> bool:
+    return bool(np.all(lo_a <= hi_b) and np.all(lo_b <= hi_a))
+
+
+def candidate_pairs(boxes: np.ndarray) -> list[tuple[int, int]]:
+    """Return every pair (i < j) of overlapping (n, 6) boxes via a BVH."""
+    if len(boxes) < 2:
+        return []
+    root = _build_bvh(boxes, np.arange(len(boxes)))
+    pairs = set()
+    stack = [(root, root)]
+    while stack:
+        a, b = stack.pop()
+        if not _overlap(a.lo, a.hi, b.lo, b.hi):
+            continue
+        if a.items is not None and b.items is not None:
+            for i in a.items:
+                for j in b.items:
+                    if i < j and _overlap(boxes[i, :3], boxes[i, 3:], boxes[j, :3], boxes[j, 3:]):
+                        pairs.add((int(i), int(j)))
+        elif a.items is not None or (
+            b.items is None and np.prod(b.hi - b.lo) > np.prod(a.hi - a.lo)
+        ):
+            stack.extend((a, child) for child in b.children)
+        else:
+            stack.extend((child, b) for child in a.children)
+    return sorted(pairs)
+
+
+# Unique parts in worker processes, as BREP and lazily parsed
+_worker_data: list[bytes] = []
+_worker_shapes: dict[int, TopoDS_Shape] = {}
+
+
+def _init_worker(prototypes: list[bytes]) -> None:
+    """Receive the unique parts once per worker process."""
+    global _worker_data
+    _worker_data = prototypes
+    _worker_shapes.clear()
+
+
+def _placed(prototype: int, values: tuple[float, ...]) -> TopoDS_Shape:
+    shape = _worker_shapes.get(prototype)
+    if shape is None:
+        shape = _worker_shapes[prototype] = shape_from_bytes(_worker_data[prototype])
+    trsf = gp_Trsf()
+    trsf.SetValues(*values)
+    return shape.Moved(TopLoc_Location(trsf))
+
+
+def _check_pair(task: tuple) -> Contact:
+    """Measure the distance and overlap of one candidate pair."""
+    i, j, proto_i, values_i, proto_j, values_j = task
+    a, b = _placed(proto_i, values_i), _placed(proto_j, values_j)
+    distance = BRepExtrema_DistShapeShape(a, b)
+    if not distance.IsDone():
+        return Contact(i, j, float("nan"), 0.0)
+    gap = distance.Value()
+    inside = distance.InnerSolution()
+    if gap > 0 and not inside:
+        return Contact(i, j, gap, 0.0)
+    common = BRepAlgoAPI_Common(a, b)
+    props = GProp_GProps()
+    BRepGProp.VolumeProperties_s(common.Shape(), props)
+    return Contact(i, j, 0.0, abs(props.Mass()))
+
+
+def _trsf_values(trsf: gp_Trsf) -> tuple[float, ...]:
+    return tuple(trsf.Value(r, c) for r in (1, 2, 3) for c in (1, 2, 3, 4))
+
+
+def place_parts(tree: LazyAssembly) -> tuple[PrototypeIndex, list[PlacedPart]]:
+    """List every placed part of a built BOM tree with its leaf BOM."""
+    index = PrototypeIndex()
+    parts = []
+    for leaf in tree.leaves():
+        if leaf.compound is None:
+            continue
+        leaf_index, placed = placed_parts(leaf.compound)
+        for part, proto, world in placed:
+            global_proto = index.add(leaf_index.prototypes[proto])
+            parts.append(PlacedPart(leaf.bom, part.label or leaf.label, global_proto, world))
+    return index, parts
+
+
+@profiling.traced
+def check(
+    tree: LazyAssembly,
+    clearance: float = 1.0,
+    jobs: int = 1,
+    boms: set[int] | None = None,
+) -> tuple[list[PlacedPart], list[Contact]]:
+    """Find collisions and small clearances between placed parts.
+
+    Args:
+        tree: A built LazyAssembly tree.
+        clearance: Pairs farther apart than this (mm) are not checked.
+        jobs: Number of worker processes for the exact checks.
+        boms: Only check pairs with at least one part from these leaf
+            BOMs (e.g. the subassemblies that changed).
+
+    Returns:
+        The placed parts and the exact result of every candidate pair
+        closer than `clearance`, plus every pair whose check failed.
+    """
+    index, parts = place_parts(tree)
+    unit_boxes = []
+    for proto in index.prototypes:
+        box = Bnd_Box()
+        BRepBndLib.AddOptimal_s(proto, box)
+        unit_boxes.append(np.array(box_bounds(box)) if not box.IsVoid() else None)
+    boxes = np.zeros((len(parts), 6))
+    valid = np.zeros(len(parts), dtype=bool)
+    for k, part in enumerate(parts):
+        unit = unit_boxes[part.prototype]
+        if unit is not None:
+            boxes[k] = _placed_box(unit, part.placement)
+            valid[k] = True
+    boxes[:, :3] -= clearance / 2
+    boxes[:, 3:] += clearance / 2
+
+    pairs = [
+        (i, j) for i, j in candidate_pairs(boxes)
+        if valid[i] and valid[j]
+        and (boms is None or parts[i].bom in boms or parts[j].bom in boms)
+    ]
+    tasks = [
+        (
+            i, j,
+            parts[i].prototype, _trsf_values(parts[i].placement),
+            parts[j].prototype, _trsf_values(parts[j].placement),
+        )
+        for i, j in pairs
+    ]
+    if jobs > 1 and len(tasks) > 1:
+        prototypes = [shape_to_bytes(proto, triangles=False) for proto in index.prototypes]
+        with ProcessPoolExecutor(jobs, initializer=_init_worker, initargs=(prototypes,)) as pool:
+            contacts = list(pool.map(_check_pair, tasks, chunksize=8))
+    else:
+        # In process, the parts are already parsed
+        _init_worker([])
+        _worker_shapes.update(enumerate(index.prototypes))
+        contacts = [_check_pair(task) for task in tasks]
+    return parts, [c for c in contacts if c.failed or c.distance <= clearance]
+
+
+def summarize(parts: list[PlacedPart], contacts: list[Contact]) -> dict[tuple, dict]:
+    """Group contacts by BOM pair: collisions, failed checks and the minimum clearance."""
+    summary = {}
+    for contact in contacts:
+        a, b = parts[contact.first], parts[contact.second]
+        key = tuple(sorted((a.bom, b.bom), key=lambda bom: -1 if bom is None else bom))
+        entry = summary.setdefault(
+            key, {"collisions": [], "failed": [], "contacts": 0, "min_clearance": float("inf")}
+        )
+        if contact.failed:
+            entry["failed"].append([a.label, b.label])
+        elif contact.overlap > _MIN_OVERLAP:
+            entry["collisions"].append(
+                {"parts": [a.label, b.label], "overlap_mm3": round(contact.overlap, 3)}
+            )
+        elif contact.distance == 0:
+            entry["contacts"] += 1
+        if not contact.failed and contact.overlap <= _MIN_OVERLAP:
+            entry["min_clearance"] = min(entry["min_clearance"], contact.distance)
+    for entry in summary.values():
+        if entry["min_clearance"] == float("inf"):
+            entry["min_clearance"] = None  # only collisions or failed checks
+    return summary
+
+
+if __name__ == "__main__":
+    from quiver.assembly import selected_tree
+    from quiver.build import build_parallel, build_serial
+
+    parser = argparse.ArgumentParser(description="Quiver interference check")
+    parser.add_argument(
+        "--clearance",
+        type=float,
+        default=1.0,
+        help="Report pairs closer than this many mm (default 1.0)",
+    )
+    parser.add_argument(
+        "-j", "--jobs", type=int, default=1, help="Build and check in N processes"
+    )
+    parser.add_argument(
+        "--only",
+        type=lambda s: [int(bom) for bom in s.split(",")],
+        metavar="BOM[,BOM...]",
+        help="Check only these BOM categories/subcategories (e.g. 1300,1400)",
+    )
+    parser.add_argument("--json", type=Path, help="Also write the report as JSON")
+    parser.add_argument(
+        "--no-cache", action="store_true", help="Bypass the on-disk geometry cache"
+    )
+    args = parser.parse_args()
+
+    if args.no_cache:
+        os.environ["QUIVER_NO_CACHE"] = "1"
+
+    tree = selected_tree(args.only)
+    with use_lod("full"):
+        if args.jobs > 1:
+            build_parallel(tree, args.jobs)
+        else:
+            build_serial(tree)
+    parts, contacts = check(tree, args.clearance, args.jobs)
+    summary = summarize(parts, contacts)
+
+    collisions = failed = 0
+    print(f"{len(parts)} placed parts, {len(contacts)} pairs closer than {args.clearance} mm")
+    for (bom_a, bom_b), entry in sorted(summary.items(), key=lambda item: str(item[0])):
+        collisions += len(entry["collisions"])
+        failed += len(entry["failed"])
+        gap = entry["min_clearance"]
+        gap_text = "-" if gap is None else f"{gap:.3f} mm"
+        print(f"\n{bom_a} / {bom_b}: {len(entry['collisions'])} collisions, "
+              f"{entry['contacts']} contacts, min clearance {gap_text}")
+        for collision in entry["collisions"]:
+            first, second = collision["parts"]
+            print(f"  COLLISION {first} <-> {second}: {collision['overlap_mm3']} mm³")
+        for first, second in entry["failed"]:
+            print(f"  FAILED {first} <-> {second}: exact distance check did not converge")
+    if args.json:
+        data = [
+            {"boms": [bom_a, bom_b], **entry}
+            for (bom_a, bom_b), entry in summary.items()
+        ]
+        args.json.write_text(json.dumps(data, indent=2, default=str) + "\n")
+        print(f"\nWrote {args.json}")
+    if collisions or failed:
+        raise SystemExit(1)
@@ -0,0 +1,159 @@
+"""Declarative placement manifests for subassemblies.
+
+Most subassemblies only load STEP files, rotate them, move them to a
+reference position and color them. Instead of hand-writing that sequence
+per part, a subassembly lists its parts in a `parts.toml` next to its
+assembly.py, and build_from_manifest turns the manifest into a Compound.
+
+Manifest format:
+
+    label = "Attachment Interface"      # Compound label
+
+    [[part]]
+    file = "2112_attach_plate"          # STEP file stem
+    vendor = false                      # load from steps/vendor/
+    color = "ALUMINUM"                  # name from quiver.common.COLORS
+    extract_solids = false              # see load_step
+    min_solid_volume = 0.0              # see load_step
+    volume_mode = "bbox"                # "bbox" or "true", see load_step
+    max_solids = 200                    # see load_step
+
+    [[part.instance]]                   # one table per placed copy
+    origin = [0, 0, 0]                  # point moved to the origin first
+    rotate = [["Z", 90], ["X", 180]]    # (axis, degrees), applied in order
+    com = [185.65, -0.02, -71.00]       # target center of mass, or...
+    move = [0, 0, 13.15]                # ...a plain translation
+    mirror = "YZ"                       # also add a mirrored copy
+
+A part without instance tables is placed once, as exported. Each file is
+parsed once however many instances it has, and each instance is placed
+with a single composed transform (see quiver.common.place).
+"""
+
+import sys
+from pathlib import Path
+
+from build123d import Axis, Compound, Plane, Shape
+
+from quiver import profiling
+from quiver.common import COLORS, VOLUME_MODES, load_step, place
+
+if sys.version_info >= (3, 11):
+    import tomllib
+else:
+    import tomli as tomllib
+
+MANIFEST_FILE = "parts.toml"
+
+_AXES = {"X": Axis.X, "Y": Axis.Y, "Z": Axis.Z}
+_PLANES = {"XY": Plane.XY, "YZ": Plane.YZ, "XZ": Plane.XZ}
+
+_PART_KEYS = {
+    "file",
+    "vendor",
+    "color",
+    "extract_solids",
+    "min_solid_volume",
+    "volume_mode",
+    "max_solids",
+    "instance",
+}
+_INSTANCE_KEYS = {"origin", "rotate", "com", "move", "mirror"}
+
+
+def load_manifest(subassembly_dir: Path) -> dict:
+    """Read and validate a subassembly's parts.toml.
+
+    Raises:
+        FileNotFoundError: If the subassembly has no manifest.
+        ValueError: If the manifest has unknown keys or bad values.
+    """
+    path = subassembly_dir / MANIFEST_FILE
+    with open(path, "rb") as f:
+        manifest = tomllib.load(f)
+    for spec in manifest.get("part", []):
+        _check_keys(path, spec, _PART_KEYS, spec.get("file", "?"))
+        if "color" in spec and spec["color"] not in COLORS:
+            raise ValueError(f"{path}: {spec['file']}: unknown color {spec['color']!r}")
+        if spec.get("volume_mode", "bbox") not in VOLUME_MODES:
+            raise ValueError(
+                f"{path}: {spec['file']}: unknown volume_mode {spec['volume_mode']!r}"
+            )
+        for inst in spec.get("instance", []):
+            _check_keys(path, inst, _INSTANCE_KEYS, spec["file"])
+            if "com" in inst and "move" in inst:
+                raise ValueError(f"{path}: {spec['file']}: instance has both com and move")
+            for axis, _ in inst.get("rotate", []):
+                if axis not in _AXES:
+                    raise ValueError(f"{path}: {spec['file']}: unknown axis {axis!r}")
+            if inst.get("mirror", "XY") not in _PLANES:
+                raise ValueError(f"{path}: {spec['file']}: unknown plane {inst['mirror']!r}")
+    return manifest
+
+
+def _check_keys(path: Path, table: dict, allowed: set[str], name: str) -> None:
+    unknown = set(table) - allowed
+    if unknown:
+        raise ValueError(f"{path}: {name}: unknown keys {sorted(unknown)}")
+
+
+def _optional(values: list | None) -> tuple | None:
+    return tuple(values) if values is not None else None
+
+
+def build_part(subassembly_dir: Path, spec: dict) -> list[Shape]:
+    """Load one manifest part entry and return all of its placed instances."""
+    color = COLORS.get(spec.get("color"))
+    placed = []
+    for inst in spec.get("instance", [{}]):
+        part = load_step(
+            subassembly_dir,
+            spec["file"],
+            vendor=spec.get("vendor", False),
+            extract_solids=spec.get("extract_solids", False),
+            min_solid_volume=spec.get("min_solid_volume", 0.0),
+            volume_mode=spec.get("volume_mode", "bbox"),
+            max_solids=spec.get("max_solids"),
+        )
+        if part is None:
+            return []
+        part = place(
+            part,
+            rotations=[(_AXES[axis], angle) for axis, angle in inst.get("rotate", [])],
+            com=_optional(inst.get("com")),
+            move=_optional(inst.get("move")),
+            origin=_optional(inst.get("origin")),
+        )
+        part.color = color
+        placed.append(part)
+        if "mirror" in inst:
+            mirrored = part.mirror(_PLANES[inst["mirror"]])
+            mirrored.color = color
+            placed.append(mirrored)
+    return placed
+
+
+def _build_children(subassembly_dir: Path, manifest: dict) -> list[Shape]:
+    children = []
+    for spec in manifest.get("part", []):
+        children.extend(build_part(subassembly_dir, spec))
+    return children
+
+
+def load_manifest_parts(subassembly_dir: Path) -> list[Shape]:
+    """Return every placed part listed in a subassembly's manifest."""
+    return _build_children(subassembly_dir, load_manifest(subassembly_dir))
+
+
+def build_from_manifest(subassembly_dir: Path) -> Compound | None:
+    """Build a subassembly Compound from its parts.toml.
+
+    Returns:
+        The labeled Compound, or None if none of the STEP files exist yet.
+    """
+    manifest = load_manifest(subassembly_dir)
+    children = _build_children(subassembly_dir, manifest)
+    if not children:
+        return None
+    with profiling.span(f"Compound {manifest['label']}"):
+        return Compound(children=children, label=manifest["label"])
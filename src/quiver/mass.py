@@ -0,0 +1,216 @@
+"""Mass properties and center of gravity of the drone.
+
+Each unique part (TShape, see quiver.export.PrototypeIndex) is integrated
+once with BRepGProp at unit density: volume, center of mass and inertia
+tensor about that center, all in the part's own frame. The results are
+cached by a hash of the part's B-rep, so later runs skip the integration
+entirely.
+
+Assembly totals are rolled up analytically: every instance's center and
+inertia are moved by its placement (c' = R c + t, I' = R I Rᵀ), scaled
+by the density of its material color (DENSITIES in quiver.common), and
+summed about the combined center with the parallel-axis theorem. Parts
+without a material color (vendor parts) use DEFAULT_DENSITY, and their
+mass is reported as estimated.
+
+Units: mm, g, g·mm².
+
+Usage:
+    python -m quiver.mass                  # per-BOM and whole-drone report
+    python -m quiver.mass --only 3000 -j 8
+    python -m quiver.mass --json mass.json
+"""
+
+import argparse
+import json
+import os
+from pathlib import Path
+from typing import NamedTuple
+
+import numpy as np
+from build123d import Compound
+from OCP.BRepGProp import BRepGProp
+from OCP.GProp import GProp_GProps
+from OCP.TopoDS import TopoDS_Shape
+
+from quiver import cache, profiling
+from quiver.build import LazyAssembly
+from quiver.common import DEFAULT_DENSITY, DENSITIES, material_name, use_lod
+from quiver.mesh import placed_parts
+
+# g/cm³ to g/mm³
+_PER_MM3 = 1e-3
+
+
+class MassProperties(NamedTuple):
+    """Mass properties of a part or assembly, in assembly coordinates."""
+
+    mass: float  # g
+    center: np.ndarray  # (3,) mm
+    inertia: np.ndarray  # (3, 3) g·mm², about `center`
+    estimated: float = 0.0  # g of `mass` from DEFAULT_DENSITY
+
+    def to_dict(self) -> dict:
+        return {
+            "mass_g": self.mass,
+            "center_mm": self.center.tolist(),
+            "inertia_g_mm2": self.inertia.tolist(),
+            "estimated_g": self.estimated,
+        }
+
+
+def _integrate(shape: TopoDS_Shape) -> dict:
+    props = GProp_GProps()
+    BRepGProp.VolumeProperties_s(shape, props)
+    volume = props.Mass()
+    if volume == 0:
+        return {"volume": 0.0, "center": [0.0, 0.0, 0.0], "inertia": np.zeros((3, 3)).tolist()}
+    # Reversed solids integrate to negative volume and inertia
+    sign = 1.0 if volume > 0 else -1.0
+    center = props.CentreOfMass()
+    matrix = props.MatrixOfInertia()
+    return {
+        "volume": abs(volume),
+        "center": [center.X(), center.Y(), center.Z()],
+        "inertia": [[sign * matrix.Value(r, c) for c in (1, 2, 3)] for r in (1, 2, 3)],
+    }
+
+
+def part_properties(shape: TopoDS_Shape) -> tuple[float, np.ndarray, np.ndarray]:
+    """Return a part's volume (mm³), center and unit-density inertia.
+
+    The inertia tensor (mm⁵) is about the center of mass, in the part's
+    own frame. Results are cached by the part's B-rep.
+    """
+    key = cache.make_shape_key(shape, kind="mass") if cache.enabled() else None
+    props = cache.get_json("mass", key) if key else None
+    if props is None:
+        props = _integrate(shape)
+        if key:
+            cache.put_json("mass", key, props)
+    return props["volume"], np.array(props["center"]), np.array(props["inertia"])
+
+
+def combine(parts: list[MassProperties]) -> MassProperties:
+    """Sum mass properties with the parallel-axis theorem."""
+    if not parts:
+        return MassProperties(0.0, np.zeros(3), np.zeros((3, 3)))
+    masses = np.array([p.mass for p in parts])
+    centers = np.array([p.center for p in parts])
+    total = masses.sum()
+    if total == 0:
+        return MassProperties(0.0, np.zeros(3), np.zeros((3, 3)))
+    center = masses @ centers / total
+    offsets = centers - center
+    # I = Σ I_i + m_i (|d|² E - d dᵀ)
+    shifted = masses[:, None, None] * (
+        np.einsum("ij,ij->i", offsets, offsets)[:, None, None] * np.eye(3)
+        - np.einsum("ij,ik->ijk", offsets, offsets)
+    )
+    inertia = np.sum([p.inertia for p in parts], axis=0) + shifted.sum(axis=0)
+    return MassProperties(total, center, inertia, sum(p.estimated for p in parts))
+
+
+@profiling.traced
+def assembly_mass(assembly: Compound) -> MassProperties:
+    """Roll up the mass properties of every placed part of an assembly."""
+    index, leaves = placed_parts(assembly)
+    unit = [part_properties(proto) for proto in index.prototypes]
+    placed = []
+    for leaf, proto, world in leaves:
+        volume, center, inertia = unit[proto]
+        name = material_name(leaf.color)
+        density = DENSITIES.get(name, DEFAULT_DENSITY) * _PER_MM3
+        mass = density * volume
+        rotation = np.array(
+            [[world.Value(r, c) for c in (1, 2, 3)] for r in (1, 2, 3)]
+        )
+        offset = np.array([world.Value(r, 4) for r in (1, 2, 3)])
+        placed.append(MassProperties(
+            mass,
+            rotation @ center + offset,
+            density * rotation @ inertia @ rotation.T,
+            mass if name not in DENSITIES else 0.0,
+        ))
+    return combine(placed)
+
+
+def mass_report(tree: LazyAssembly) -> dict[int | None, tuple[str, MassProperties]]:
+    """Compute mass properties for every node of a built BOM tree.
+
+    Build the tree at the "full" LOD; coarser tiers drop solids. Leaves
+    are integrated from their parts; categories and the root are combined
+    from their children without touching any geometry.
+
+    Returns:
+        (label, properties) by BOM number; the root is keyed by None.
+    """
+    report = {}
+
+    def visit(node: LazyAssembly) -> MassProperties:
+        report[node.bom] = None  # keep the report in tree order
+        if node.is_leaf:
+            compound = node.compound
+            props = assembly_mass(compound) if compound is not None else combine([])
+        else:
+            props = combine([visit(child) for child in node.children])
+        report[node.bom] = (node.label, props)
+        return props
+
+    visit(tree)
+    return report
+
+
+def _print_report(report: dict[int | None, tuple[str, MassProperties]]) -> None:
+    print(f"{'BOM':<6}{'assembly':<28}{'mass g':>10}{'est. g':>9}"
+          f"{'CoG x':>10}{'CoG y':>10}{'CoG z':>10}")
+    for bom, (label, props) in report.items():
+        x, y, z = props.center
+        bom_text = "" if bom is None else str(bom)
+        print(f"{bom_text:<6}{label:<28}{props.mass:10.1f}{props.estimated:9.1f}"
+              f"{x:10.2f}{y:10.2f}{z:10.2f}")
+    _, total = report[None]
+    print("\nInertia tensor about the CoG (g·mm²):")
+    for row in total.inertia:
+        print("  " + "".join(f"{v:16.1f}" for v in row))
+
+
+if __name__ == "__main__":
+    from quiver.assembly import selected_tree
+    from quiver.build import build_parallel, build_serial
+
+    parser = argparse.ArgumentParser(description="Quiver drone mass properties")
+    parser.add_argument(
+        "-j", "--jobs", type=int, default=1, help="Build subassemblies in N processes"
+    )
+    parser.add_argument(
+        "--only",
+        type=lambda s: [int(bom) for bom in s.split(",")],
+        metavar="BOM[,BOM...]",
+        help="Report only these BOM categories/subcategories (e.g. 1300,3100)",
+    )
+    parser.add_argument("--json", type=Path, help="Also write the report as JSON")
+    parser.add_argument(
+        "--no-cache", action="store_true", help="Bypass the on-disk geometry cache"
+    )
+    args = parser.parse_args()
+
+    if args.no_cache:
+        os.environ["QUIVER_NO_CACHE"] = "1"
+
+    # Mass needs every solid, whatever the viewer LOD filters out
+    tree = selected_tree(args.only)
+    with use_lod("full"):
+        if args.jobs > 1:
+            build_parallel(tree, args.jobs)
+        else:
+            build_serial(tree)
+    report = mass_report(tree)
+    _print_report(report)
+    if args.json:
+        data = {
+            "total" if bom is None else str(bom): {"label": label, **props.to_dict()}
+            for bom, (label, props) in report.items()
+        }
+        args.json.write_text(json.dumps(data, indent=2) + "\n")
+        print(f"\nWrote {args.json}")
@@ -0,0 +1,502 @@
+"""Cached tessellation and binary glTF (GLB) export.
+
+Viewers re-tessellate every face of every part on each launch. This module
+meshes each unique part (TShape, see quiver.export.PrototypeIndex) once,
+stores the triangle buffers in the on-disk cache, and writes the drone as
+a GLB file in which every instance of a part is a node that references
+the same mesh. Web viewers and ocp-vscode open the result without
+touching the B-rep. The same meshes feed the STL and 3MF writers, and
+mesh_assembly, which quiver.assembly --show hands to ocp-vscode.
+
+Meshes are keyed by a hash of the part's BREP and the tolerances, so they
+stay valid for generated geometry (tubes, foam) as well as STEP parts.
+All parts that miss the cache are meshed together by one
+BRepMesh_IncrementalMesh call in parallel mode, which spreads the faces
+of every part across OCCT's worker threads.
+"""
+
+import io
+import json
+import struct
+import zipfile
+from pathlib import Path
+from xml.sax.saxutils import escape
+
+import numpy as np
+from build123d import Color, Compound, Face, Shape
+from OCP.BRep import BRep_Builder, BRep_Tool
+from OCP.BRepMesh import BRepMesh_IncrementalMesh
+from OCP.gp import gp_Pnt, gp_Trsf
+from OCP.Poly import Poly_Triangle, Poly_Triangulation
+from OCP.TopAbs import TopAbs_Orientation, TopAbs_ShapeEnum
+from OCP.TopExp import TopExp_Explorer
+from OCP.TopLoc import TopLoc_Location
+from OCP.TopoDS import TopoDS, TopoDS_Compound, TopoDS_Face, TopoDS_Shape
+
+from quiver import cache, profiling
+from quiver.common import material_name, rgba
+from quiver.export import PrototypeIndex
+
+# Default meshing tolerances: chordal deviation (mm) and angle (radians)
+TOLERANCE = 0.1
+ANGULAR_TOLERANCE = 0.5
+
+# glTF is Y-up in meters; the CAD model is Z-up in millimeters
+_ROOT_MATRIX = [0.001, 0, 0, 0, 0, 0, -0.001, 0, 0, 0.001, 0, 0, 0, 0, 0, 1]
+
+_GLB_MAGIC = 0x46546C67  # "glTF"
+_CHUNK_JSON = 0x4E4F534A
+_CHUNK_BIN = 0x004E4942
+_ARRAY_BUFFER = 34962
+_ELEMENT_ARRAY_BUFFER = 34963
+_FLOAT = 5126
+_UNSIGNED_INT = 5125
+
+Mesh = tuple[np.ndarray, np.ndarray]  # (n, 3) float32 positions, (m, 3) uint32 triangles
+
+
+def _triangles(shape: TopoDS_Shape) -> Mesh:
+    """Collect the triangulation of every face of a meshed shape."""
+    positions, triangles = [], []
+    offset = 0
+    explorer = TopExp_Explorer(shape, TopAbs_ShapeEnum.TopAbs_FACE)
+    while explorer.More():
+        face = TopoDS.Face_s(explorer.Current())
+        location = TopLoc_Location()
+        poly = BRep_Tool.Triangulation_s(face, location)
+        if poly is not None:
+            trsf = location.Transformation()
+            nodes = np.array(
+                [poly.Node(i).Transformed(trsf).Coord() for i in range(1, poly.NbNodes() + 1)]
+            )
+            tris = np.array(
+                [
+                    [t.Value(1), t.Value(2), t.Value(3)]
+                    for t in (poly.Triangle(i) for i in range(1, poly.NbTriangles() + 1))
+                ]
+            ) - 1
+            if face.Orientation() == TopAbs_Orientation.TopAbs_REVERSED:
+                tris = tris[:, [0, 2, 1]]
+            positions.append(nodes)
+            triangles.append(tris + offset)
+            offset += len(nodes)
+        explorer.Next()
+    if not positions:
+        return np.zeros((0, 3), np.float32), np.zeros((0, 3), np.uint32)
+    return (
+        np.concatenate(positions).astype(np.float32),
+        np.concatenate(triangles).astype(np.uint32),
+    )
+
+
+def _mesh_to_bytes(mesh: Mesh) -> bytes:
+    buffer = io.BytesIO()
+    np.savez(buffer, positions=mesh[0], triangles=mesh[1])
+    return buffer.getvalue()
+
+
+def _mesh_from_bytes(data: bytes) -> Mesh:
+    arrays = np.load(io.BytesIO(data))
+    return arrays["positions"], arrays["triangles"]
+
+
+@profiling.traced
+def tessellate(
+    shapes: list[TopoDS_Shape],
+    tolerance: float = TOLERANCE,
+    angular_tolerance: float = ANGULAR_TOLERANCE,
+) -> list[Mesh]:
+    """Mesh unique parts, going through the on-disk cache.
+
+    Args:
+        shapes: Parts to mesh, each at its own (unplaced) location.
+        tolerance: Chordal deviation in mm.
+        angular_tolerance: Angular deviation in radians.
+
+    Returns:
+        One (positions, triangles) pair per shape, in the shape's frame.
+    """
+    keys = [
+        cache.make_shape_key(shape, tolerance=tolerance, angular_tolerance=angular_tolerance)
+        if cache.enabled()
+        else None
+        for shape in shapes
+    ]
+    meshes: list[Mesh | None] = []
+    for key in keys:
+        data = cache.get_bytes("meshes", key, suffix=".npz") if key else None
+        meshes.append(_mesh_from_bytes(data) if data else None)
+
+    misses = [i for i, mesh in enumerate(meshes) if mesh is None]
+    if misses:
+        batch = TopoDS_Compound()
+        builder = BRep_Builder()
+        builder.MakeCompound(batch)
+        for i in misses:
+            builder.Add(batch, shapes[i])
+        BRepMesh_IncrementalMesh(batch, tolerance, False, angular_tolerance, True)
+        for i in misses:
+            meshes[i] = _triangles(shapes[i])
+            if keys[i]:
+                cache.put_bytes("meshes", keys[i], _mesh_to_bytes(meshes[i]), suffix=".npz")
+    return meshes
+
+
+def _matrix(shape: TopoDS_Shape) -> list[float]:
+    """Return a shape's location as a column-major glTF matrix."""
+    trsf = shape.Location().Transformation()
+    columns = [[trsf.Value(row, col) for row in (1, 2, 3)] + [0.0] for col in (1, 2, 3)]
+    columns.append([trsf.Value(row, 4) for row in (1, 2, 3)] + [1.0])
+    return [value for column in columns for value in column]
+
+
+def _material_name(color: Color | None) -> str:
+    if color is None:
+        return "default"
+    return material_name(color) or "rgba(" + ",".join(f"{c:.3f}" for c in rgba(color)) + ")"
+
+
+class _GltfScene:
+    """Collects the glTF JSON and binary buffer for one assembly."""
+
+    def __init__(self):
+        self.index = PrototypeIndex()
+        self.leaves: list[tuple[dict, Shape, int]] = []
+        self.nodes: list[dict] = []
+        self.meshes: list[dict] = []
+        self.mesh_ids: dict[tuple[int, int], int] = {}
+        self.materials: list[dict] = []
+        self.material_ids: dict[str, int] = {}
+        self.accessors: list[dict] = []
+        self.buffer_views: list[dict] = []
+        self.blob = bytearray()
+
+    def add(self, shape: Shape) -> int:
+        """Add a node for `shape` and its children; return its node index."""
+        node = {"matrix": _matrix(shape.wrapped)}
+        if shape.label:
+            node["name"] = shape.label
+        self.nodes.append(node)
+        index = len(self.nodes) - 1
+        if shape.children:
+            node["children"] = [self.add(child) for child in shape.children]
+        else:
+            self.leaves.append((node, shape, self.index.add(shape.wrapped)))
+        return index
+
+    def _view(self, array: np.ndarray, target: int) -> int:
+        self.buffer_views.append({
+            "buffer": 0,
+            "byteOffset": len(self.blob),
+            "byteLength": array.nbytes,
+            "target": target,
+        })
+        self.blob += array.tobytes()
+        return len(self.buffer_views) - 1
+
+    def _material(self, color: Color | None) -> int:
+        name = _material_name(color)
+        if name not in self.material_ids:
+            factor = list(rgba(color)) if color is not None else [0.6, 0.6, 0.6, 1.0]
+            self.materials.append({
+                "name": name,
+                "pbrMetallicRoughness": {
+                    "baseColorFactor": factor,
+                    "metallicFactor": 0.0,
+                    "roughnessFactor": 0.6,
+                },
+            })
+            self.material_ids[name] = len(self.materials) - 1
+        return self.material_ids[name]
+
+    def attach_meshes(self, meshes: list[Mesh]) -> None:
+        """Write each prototype's buffers once and point every leaf at them."""
+        primitives = []
+        for positions, triangles in meshes:
+            if len(triangles) == 0:
+                primitives.append(None)
+                continue
+            self.accessors.append({
+                "bufferView": self._view(positions, _ARRAY_BUFFER),
+                "componentType": _FLOAT,
+                "count": len(positions),
+                "type": "VEC3",
+                "min": positions.min(axis=0).tolist(),
+                "max": positions.max(axis=0).tolist(),
+            })
+            self.accessors.append({
+                "bufferView": self._view(triangles.ravel(), _ELEMENT_ARRAY_BUFFER),
+                "componentType": _UNSIGNED_INT,
+                "count": triangles.size,
+                "type": "SCALAR",
+            })
+            primitives.append({
+                "attributes": {"POSITION": len(self.accessors) - 2},
+                "indices": len(self.accessors) - 1,
+            })
+        for node, leaf, proto in self.leaves:
+            if primitives[proto] is None:
+                continue
+            material = self._material(leaf.color)
+            mesh_key = (proto, material)
+            if mesh_key not in self.mesh_ids:
+                self.meshes.append({
+                    "name": leaf.label or f"part{proto}",
+                    "primitives": [{**primitives[proto], "material": material}],
+                })
+                self.mesh_ids[mesh_key] = len(self.meshes) - 1
+            node["mesh"] = self.mesh_ids[mesh_key]
+
+    def to_glb(self, root: int) -> bytes:
+        self.nodes.append({"name": "Z-up mm", "matrix": _ROOT_MATRIX, "children": [root]})
+        document = {
+            "asset": {"version": "2.0", "generator": "quiver.mesh"},
+            "scene": 0,
+            "scenes": [{"nodes": [len(self.nodes) - 1]}],
+            "nodes": self.nodes,
+            "meshes": self.meshes,
+            "materials": self.materials,
+            "accessors": self.accessors,
+            "bufferViews": self.buffer_views,
+            "buffers": [{"byteLength": len(self.blob)}],
+        }
+        text = json.dumps(document, separators=(",", ":")).encode()
+        text += b" " * (-len(text) % 4)
+        blob = bytes(self.blob) + b"\0" * (-len(self.blob) % 4)
+        length = 12 + 8 + len(text) + 8 + len(blob)
+        return b"".join([
+            struct.pack("<III", _GLB_MAGIC, 2, length),
+            struct.pack("<II", len(text), _CHUNK_JSON),
+            text,
+            struct.pack("<II", len(blob), _CHUNK_BIN),
+            blob,
+        ])
+
+
+def export_glb(
+    assembly: Compound,
+    path: Path,
+    tolerance: float = TOLERANCE,
+    angular_tolerance: float = ANGULAR_TOLERANCE,
+    meshes: list[Mesh] | None = None,
+) -> int:
+    """Export an assembly as binary glTF with one mesh per unique part.
+
+    Every Compound in the hierarchy becomes a node with its location as
+    the node transform; leaves reference their part's mesh with a
+    material from the part color.
+
+    Args:
+        assembly: Root of the labeled Compound hierarchy.
+        path: Output .glb file path.
+        tolerance: Chordal deviation in mm.
+        angular_tolerance: Angular deviation in radians.
+        meshes: Meshes already computed for the assembly's unique parts,
+            in placed_parts order; tessellated here when omitted.
+
+    Returns:
+        The number of unique parts meshed.
+    """
+    scene = _GltfScene()
+    root = scene.add(assembly)
+    if meshes is None:
+        meshes = tessellate(scene.index.prototypes, tolerance, angular_tolerance)
+    scene.attach_meshes(meshes)
+    path.write_bytes(scene.to_glb(root))
+    return len(scene.index.prototypes)
+
+
+def mesh_face(mesh: Mesh) -> TopoDS_Face:
+    """Wrap a mesh as a face with no surface, carrying it as its triangulation.
+
+    BRepMesh leaves such faces alone, so viewers (ocp-vscode included)
+    display the triangles as they are, the way they show imported STL.
+    """
+    positions, triangles = mesh
+    poly = Poly_Triangulation(len(positions), len(triangles), False)
+    for i, (x, y, z) in enumerate(positions.tolist(), 1):
+        poly.SetNode(i, gp_Pnt(x, y, z))
+    for i, (a, b, c) in enumerate((triangles + 1).tolist(), 1):
+        poly.SetTriangle(i, Poly_Triangle(a, b, c))
+    face = TopoDS_Face()
+    BRep_Builder().MakeFace(face, poly)
+    return face
+
+
+def mesh_assembly(
+    assembly: Compound,
+    tolerance: float = TOLERANCE,
+    angular_tolerance: float = ANGULAR_TOLERANCE,
+) -> Compound | None:
+    """Mirror an assembly with each leaf replaced by its part's cached mesh.
+
+    Every unique part is tessellated (or read from the cache) once and
+    wrapped with mesh_face; its instances share that face at their own
+    locations, with their own labels and colors. Showing the result skips
+    the viewer's own meshing of every B-rep face.
+
+    Returns:
+        The mirrored hierarchy, or None if no part has any triangles.
+    """
+    index, _ = placed_parts(assembly)
+    faces = [
+        mesh_face(mesh) if len(mesh[1]) else None
+        for mesh in tessellate(index.prototypes, tolerance, angular_tolerance)
+    ]
+
+    def mirror(node: Shape) -> Shape | None:
+        if node.children:
+            children = [child for child in map(mirror, node.children) if child is not None]
+            if not children:
+                return None
+            result = Compound(children=children, label=node.label)
+            result.location = node.location
+        else:
+            face = faces[index.find(node.wrapped)]
+            if face is None:
+                return None
+            result = Face(face.Located(node.wrapped.Location()))
+            result.label = node.label
+        result.color = node.color
+        return result
+
+    return mirror(assembly)
+
+
+def placed_parts(assembly: Compound) -> tuple[PrototypeIndex, list[tuple[Shape, int, gp_Trsf]]]:
+    """Index an assembly's unique parts and place every leaf in world space.
+
+    Leaves are visited in the same depth-first order as export_glb, so the
+    prototype indices (and meshes from tessellate) line up.
+
+    Returns:
+        The prototype index, and (leaf, prototype index, world transform)
+        for every leaf.
+    """
+    index = PrototypeIndex()
+    leaves = []
+    stack = [(assembly, gp_Trsf())]
+    while stack:
+        node, parent = stack.pop()
+        world = parent.Multiplied(node.wrapped.Location().Transformation())
+        if node.children:
+            stack.extend((child, world) for child in reversed(node.children))
+        else:
+            leaves.append((node, index.add(node.wrapped), world))
+    return index, leaves
+
+
+def _affine(trsf: gp_Trsf) -> tuple[np.ndarray, np.ndarray]:
+    """Return a transform as a 3x3 matrix and a translation vector."""
+    matrix = np.array([[trsf.Value(row, col) for col in (1, 2, 3)] for row in (1, 2, 3)])
+    offset = np.array([trsf.Value(row, 4) for row in (1, 2, 3)])
+    return matrix, offset
+
+
+def transformed(mesh: Mesh, trsf: gp_Trsf) -> Mesh:
+    """Return a mesh with its positions moved by `trsf`."""
+    matrix, offset = _affine(trsf)
+    positions, triangles = mesh
+    return (positions @ matrix.T + offset).astype(np.float32), triangles
+
+
+def merged(meshes: list[Mesh]) -> Mesh:
+    """Concatenate meshes into one, renumbering the triangles."""
+    if not meshes:
+        return np.zeros((0, 3), np.float32), np.zeros((0, 3), np.uint32)
+    offsets = np.cumsum([0] + [len(positions) for positions, _ in meshes[:-1]])
+    return (
+        np.concatenate([positions for positions, _ in meshes]),
+        np.concatenate([tris + offset for (_, tris), offset in zip(meshes, offsets)]).astype(
+            np.uint32
+        ),
+    )
+
+
+def write_stl(mesh: Mesh, path: Path) -> None:
+    """Write a mesh as binary STL (millimeters)."""
+    positions, triangles = mesh
+    corners = positions[triangles]
+    normals = np.cross(corners[:, 1] - corners[:, 0], corners[:, 2] - corners[:, 0])
+    lengths = np.linalg.norm(normals, axis=1, keepdims=True)
+    normals = np.divide(normals, lengths, out=np.zeros_like(normals), where=lengths > 0)
+    records = np.zeros(
+        len(triangles),
+        dtype=[("normal", "<f4", 3), ("corners", "<f4", (3, 3)), ("attributes", "<u2")],
+    )
+    records["normal"] = normals
+    records["corners"] = corners
+    with open(path, "wb") as f:
+        f.write(b"quiver.mesh binary STL".ljust(80, b" "))
+        f.write(struct.pack("<I", len(triangles)))
+        f.write(records.tobytes())
+
+
+_3MF_CONTENT_TYPES = """<?xml version="1.0" encoding="UTF-8"?>
+<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">
+<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>
+<Default Extension="model" ContentType="application/vnd.ms-package.3dmanufacturing-3dmodel+xml"/>
+</Types>
+"""
+
+_3MF_RELS = """<?xml version="1.0" encoding="UTF-8"?>
+<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">
+<Relationship Target="/3D/3dmodel.model" Id="rel0"
+ Type="http://schemas.microsoft.com/3dmanufacturing/2013/01/3dmodel"/>
+</Relationships>
+"""
+
+
+def _3mf_mesh(mesh: Mesh) -> str:
+    positions, triangles = mesh
+    vertices = "".join(f'<vertex x="{x:.4f}" y="{y:.4f}" z="{z:.4f}"/>' for x, y, z in positions)
+    faces = "".join(f'<triangle v1="{a}" v2="{b}" v3="{c}"/>' for a, b, c in triangles)
+    return f"<mesh><vertices>{vertices}</vertices><triangles>{faces}</triangles></mesh>"
+
+
+def _3mf_transform(trsf: gp_Trsf) -> str:
+    # 3MF multiplies row vectors, so the rotation is written transposed
+    matrix, offset = _affine(trsf)
+    return " ".join(f"{v:.6f}" for v in [*matrix.T.ravel(), *offset])
+
+
+def write_3mf(
+    objects: list[tuple[str, Mesh, Color | None]],
+    items: list[tuple[int, gp_Trsf]],
+    path: Path,
+) -> None:
+    """Write meshes as a 3MF package (millimeters).
+
+    Args:
+        objects: (name, mesh, color) for each unique object.
+        items: (object index, placement) for each build item; an object
+            placed several times is stored once.
+        path: Output .3mf file path.
+    """
+    colors = []
+    resources = []
+    for i, (name, mesh, color) in enumerate(objects):
+        components = rgba(color) if color is not None else (0.6, 0.6, 0.6, 1.0)
+        colors.append(
+            f'<base name="{escape(_material_name(color))}" displaycolor="#'
+            + "".join(f"{round(c * 255):02X}" for c in components)
+            + '"/>'
+        )
+        resources.append(
+            f'<object id="{i + 2}" name="{escape(name)}" type="model" pid="1" pindex="{i}">'
+            f"{_3mf_mesh(mesh)}</object>"
+        )
+    build = "".join(
+        f'<item objectid="{obj + 2}" transform="{_3mf_transform(trsf)}"/>' for obj, trsf in items
+    )
+    model = (
+        '<?xml version="1.0" encoding="UTF-8"?>'
+        '<model unit="millimeter" xml:lang="en-US" '
+        'xmlns="http://schemas.microsoft.com/3dmanufacturing/core/2015/02">'
+        f'<resources><basematerials id="1">{"".join(colors)}</basematerials>'
+        f"{''.join(resources)}</resources><build>{build}</build></model>"
+    )
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as package:
+        package.writestr("[Content_Types].xml", _3MF_CONTENT_TYPES)
+        package.writestr("_rels/.rels", _3MF_RELS)
+        package.writestr("3D/3dmodel.model", model)
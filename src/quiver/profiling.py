@@ -0,0 +1,104 @@
+"""Lightweight timing spans for profiling the assembly build.
+
+Profiling is off unless ``$QUIVER_PROFILE`` names an output file (the
+``--profile`` flag of quiver.assembly sets it). When on, span and traced
+record nested, timed spans (STEP loads, flattening, Compound
+construction, each subassembly's make_assembly labeled with its BOM
+number), and write_trace writes them as Chrome trace events. Open the
+file in chrome://tracing, https://ui.perfetto.dev or speedscope.
+
+Spans recorded in worker processes are returned to the parent with each
+leaf (take_events/add_events) and show up as separate process rows.
+When profiling is off, a span costs one environment lookup.
+"""
+
+import functools
+import json
+import os
+import threading
+import time
+from collections.abc import Callable
+from contextlib import contextmanager
+from pathlib import Path
+
+_events: list[dict] = []
+
+
+def enabled() -> bool:
+    """Return True when spans are being recorded."""
+    return bool(os.environ.get("QUIVER_PROFILE"))
+
+
+@contextmanager
+def span(name: str, **args):
+    """Record the wall time of a block as a trace event.
+
+    Args:
+        name: Span name shown in the trace viewer.
+        **args: Extra JSON-serializable details (e.g. bom=1300).
+    """
+    if not enabled():
+        yield
+        return
+    start = time.perf_counter_ns()
+    try:
+        yield
+    finally:
+        end = time.perf_counter_ns()
+        _events.append({
+            "name": name,
+            "ph": "X",
+            "ts": start / 1000,
+            "dur": (end - start) / 1000,
+            "pid": os.getpid(),
+            "tid": threading.get_ident(),
+            "args": args,
+        })
+
+
+def traced(func: Callable) -> Callable:
+    """Decorator that records every call of `func` as a span."""
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        with span(func.__name__):
+            return func(*args, **kwargs)
+
+    return wrapper
+
+
+def take_events() -> list[dict]:
+    """Return and forget the spans recorded so far (e.g. in a worker)."""
+    events = _events[:]
+    _events.clear()
+    return events
+
+
+def add_events(events: list[dict]) -> None:
+    """Merge spans recorded in another process."""
+    _events.extend(events)
+
+
+def write_trace(path: Path | None = None) -> Path:
+    """Write the recorded spans as a Chrome trace-event JSON file.
+
+    Args:
+        path: Output file; defaults to ``$QUIVER_PROFILE``.
+
+    Returns:
+        The path written.
+    """
+    path = Path(path or os.environ["QUIVER_PROFILE"])
+    main = os.getpid()
+    names = [
+        {
+            "name": "process_name",
+            "ph": "M",
+            "pid": pid,
+            "args": {"name": "quiver" if pid == main else f"worker {pid}"},
+        }
+        for pid in sorted({event["pid"] for event in _events})
+    ]
+    trace = {"traceEvents": names + _events, "displayTimeUnit": "ms"}
+    path.write_text(json.dumps(trace))
+    return path
@@ -19,16 +19,21 @@ from quiver.supporting_structure.cockpit_enclosure.assembly import (
     make_assembly as cockpit_enclosure,
 )
 
+LABEL = "Supporting Structure"
+
+# Subcategory builders, keyed by BOM number
+SUBASSEMBLIES = {
+    2100: attachment_interface,
+    2200: battery_slider,
+    2300: equipment_mount,
+    2400: cockpit_enclosure,
+}
+
 
 def make_assembly() -> Compound | None:
     """Build the complete supporting structure from all subcategories."""
-    subassemblies = [
-        attachment_interface(),
-        battery_slider(),
-        equipment_mount(),
-        cockpit_enclosure(),
-    ]
+    subassemblies = [build() for build in SUBASSEMBLIES.values()]
     children = [s for s in subassemblies if s is not None]
     if not children:
         return None
-    return Compound(children=children, label="Supporting Structure")
+    return Compound(children=children, label=LABEL)
@@ -22,50 +22,19 @@ mirrored via rotY(180) to face the opposite wall.
 
 STEP files in steps/:
     2211_battery_slider.step    Battery slider (used 2x)
+
+Part placements are listed in parts.toml (see quiver.manifest).
 """
 
 from pathlib import Path
 
-from build123d import Axis, Compound, Location
+from build123d import Compound
 
-from quiver.common import PETG, load_step
+from quiver.manifest import build_from_manifest
 
 _DIR = Path(__file__).parent
 
-# Target center-of-mass positions (from Fusion reference).
-_RIGHT_POS = (115.50, 16.78, -71.00)
-_LEFT_POS = (-115.50, 16.78, -71.00)
-
 
 def make_assembly() -> Compound | None:
-    """Build the battery slider subassembly from imported STEP files."""
-    children = []
-
-    # Left slider — the STEP file is already in the correct orientation.
-    left = load_step(_DIR, "2211_battery_slider")
-    if left:
-        left.color = PETG
-        com = left.center()
-        left.move(Location((
-            _LEFT_POS[0] - com.X,
-            _LEFT_POS[1] - com.Y,
-            _LEFT_POS[2] - com.Z,
-        )))
-        children.append(left)
-
-    # Right slider — mirror across YZ plane to face the opposite wall.
-    right = load_step(_DIR, "2211_battery_slider")
-    if right:
-        right.color = PETG
-        right = right.rotate(Axis.Y, 180)
-        com = right.center()
-        right.move(Location((
-            _RIGHT_POS[0] - com.X,
-            _RIGHT_POS[1] - com.Y,
-            _RIGHT_POS[2] - com.Z,
-        )))
-        children.append(right)
-
-    if not children:
-        return None
-    return Compound(children=children, label="Battery Slider")
+    """Build the battery slider subassembly from its placement manifest."""
+    return build_from_manifest(_DIR)
@@ -0,0 +1,249 @@
+"""Parameter sweeps over the generated airframe tubes.
+
+A sweep overrides module constants of the subassemblies that generate
+their geometry (the landing gear legs and the motor arms) and reports,
+for every combination of values, the drone's mass and center of gravity
+and the interference between the changed parts and the rest:
+
+    tube_length    motor arm tube length        motor_arm._TUBE_LENGTH
+    tilt_angle     landing gear leg tilt (deg)  landing_gear._TILT_ANGLE
+    tube_od        CF tube outer diameter       _TUBE_OD of both
+
+A tilted landing gear leg pivots about its adapter: the vertical tube,
+tube joint, horizontal tube and foam sleeves swing with it.
+
+The drone is built once at the "full" LOD. Leaves that no swept parameter
+touches keep that geometry and their mass properties for every variant;
+only the swept leaves are rebuilt, and their STEP parts (adapters,
+joints, arm connectors) stay memoized in each worker across variants, so
+no STEP file is parsed again. Tubes of the same (OD, wall, length) are
+generated once per worker by quiver.common.make_tube.
+
+Variants run in a process pool. The fixed leaves are shipped once per
+worker through the pool initializer, like the unique parts of
+quiver.interference.
+
+Usage:
+    python -m quiver.sweep --tube-length 300,360,420 --tilt-angle 18,21.18,24
+    python -m quiver.sweep --tube-od 25,30 -j 8 --json sweep.json
+"""
+
+import argparse
+import json
+import os
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from itertools import product
+from pathlib import Path
+from types import ModuleType
+
+from quiver.airframe_structure.landing_gear import assembly as landing_gear
+from quiver.airframe_structure.motor_arm import assembly as motor_arm
+from quiver.assembly import selected_tree
+from quiver.build import LazyAssembly, build_parallel, build_serial, pack, unpack
+from quiver.common import clear_part_cache, use_lod
+from quiver.interference import check, summarize
+from quiver.mass import MassProperties, assembly_mass, combine
+
+# Sweepable parameters: name -> the (module, constant) pairs it overrides
+PARAMETERS: dict[str, list[tuple[ModuleType, str]]] = {
+    "tube_length": [(motor_arm, "_TUBE_LENGTH")],
+    "tilt_angle": [(landing_gear, "_TILT_ANGLE")],
+    "tube_od": [(landing_gear, "_TUBE_OD"), (motor_arm, "_TUBE_OD")],
+}
+
+
+def variants(grid: dict[str, list[float]]) -> list[dict[str, float]]:
+    """Return every combination of the values in `grid`.
+
+    Raises:
+        ValueError: If a name is not one of PARAMETERS.
+    """
+    unknown = set(grid) - set(PARAMETERS)
+    if unknown:
+        raise ValueError(
+            f"Unknown parameters {sorted(unknown)}; choose from {sorted(PARAMETERS)}"
+        )
+    names = list(grid)
+    return [dict(zip(names, values)) for values in product(*grid.values())]
+
+
+@contextmanager
+def override(variant: dict[str, float]) -> Iterator[None]:
+    """Temporarily set the module constants behind a variant's parameters."""
+    saved = []
+    try:
+        for name, value in variant.items():
+            for module, constant in PARAMETERS[name]:
+                saved.append((module, constant, getattr(module, constant)))
+                setattr(module, constant, value)
+        yield
+    finally:
+        for module, constant, value in reversed(saved):
+            setattr(module, constant, value)
+
+
+def _swept_leaves(tree: LazyAssembly, names: Iterable[str]) -> list[LazyAssembly]:
+    """Return the leaves built by a module that one of `names` overrides."""
+    modules = {module.__name__ for name in names for module, _ in PARAMETERS[name]}
+    return [leaf for leaf in tree.leaves() if leaf.builder.__module__ in modules]
+
+
+# Per-process sweep state, set by _start
+_tree: LazyAssembly | None = None
+_fixed_mass: list[MassProperties] = []
+_clearance = 1.0
+
+
+def _start(tree: LazyAssembly, fixed_mass: list[MassProperties], clearance: float) -> None:
+    global _tree, _fixed_mass, _clearance
+    _tree, _fixed_mass, _clearance = tree, fixed_mass, clearance
+
+
+def _init_worker(
+    only: list[int] | None,
+    fixed: dict[int, tuple[bytes, dict] | None],
+    fixed_mass: list[MassProperties],
+    clearance: float,
+) -> None:
+    """Receive the fixed leaves once per worker process."""
+    tree = selected_tree(only)
+    for leaf in tree.leaves():
+        if leaf.bom in fixed:
+            packed = fixed[leaf.bom]
+            leaf.set_compound(unpack(*packed) if packed is not None else None)
+    _start(tree, fixed_mass, clearance)
+
+
+def _evaluate(variant: dict[str, float]) -> dict:
+    """Rebuild the swept leaves for one variant and measure the drone."""
+    swept = _swept_leaves(_tree, variant)
+    with override(variant):
+        for leaf in swept:
+            leaf.release()
+        built = [leaf.compound for leaf in swept]
+    props = combine(_fixed_mass + [assembly_mass(c) for c in built if c is not None])
+    parts, contacts = check(_tree, _clearance, boms={leaf.bom for leaf in swept})
+    summary = summarize(parts, contacts)
+    gaps = [e["min_clearance"] for e in summary.values() if e["min_clearance"] is not None]
+    return {
+        **variant,
+        "mass_g": props.mass,
+        "center_mm": props.center.tolist(),
+        "collisions": sum(len(e["collisions"]) for e in summary.values()),
+        "failed_checks": sum(len(e["failed"]) for e in summary.values()),
+        "min_clearance_mm": min(gaps, default=None),
+    }
+
+
+def sweep(
+    grid: dict[str, list[float]],
+    only: list[int] | None = None,
+    clearance: float = 1.0,
+    jobs: int = 1,
+) -> list[dict]:
+    """Evaluate every variant of a parameter grid.
+
+    Args:
+        grid: Values to try per parameter name (see PARAMETERS).
+        only: BOM numbers to build (e.g. [1000] for the airframe only).
+        clearance: Report the minimum clearance of parts closer than this (mm).
+        jobs: Number of worker processes for the build and the variants.
+
+    Returns:
+        One row per variant: the parameter values, mass_g, center_mm,
+        collisions, failed_checks (pairs whose exact check failed) and
+        min_clearance_mm (None when nothing is that close).
+
+    Raises:
+        ValueError: If a parameter is unknown, `only` names an unknown BOM,
+            or the selection has none of the swept subassemblies.
+    """
+    todo = variants(grid)
+    tree = selected_tree(only)
+    with use_lod("full"):
+        if jobs > 1:
+            build_parallel(tree, jobs)
+        else:
+            build_serial(tree)
+        swept = _swept_leaves(tree, grid)
+        if not swept:
+            raise ValueError("The selection has none of the swept subassemblies")
+        fixed = [leaf for leaf in tree.leaves() if leaf not in swept]
+        fixed_mass = [assembly_mass(leaf.compound) for leaf in fixed if leaf.compound is not None]
+        try:
+            if jobs > 1 and len(todo) > 1:
+                packed = {
+                    leaf.bom: pack(leaf.compound) if leaf.compound is not None else None
+                    for leaf in fixed
+                }
+                with ProcessPoolExecutor(
+                    min(jobs, len(todo)),
+                    initializer=_init_worker,
+                    initargs=(only, packed, fixed_mass, clearance),
+                ) as pool:
+                    return list(pool.map(_evaluate, todo))
+            _start(tree, fixed_mass, clearance)
+            return [_evaluate(variant) for variant in todo]
+        finally:
+            clear_part_cache()
+
+
+def _print_rows(rows: list[dict], names: list[str]) -> None:
+    print("".join(f"{name:>13}" for name in names)
+          + f"{'mass g':>10}{'CoG x':>10}{'CoG y':>10}{'CoG z':>10}"
+          f"{'collisions':>12}{'failed':>8}{'clearance':>11}")
+    for row in rows:
+        x, y, z = row["center_mm"]
+        gap = row["min_clearance_mm"]
+        gap_text = "-" if gap is None else f"{gap:.3f}"
+        print("".join(f"{row[name]:13.2f}" for name in names)
+              + f"{row['mass_g']:10.1f}{x:10.2f}{y:10.2f}{z:10.2f}"
+              f"{row['collisions']:12d}{row['failed_checks']:8d}{gap_text:>11}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Sweep Quiver airframe tube parameters")
+    for name in PARAMETERS:
+        parser.add_argument(
+            f"--{name.replace('_', '-')}",
+            dest=name,
+            type=lambda s: [float(value) for value in s.split(",")],
+            metavar="V[,V...]",
+            help=f"Values of {name} to try",
+        )
+    parser.add_argument(
+        "--clearance",
+        type=float,
+        default=1.0,
+        help="Report the clearance of parts closer than this many mm (default 1.0)",
+    )
+    parser.add_argument(
+        "-j", "--jobs", type=int, default=1, help="Build and evaluate in N processes"
+    )
+    parser.add_argument(
+        "--only",
+        type=lambda s: [int(bom) for bom in s.split(",")],
+        metavar="BOM[,BOM...]",
+        help="Build only these BOM categories/subcategories (e.g. 1000)",
+    )
+    parser.add_argument("--json", type=Path, help="Also write the results as JSON")
+    parser.add_argument(
+        "--no-cache", action="store_true", help="Bypass the on-disk geometry cache"
+    )
+    args = parser.parse_args()
+
+    if args.no_cache:
+        os.environ["QUIVER_NO_CACHE"] = "1"
+
+    grid = {name: getattr(args, name) for name in PARAMETERS if getattr(args, name)}
+    if not grid:
+        parser.error("give at least one of " + ", ".join(
+            f"--{name.replace('_', '-')}" for name in PARAMETERS
+        ))
+    rows = sweep(grid, args.only, args.clearance, args.jobs)
+    _print_rows(rows, list(grid))
+    if args.json:
+        args.json.write_text(json.dumps(rows, indent=2) + "\n")
+        print(f"\nWrote {args.json}")
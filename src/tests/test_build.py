@@ -0,0 +1,86 @@
+"""Tests for leaf fingerprints and incremental rebuilds in quiver.build."""
+
+import sys
+import types
+
+import pytest
+
+pytest.importorskip("OCP")
+pytest.importorskip("build123d")
+
+from quiver.build import LazyAssembly, build_serial, fingerprint
+
+_MODULE = "quiver_test_leaf.assembly"
+
+
+@pytest.fixture(autouse=True)
+def cache_root(tmp_path, monkeypatch):
+    """Point the cache at an empty temporary directory."""
+    root = tmp_path / "cache"
+    monkeypatch.setenv("QUIVER_CACHE_DIR", str(root))
+    monkeypatch.delenv("QUIVER_NO_CACHE", raising=False)
+    return root
+
+
+@pytest.fixture
+def leaf_dir(tmp_path, monkeypatch):
+    """A fake leaf subassembly directory with its module registered."""
+    directory = tmp_path / "leaf"
+    (directory / "steps").mkdir(parents=True)
+    (directory / "assembly.py").write_text("# leaf\n")
+    (directory / "parts.toml").write_text('label = "Leaf"\n')
+    (directory / "steps" / "1000_part.step").write_bytes(b"ISO-10303-21; original")
+    module = types.ModuleType(_MODULE)
+    module.__file__ = str(directory / "assembly.py")
+    monkeypatch.setitem(sys.modules, _MODULE, module)
+    return directory
+
+
+@pytest.fixture
+def builder():
+    """An empty leaf builder that counts its calls."""
+    def build():
+        build.calls += 1
+        return None
+
+    build.calls = 0
+    build.__module__ = _MODULE
+    return build
+
+
+def _tree(build) -> LazyAssembly:
+    return LazyAssembly(None, "Drone", children=[LazyAssembly(1000, "leaf", builder=build)])
+
+
+def test_fingerprint_is_stable(leaf_dir, builder):
+    assert fingerprint(builder) == fingerprint(builder)
+
+
+@pytest.mark.parametrize("name", ["steps/1000_part.step", "parts.toml", "assembly.py"])
+def test_fingerprint_follows_inputs(leaf_dir, builder, name):
+    before = fingerprint(builder)
+    (leaf_dir / name).write_bytes(b"edited, and a different size")
+    assert fingerprint(builder) != before
+
+
+def test_fingerprint_ignores_other_files(leaf_dir, builder):
+    before = fingerprint(builder)
+    (leaf_dir / "notes.md").write_text("not an input\n")
+    assert fingerprint(builder) == before
+
+
+def test_rebuild_only_when_inputs_change(leaf_dir, builder):
+    build_serial(_tree(builder))
+    assert builder.calls == 1
+    build_serial(_tree(builder))
+    assert builder.calls == 1  # restored from the leaf cache
+    (leaf_dir / "steps" / "1000_part.step").write_bytes(b"ISO-10303-21; edited geometry")
+    build_serial(_tree(builder))
+    assert builder.calls == 2
+
+
+def test_no_cache_always_rebuilds(leaf_dir, builder, monkeypatch):
+    monkeypatch.setenv("QUIVER_NO_CACHE", "1")
+    build_serial(_tree(builder))
+    build_serial(_tree(builder))
+    assert builder.calls == 2
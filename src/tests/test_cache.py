@@ -0,0 +1,106 @@
+"""Tests for quiver.cache: keys, round-trips and invalidation."""
+
+import os
+
+import pytest
+
+from quiver import cache
+
+
+@pytest.fixture(autouse=True)
+def cache_root(tmp_path, monkeypatch):
+    """Point the cache at an empty temporary directory."""
+    root = tmp_path / "cache"
+    monkeypatch.setenv("QUIVER_CACHE_DIR", str(root))
+    monkeypatch.delenv("QUIVER_NO_CACHE", raising=False)
+    monkeypatch.delenv("QUIVER_CACHE_MAX_MB", raising=False)
+    return root
+
+
+@pytest.fixture
+def step_file(tmp_path):
+    path = tmp_path / "part.step"
+    path.write_bytes(b"ISO-10303-21; original")
+    return path
+
+
+def test_bytes_round_trip(step_file):
+    key = cache.make_key(step_file, extract_solids=True)
+    assert cache.get_bytes("steps", key) is None
+    cache.put_bytes("steps", key, b"payload")
+    assert cache.get_bytes("steps", key) == b"payload"
+
+
+def test_json_round_trip(step_file):
+    key = cache.make_key(step_file)
+    cache.put_json("centers", key, {"center": [1.0, 2.0, 3.0]})
+    assert cache.get_json("centers", key) == {"center": [1.0, 2.0, 3.0]}
+
+
+def test_shape_round_trip(step_file):
+    pytest.importorskip("OCP")
+    build123d = pytest.importorskip("build123d")
+    box = build123d.Box(10, 20, 30)
+    key = cache.make_key(step_file)
+    cache.put_shape("steps", key, box.wrapped, {"label": "box"})
+    shape, meta = cache.get_shape("steps", key)
+    assert meta == {"label": "box"}
+    assert build123d.Solid(shape).volume == pytest.approx(box.volume)
+
+
+def test_key_depends_on_options(step_file):
+    assert cache.make_key(step_file, min_volume=0.0) != cache.make_key(step_file, min_volume=1.0)
+
+
+def test_key_changes_with_file_contents(step_file):
+    before = cache.make_key(step_file)
+    cache.put_bytes("steps", before, b"old geometry")
+    step_file.write_bytes(b"ISO-10303-21; edited, and a different size")
+    after = cache.make_key(step_file)
+    assert after != before
+    assert cache.get_bytes("steps", after) is None
+
+
+def test_key_changes_with_cache_version(step_file, monkeypatch):
+    before = cache.make_key(step_file)
+    cache.put_bytes("steps", before, b"old geometry")
+    monkeypatch.setattr(cache, "CACHE_VERSION", cache.CACHE_VERSION + 1)
+    after = cache.make_key(step_file)
+    assert after != before
+    assert cache.get_bytes("steps", after) is None
+
+
+def test_disabled_cache_misses(step_file, monkeypatch):
+    key = cache.make_key(step_file)
+    cache.put_bytes("steps", key, b"payload")
+    monkeypatch.setenv("QUIVER_NO_CACHE", "1")
+    assert cache.get_bytes("steps", key) is None
+
+
+def test_evict_drops_least_recently_used(step_file, cache_root):
+    cache.put_bytes("steps", "a" * 64, b"x" * 100)
+    cache.put_bytes("steps", "b" * 64, b"y" * 100)
+    old = cache_root / "steps" / "aa" / ("a" * 64 + ".bin")
+    stat = old.stat()
+    os.utime(old, ns=(stat.st_atime_ns, stat.st_mtime_ns - 10**9))
+    cache.evict(limit=150)
+    assert cache.get_bytes("steps", "a" * 64) is None
+    assert cache.get_bytes("steps", "b" * 64) == b"y" * 100
+
+
+def test_put_evicts_when_over_budget(cache_root, monkeypatch):
+    monkeypatch.setenv("QUIVER_CACHE_MAX_MB", "1")
+    half = b"x" * (600 * 1024)
+    cache.put_bytes("steps", "a" * 64, half)
+    cache.put_bytes("steps", "b" * 64, half)
+    assert sum(p.stat().st_size for p in cache_root.rglob("*.bin")) <= 1024 * 1024
+    assert cache.get_bytes("steps", "b" * 64) == half
+
+
+def test_put_does_not_walk_the_cache_every_time(step_file, monkeypatch):
+    cache.put_bytes("steps", "a" * 64, b"first")  # scans once
+    scans = []
+    monkeypatch.setattr(cache, "evict", lambda limit=None: scans.append(limit))
+    for k in range(10):
+        cache.put_bytes("steps", f"{k:064d}", b"small")
+    assert scans == []
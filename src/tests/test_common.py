@@ -0,0 +1,68 @@
+"""Tests for solid extraction and filtering in quiver.common."""
+
+import pytest
+
+pytest.importorskip("numpy")
+build123d = pytest.importorskip("build123d")
+
+from build123d import Box, Compound, Cylinder, Location, Pos
+
+from quiver.common import _flatten_solids
+
+
+def _reference(compound: Compound, min_volume: float, volume_mode: str, max_solids):
+    """The per-solid loop _flatten_solids replaced: wrap, measure, filter, sort."""
+    solids = list(compound.solids())
+    if volume_mode == "true":
+        volumes = [solid.volume for solid in solids]
+    else:
+        volumes = [solid.bounding_box().size.X * solid.bounding_box().size.Y
+                   * solid.bounding_box().size.Z for solid in solids]
+    keep = [i for i, volume in enumerate(volumes) if volume >= min_volume]
+    if max_solids is not None and len(keep) > max_solids:
+        largest = sorted(keep, key=lambda i: -volumes[i])[:max_solids]
+        keep = sorted(largest)
+    return [solids[i] for i in keep]
+
+
+def _centers(shapes) -> list[tuple[float, float, float]]:
+    return [tuple(round(c, 6) for c in shape.center()) for shape in shapes]
+
+
+@pytest.fixture(scope="module")
+def assembly() -> Compound:
+    """Boxes and cylinders of many sizes, some nested under placed compounds."""
+    parts = []
+    for i in range(12):
+        size = 1 + 3 * (i % 5)
+        part = Box(size, size, size) if i % 3 else Cylinder(size / 2, size)
+        parts.append(Pos(40 * i, 0, 0) * part)
+    nested = Compound(children=parts[6:])
+    nested.move(Location((0, 100, 0)))
+    return Compound(children=parts[:6] + [nested], label="Test")
+
+
+@pytest.mark.parametrize("volume_mode", ["bbox", "true"])
+@pytest.mark.parametrize(
+    "min_volume, max_solids",
+    [(0.0, None), (30.0, None), (0.0, 5), (30.0, 3), (1e9, None), (0.0, 100)],
+)
+def test_matches_per_solid_loop(assembly, volume_mode, min_volume, max_solids):
+    flat = _flatten_solids(assembly, min_volume, volume_mode, max_solids)
+    expected = _reference(assembly, min_volume, volume_mode, max_solids)
+    kept = list(flat.solids()) if expected else []
+    assert _centers(kept) == _centers(expected)
+    assert [s.volume for s in kept] == pytest.approx([s.volume for s in expected])
+    assert flat.label == "Test"
+
+
+def test_max_solids_keeps_original_order(assembly):
+    flat = _flatten_solids(assembly, max_solids=4)
+    xs = [solid.center().X for solid in flat.solids()]
+    assert len(xs) == 4
+    assert xs == sorted(xs)
+
+
+def test_nothing_left_keeps_the_shape(assembly):
+    flat = _flatten_solids(assembly, min_volume=1e9)
+    assert flat.volume == pytest.approx(assembly.volume)
@@ -0,0 +1,218 @@
+"""Tests for columnar .BIN decoding in quiver.flightlog."""
+
+import struct
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from quiver import flightlog
+from quiver.dataflash import iter_records
+from quiver.flightlog import FMT_TYPE, HEAD, decode, load_npz, read_log, write_npz
+
+# DataFlash format characters as struct codes, for the reference decoder
+_STRUCT_CODES = {
+    "a": "32h", "b": "b", "B": "B", "h": "h", "H": "H", "i": "i", "I": "I",
+    "f": "f", "d": "d", "n": "4s", "N": "16s", "Z": "64s", "c": "h", "C": "H",
+    "e": "i", "E": "I", "L": "i", "M": "B", "q": "q", "Q": "Q",
+}
+
+# Synthetic message types: (type id, name, format, columns)
+MESSAGES = [
+    (130, "GPS", "QBLLefC", ("TimeUS", "Status", "Lat", "Lng", "Alt", "Spd", "HDop")),
+    (131, "ATT", "QccCd", ("TimeUS", "Roll", "Pitch", "Yaw", "Err")),
+    (132, "MSG", "QnNZ", ("TimeUS", "Id", "Name", "Message")),
+    (133, "ISBD", "QHa", ("TimeUS", "N", "Data")),
+    (134, "MODE", "QMBqbhiI", ("TimeUS", "Mode", "Rsn", "Q", "B", "H", "I", "U")),
+]
+UNKNOWN_CHAR = (135, "XKQ", "Qw", ("TimeUS", "W"))  # 'w' is not a format character
+DUPLICATE = (136, "DUP", "QII", ("TimeUS", "A", "A"))
+
+
+def _struct(format_):
+    return struct.Struct("<" + "".join(_STRUCT_CODES[char] for char in format_))
+
+
+def fmt_record(message, length=None):
+    type_, name, format_, columns = message
+    if length is None:
+        length = 3 + _struct(format_).size
+    return HEAD + bytes([FMT_TYPE]) + struct.pack(
+        "<BB4s16s64s", type_, length, name.encode(), format_.encode(), ",".join(columns).encode()
+    )
+
+
+def record(message, values):
+    type_, _, format_, _ = message
+    return HEAD + bytes([type_]) + _struct(format_).pack(*values)
+
+
+def _random_values(rng, format_) -> list:
+    values = []
+    for char in format_:
+        code = _STRUCT_CODES[char]
+        if code.endswith("s"):
+            size = int(code[:-1])
+            values.append(bytes(rng.integers(65, 91, rng.integers(0, size + 1)).tolist()))
+        elif code == "32h":
+            values.extend(rng.integers(-2**15, 2**15, 32).tolist())
+        elif code in "fd":
+            values.append(float(rng.normal(0, 100)))
+        else:
+            info = np.iinfo(np.dtype(code))  # same letters as struct
+            values.append(int(rng.integers(info.min, info.max, dtype=code, endpoint=True)))
+    return values
+
+
+@pytest.fixture(scope="module")
+def log() -> bytes:
+    """A log with every format character, junk, undecodable types and a cut tail."""
+    rng = np.random.default_rng(7)
+    chunks = [b"\x00\x01junk", fmt_record(UNKNOWN_CHAR, 13), fmt_record(DUPLICATE)]
+    chunks += [fmt_record(message) for message in MESSAGES]
+    for k in range(400):
+        message = MESSAGES[rng.integers(len(MESSAGES))]
+        chunks.append(record(message, _random_values(rng, message[2])))
+        if k % 97 == 0:
+            chunks.append(HEAD + b"\xfe")  # a header of an undeclared type
+        if k % 131 == 0:
+            chunks.append(HEAD + bytes([UNKNOWN_CHAR[0]]) + bytes(10))
+            chunks.append(record(DUPLICATE, [k, 1, 2]))
+    chunks.append(record(MESSAGES[0], _random_values(rng, MESSAGES[0][2]))[:-5])
+    return b"".join(chunks)
+
+
+def _reference(data: bytes) -> dict[str, list[tuple]]:
+    """Decode a log record by record with struct."""
+    formats = {FMT_TYPE: ("FMT", "BBnNZ", 89)}
+    rows: dict[str, list[tuple]] = {}
+    pos = 0
+    while pos + 3 <= len(data):
+        known = formats.get(data[pos + 2]) if data[pos:pos + 2] == HEAD else None
+        if known is None or pos + known[2] > len(data):
+            pos = data.find(HEAD, pos + 1)
+            if pos < 0:
+                break
+            continue
+        name, format_, length = known
+        if data[pos + 2] == FMT_TYPE:
+            type_, declared, raw_name, raw_format, _ = struct.unpack_from(
+                "<BB4s16s64s", data, pos + 3
+            )
+            formats[type_] = (
+                raw_name.rstrip(b"\0").decode(), raw_format.rstrip(b"\0").decode(), declared
+            )
+        elif set(format_) <= set(_STRUCT_CODES):
+            rows.setdefault(name, []).append(_struct(format_).unpack_from(data, pos + 3))
+        pos += length
+    return rows
+
+
+def _columns(format_: str, rows: list[tuple]) -> list[list]:
+    """Regroup struct rows into one list per column (format a spans 32 values)."""
+    columns = []
+    offset = 0
+    for char in format_:
+        if char == "a":
+            columns.append([list(row[offset:offset + 32]) for row in rows])
+            offset += 32
+            continue
+        values = [row[offset] for row in rows]
+        if char in "nNZ":  # NumPy drops the NUL padding
+            values = [value.rstrip(b"\0") for value in values]
+        columns.append(values)
+        offset += 1
+    return columns
+
+
+def test_decode_matches_struct_reference(log):
+    decoded = decode(log)
+    expected = _reference(log)
+    expected.pop("DUP")  # duplicate column names can't be a structured array
+    assert sorted(decoded.messages) == sorted(expected)
+    for _, name, format_, columns in MESSAGES:
+        data = decoded.messages[name]
+        assert data.dtype.names == columns
+        for column, values in zip(columns, _columns(format_, expected[name])):
+            assert data[column].tolist() == values, (name, column)
+
+
+def _scrambled(seed: int) -> bytes:
+    """Records with stray headers in their payloads and in junk between them.
+
+    Some records come before their type's FMT, which must skip them, and
+    GPS is declared twice.
+    """
+    rng = np.random.default_rng(seed)
+    chunks = [record(MESSAGES[1], _random_values(rng, MESSAGES[1][2]))]
+    declared = []
+    for k in range(300):
+        if k % 60 == 0 and len(declared) < len(MESSAGES):
+            declared.append(MESSAGES[len(declared)])
+            chunks.append(fmt_record(declared[-1]))
+        if k == 200:
+            chunks.append(fmt_record(MESSAGES[0]))
+        message = MESSAGES[rng.integers(len(MESSAGES))]
+        body = bytearray(record(message, _random_values(rng, message[2])))
+        if rng.random() < 0.3:  # a header inside the payload
+            at = rng.integers(3, len(body) - 2)
+            body[at:at + 3] = HEAD + bytes([MESSAGES[rng.integers(len(MESSAGES))][0]])
+        chunks.append(bytes(body))
+        if rng.random() < 0.1:
+            chunks.append(HEAD + bytes(rng.integers(0, 256, rng.integers(0, 8)).tolist()))
+    return b"".join(chunks)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_index_matches_iter_records(log, seed):
+    for data in (log, _scrambled(seed)):
+        offsets, _ = flightlog._index(data)
+        assert offsets.tolist() == [pos for pos, _ in iter_records(data)]
+
+
+def test_index_falls_back_to_iter_records(monkeypatch):
+    data = _scrambled(0)
+    expected = decode(data)
+    monkeypatch.setattr(flightlog, "_MAX_WALKS", 1)
+    offsets, _ = flightlog._index(data)
+    assert offsets.tolist() == [pos for pos, _ in iter_records(data)]
+    fallback = decode(data)
+    for name, values in expected.messages.items():
+        assert fallback.messages[name].tobytes() == values.tobytes()
+
+
+def test_formats_and_scaling(log):
+    decoded = decode(log)
+    assert decoded.formats == {name: format_ for _, name, format_, _ in MESSAGES}
+    gps = decoded.messages["GPS"]
+    assert gps.dtype["Lat"] == np.dtype("<i4")
+    assert decoded.scaled("GPS", "Lat") == pytest.approx(gps["Lat"] * 1e-7)
+    assert decoded.scaled("ATT", "Roll") == pytest.approx(decoded.messages["ATT"]["Roll"] / 100)
+    assert decoded.scaled("GPS", "Spd") == pytest.approx(gps["Spd"].astype(float))
+
+
+def test_empty_and_junk_only():
+    assert decode(b"").messages == {}
+    assert decode(b"\xa3\x95\x05junk\xa3").messages == {}
+
+
+def test_npz_round_trip(log, tmp_path):
+    decoded = decode(log)
+    write_npz(decoded, tmp_path / "log.npz")
+    loaded = load_npz(tmp_path / "log.npz")
+    assert loaded.formats == decoded.formats
+    for name, data in decoded.messages.items():
+        assert loaded.messages[name].tobytes() == data.tobytes()
+
+
+def test_read_log_caches_by_contents(log, tmp_path, monkeypatch):
+    monkeypatch.setenv("QUIVER_CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.delenv("QUIVER_NO_CACHE", raising=False)
+    path = tmp_path / "00000001.BIN"
+    path.write_bytes(log)
+    first = read_log(path)
+    assert list((tmp_path / "cache" / "flightlogs").rglob("*.npz"))
+    monkeypatch.setattr(flightlog, "decode", lambda data: pytest.fail("decoded again"))
+    again = read_log(path)
+    assert again.formats == first.formats
+    assert again.messages["GPS"].tobytes() == first.messages["GPS"].tobytes()
@@ -0,0 +1,67 @@
+"""Tests for candidate pair pruning and the report in quiver.interference."""
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("OCP")
+pytest.importorskip("build123d")
+
+from quiver.interference import Contact, PlacedPart, candidate_pairs, summarize
+
+
+def _random_boxes(rng, n: int, extent: float, size: float) -> np.ndarray:
+    lo = rng.uniform(0, extent, (n, 3))
+    return np.concatenate([lo, lo + rng.uniform(0, size, (n, 3))], axis=1)
+
+
+def _brute_force(boxes: np.ndarray) -> list[tuple[int, int]]:
+    return [
+        (i, j)
+        for i in range(len(boxes))
+        for j in range(i + 1, len(boxes))
+        if np.all(boxes[i, :3] <= boxes[j, 3:]) and np.all(boxes[j, :3] <= boxes[i, 3:])
+    ]
+
+
+@pytest.mark.parametrize("seed", range(5))
+@pytest.mark.parametrize("n, extent, size", [(2, 10, 8), (50, 100, 15), (300, 500, 40)])
+def test_candidate_pairs_match_brute_force(seed, n, extent, size):
+    boxes = _random_boxes(np.random.default_rng(seed), n, extent, size)
+    assert candidate_pairs(boxes) == _brute_force(boxes)
+
+
+def test_candidate_pairs_touching_and_identical():
+    boxes = np.array([
+        [0, 0, 0, 1, 1, 1],
+        [1, 0, 0, 2, 1, 1],  # shares a face with 0
+        [0, 0, 0, 1, 1, 1],  # same as 0
+        [5, 5, 5, 6, 6, 6],
+    ], dtype=float)
+    assert candidate_pairs(boxes) == [(0, 1), (0, 2), (1, 2)]
+
+
+@pytest.mark.parametrize("n", [0, 1])
+def test_candidate_pairs_too_few(n):
+    assert candidate_pairs(np.zeros((n, 6))) == []
+
+
+def test_summarize_reports_failed_checks():
+    parts = [PlacedPart(1300, f"part{k}", k, None) for k in range(3)] + [
+        PlacedPart(1400, "arm", 3, None)
+    ]
+    contacts = [
+        Contact(0, 3, 0.0, 25.0),  # collision
+        Contact(1, 3, 0.5, 0.0),
+        Contact(2, 3, float("nan"), 0.0),  # exact check failed
+    ]
+    entry = summarize(parts, contacts)[(1300, 1400)]
+    assert entry["collisions"] == [{"parts": ["part0", "arm"], "overlap_mm3": 25.0}]
+    assert entry["failed"] == [["part2", "arm"]]
+    assert entry["min_clearance"] == 0.5
+
+
+def test_summarize_failed_only():
+    parts = [PlacedPart(1300, "a", 0, None), PlacedPart(1300, "b", 1, None)]
+    entry = summarize(parts, [Contact(0, 1, float("nan"), 0.0)])[(1300, 1300)]
+    assert entry["failed"] == [["a", "b"]]
+    assert entry["min_clearance"] is None
@@ -0,0 +1,60 @@
+"""Tests for placement manifest validation in quiver.manifest."""
+
+import pytest
+
+pytest.importorskip("build123d")
+
+from quiver.manifest import MANIFEST_FILE, load_manifest
+
+
+def _write(directory, text):
+    (directory / MANIFEST_FILE).write_text(text)
+    return directory
+
+
+VALID = """
+label = "Attachment Interface"
+
+[[part]]
+file = "2112_attach_plate"
+color = "ALUMINUM"
+volume_mode = "true"
+max_solids = 20
+
+[[part.instance]]
+rotate = [["Z", 90], ["X", 180]]
+com = [185.65, -0.02, -71.00]
+mirror = "YZ"
+"""
+
+
+def test_valid_manifest(tmp_path):
+    manifest = load_manifest(_write(tmp_path, VALID))
+    assert manifest["label"] == "Attachment Interface"
+    assert manifest["part"][0]["instance"][0]["mirror"] == "YZ"
+
+
+def test_missing_manifest(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        load_manifest(tmp_path)
+
+
+@pytest.mark.parametrize(
+    "part, instance, message",
+    [
+        ('colour = "PETG"', "", "unknown keys"),
+        ('color = "GOLD"', "", "unknown color"),
+        ('volume_mode = "mesh"', "", "unknown volume_mode"),
+        ("", "offset = [0, 0, 1]", "unknown keys"),
+        ("", "com = [0, 0, 0]\nmove = [0, 0, 1]", "both com and move"),
+        ("", 'rotate = [["W", 90]]', "unknown axis"),
+        ("", 'mirror = "XX"', "unknown plane"),
+    ],
+)
+def test_invalid_manifest(tmp_path, part, instance, message):
+    text = f'label = "Test"\n\n[[part]]\nfile = "1330_main_adapter"\n{part}\n'
+    if instance:
+        text += f"\n[[part.instance]]\n{instance}\n"
+    with pytest.raises(ValueError, match=message) as error:
+        load_manifest(_write(tmp_path, text))
+    assert "1330_main_adapter" in str(error.value)
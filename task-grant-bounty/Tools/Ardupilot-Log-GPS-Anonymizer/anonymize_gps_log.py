@@ -1,40 +1,469 @@
-def anonymize_gps_log(input_path, output_path):
-    with open(input_path, 'r') as f:
-        lines = f.readlines()
-
-    output_lines = []
-
-    # Confirmed field index mapping from your log
-    field_indices = {
-        "GPS":   {"Lat": 7, "Lng": 8, "Alt": 9},
-        "AHR2":  {"Lat": 6, "Lng": 7},
-        "EAHR":  {"Lat": 5, "Lng": 6},  # assumed
-        "POS":   {"Lat": 2, "Lng": 3},  # ✅ corrected
-        "TERR":  {"Lat": 3, "Lng": 4},  # ✅ corrected
-        "ORGN":  {"Lat": 3, "Lng": 4}
-    }
+"""Zero GPS-related location fields in ArduPilot logs.
+
+Which columns to zero is read from each log's own schema rather than
+hard-coded, so firmware that adds or reorders columns is handled:
+
+    FMT     the column names of every message type
+    FMTU    each column's unit id
+    UNIT    what each unit id means
+
+The columns named in LOCATION_FIELDS are zeroed. With
+--all-location-units (units=LOCATION_UNITS), so is any column of any
+message type whose unit is latitude or longitude: mission items (CMD),
+camera triggers, fences, rally points and the like. LocationSchema turns
+these definitions into a list of column indices per message type, once
+per definition.
+
+Text .log files (converted by Mission Planner) are streamed line by line
+through buffered I/O, so memory use stays flat however long the flight
+was. Each line's message type (the text before the first comma) is
+looked up once in a dispatch table of per-type rewriters, compiled from
+the schema; a rewriter only splits a line up to its last target column.
+Every other line is copied through unchanged.
+
+Binary DataFlash .BIN files are anonymized directly, without converting
+them to text: the file is copied as is, memory-mapped, and the target
+columns are zeroed in place at their byte offsets (the reader is
+quiver/dataflash.py under src/, shared with quiver.flightlog). All other
+records are never touched, and the result is still a valid .BIN.
+
+A directory is anonymized as a batch: every .BIN and .log file below it
+is written to the same relative path under the output directory, by a
+process pool. A manifest in the output directory records the SHA-256 of
+each input and output and of this tool's source, plus the units option,
+so a re-run only processes the files that were added or changed (or
+whose output was modified), and everything is redone when the
+anonymization rules change.
+
+Usage:
+    python anonymize_gps_log.py flight.log                 # writes flight-anonymized.log
+    python anonymize_gps_log.py 00000077.BIN               # writes 00000077-anonymized.BIN
+    python anonymize_gps_log.py flight.log -o shared.log
+    python anonymize_gps_log.py flight-test/ -o public/ -j 8
+    python anonymize_gps_log.py flight.log --all-location-units  # also CMD, CAM, ...
+
+Or from Python:
+    from anonymize_gps_log import anonymize_gps_log
+    anonymize_gps_log("flight.log", "shared.log")
+"""
+
+import argparse
+import hashlib
+import json
+import mmap
+import os
+import shutil
+import sys
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+# The DataFlash reader is shared with quiver.flightlog. It is stdlib-only,
+# so it is taken from this checkout's src/ when quiver isn't installed.
+sys.path.append(str(Path(__file__).resolve().parents[3] / "src"))
+
+from quiver import dataflash
+from quiver.dataflash import FMT_TYPE, iter_records, parse_fmt
+
+# Columns zeroed by name, per message type. EAHR names its longitude "Lon".
+LOCATION_FIELDS = {
+    msg: ("Lat", "Lng", "Lon", "Alt")
+    for msg in ("GPS", "GPS2", "AHR2", "EAHR", "POS", "TERR", "ORGN")
+}
+
+# Columns in these units (UNIT labels), zeroed in every message type on request
+LOCATION_UNITS = ("deglatitude", "deglongitude")
+
+# Unit ids of LOCATION_UNITS, for logs without UNIT records
+DEFAULT_UNIT_IDS = {"D": "deglatitude", "U": "deglongitude"}
+
+# Text logs only: column of each location field for message types with
+# no FMT line, counting the message name as column 0
+FIELD_INDICES = {
+    "GPS":   {"Lat": 7, "Lng": 8, "Alt": 9},
+    "GPS2":  {"Lat": 7, "Lng": 8, "Alt": 9},
+    "AHR2":  {"Lat": 6, "Lng": 7},
+    "EAHR":  {"Lat": 5, "Lng": 6},
+    "POS":   {"Lat": 2, "Lng": 3},
+    "TERR":  {"Lat": 3, "Lng": 4},
+    "ORGN":  {"Lat": 3, "Lng": 4},
+}
+
+# Read and write buffer size (bytes)
+BUFFER_SIZE = 1 << 20
+
+# Batch mode: files picked up, and the manifest written to the output directory
+LOG_SUFFIXES = (".bin", ".log")
+MANIFEST_NAME = "anonymize-manifest.json"
+
+# Source files whose contents decide the output, for the manifest
+_SOURCES = (Path(__file__).resolve(), Path(dataflash.__file__).resolve())
+
+ZERO = "0"
+
+
+class LocationSchema:
+    """The columns to zero per message type, from a log's FMT/FMTU/UNIT."""
+
+    def __init__(self, fields=LOCATION_FIELDS, units=()):
+        self.fields = fields
+        self.location_units = set(units)
+        self.names = {}  # type id -> message name
+        self.columns = {}  # message name -> column names
+        self.units = {}  # message name -> unit ids, one per column
+        self.unit_labels = dict(DEFAULT_UNIT_IDS)
+        self.version = 0  # bumped on every definition, to invalidate caches
+
+    def define(self, type_id, name, columns):
+        """Record a FMT definition."""
+        self.names[type_id] = name
+        self.columns[name] = tuple(columns)
+        self.version += 1
+
+    def define_units(self, type_id, unit_ids):
+        """Record a FMTU definition (unit ids of a message's columns)."""
+        name = self.names.get(type_id)
+        if name is not None:
+            self.units[name] = unit_ids
+            self.version += 1
+
+    def define_unit(self, unit_id, label):
+        """Record a UNIT definition."""
+        self.unit_labels[unit_id] = label
+        self.version += 1
+
+    def targets(self, name):
+        """Return the indices (into the FMT columns) to zero, or None if undefined."""
+        columns = self.columns.get(name)
+        if columns is None:
+            return None
+        wanted = self.fields.get(name, ())
+        units = self.units.get(name, "")
+        return tuple(
+            index for index, column in enumerate(columns)
+            if column in wanted
+            or (index < len(units)
+                and self.unit_labels.get(units[index]) in self.location_units)
+        )
+
+
+def _compile(indices):
+    """Return a function zeroing the given columns of a text line body.
+
+    The line is only split up to its last target column; the rest stays
+    one string.
+    """
+    last = max(indices)
+
+    def rewrite(body):
+        parts = body.split(",", last + 1)
+        for index in indices:
+            if index < len(parts):
+                parts[index] = ZERO
+        return ",".join(parts)
+
+    return rewrite
+
+
+def _fields(line):
+    return [part.strip() for part in line.rstrip("\r\n").split(",")]
+
+
+def _unit_id(text):
+    """Return a UNIT/FMTU id as a character, whether printed as one or as a number."""
+    return chr(int(text)) if text.lstrip("-").isdigit() else text
+
+
+def anonymize_lines(lines, counts=None, fields=LOCATION_FIELDS, units=()):
+    """Yield the lines of a text log with the location fields zeroed.
+
+    Args:
+        lines: Iterable of log lines, with or without line endings.
+        counts: Optional Counter, incremented per rewritten message type.
+        fields: Column names to zero, by message type.
+        units: UNIT labels whose columns are zeroed in every message type
+            (e.g. LOCATION_UNITS).
+    """
+    schema = LocationSchema(fields, units)
+
+    def on_fmt(line):
+        # FMT, Type, Length, Name, Format, Columns...
+        values = _fields(line)
+        if len(values) > 5 and values[1].isdigit():
+            schema.define(int(values[1]), values[3], values[5:])
+
+    def on_fmtu(line):
+        # FMTU, TimeUS, FmtType, UnitIds, MultIds
+        values = _fields(line)
+        if len(values) > 3 and values[2].isdigit():
+            schema.define_units(int(values[2]), values[3])
+
+    def on_unit(line):
+        # UNIT, TimeUS, Id, Label
+        values = _fields(line)
+        if len(values) > 3:
+            schema.define_unit(_unit_id(values[2]), values[3])
+
+    handlers = {"FMT": on_fmt, "FMTU": on_fmtu, "UNIT": on_unit}
+    # Message type -> handler (schema lines), rewriter or None (copy as is)
+    dispatch = {}
+    version = schema.version
+    warned = set()
+
+    def resolve(msg_type):
+        indices = schema.targets(msg_type)
+        if indices is None and msg_type in FIELD_INDICES:
+            if msg_type not in warned:
+                warned.add(msg_type)
+                print(f"warning: no FMT line for {msg_type}, using fixed column indices",
+                      file=sys.stderr)
+            indices = tuple(i - 1 for i in FIELD_INDICES[msg_type].values())
+        # Text columns count the message name as column 0
+        return _compile([i + 1 for i in indices]) if indices else None
 
     for line in lines:
-        line_stripped = line.strip()
-        for msg_type, fields in field_indices.items():
-            if line_stripped.startswith(msg_type):
-                parts = line_stripped.split(',')
-                try:
-                    for field_name, index in fields.items():
-                        if len(parts) > index:
-                            parts[index] = "0"
-                    line = ','.join(parts) + '\n'
-                except IndexError:
-                    pass
-                break  # don't process the same line more than once
-        output_lines.append(line)
+        head, sep, _ = line.partition(",")
+        msg_type = head.strip()
+        if schema.version != version:
+            dispatch.clear()
+            version = schema.version
+        try:
+            rewrite = dispatch[msg_type]
+        except KeyError:
+            rewrite = dispatch[msg_type] = handlers.get(msg_type) or resolve(msg_type)
+        if rewrite is None or not sep:
+            yield line
+        elif msg_type in handlers:
+            rewrite(line)
+            yield line
+        else:
+            if counts is not None:
+                counts[msg_type] += 1
+            body = line.rstrip("\r\n")
+            yield rewrite(body) + line[len(body):]
+
+
+def anonymize_gps_log(input_path, output_path, fields=LOCATION_FIELDS, units=()):
+    """Write an anonymized copy of a text log.
+
+    Args:
+        input_path: ArduPilot .log file (e.g. converted by Mission Planner).
+        output_path: Where to write the anonymized log.
+        fields: Column names to zero, by message type.
+        units: UNIT labels whose columns are zeroed in every message type.
+
+    Returns:
+        Counter of the lines rewritten per message type.
+    """
+    counts = Counter()
+    # newline="" keeps line endings as they are; surrogateescape passes
+    # through any stray non-UTF-8 bytes unchanged
+    with open(input_path, "r", encoding="utf-8", errors="surrogateescape",
+              newline="", buffering=BUFFER_SIZE) as src, \
+         open(output_path, "w", encoding="utf-8", errors="surrogateescape",
+              newline="", buffering=BUFFER_SIZE) as dst:
+        dst.writelines(anonymize_lines(src, counts, fields, units))
+    return counts
+
+
+def anonymize_bin(input_path, output_path, fields=LOCATION_FIELDS, units=()):
+    """Write an anonymized copy of a binary DataFlash log.
+
+    Args:
+        input_path: ArduPilot .BIN file.
+        output_path: Where to write the anonymized log.
+        fields: Column names to zero, by message type.
+        units: UNIT labels whose columns are zeroed in every message type.
+
+    Returns:
+        Counter of the records rewritten per message type.
+    """
+    counts = Counter()
+    shutil.copyfile(input_path, output_path)
+    with open(output_path, "r+b") as f:
+        if Path(output_path).stat().st_size == 0:
+            return counts
+        with mmap.mmap(f.fileno(), 0) as buf:
+            schema = LocationSchema(fields, units)
+            # Message type -> (start, stop, zeros) byte ranges to write
+            targets = {}
+            version = schema.version
+            for pos, fmt in iter_records(buf):
+                if fmt.type == FMT_TYPE:
+                    declared = parse_fmt(buf, pos)
+                    schema.define(declared.type, declared.name, declared.columns)
+                elif fmt.name == "FMTU":
+                    record = fmt.unpack(buf, pos)
+                    schema.define_units(record["FmtType"], record["UnitIds"])
+                elif fmt.name == "UNIT":
+                    record = fmt.unpack(buf, pos)
+                    schema.define_unit(chr(record["Id"] & 0xFF), record["Label"])
+                if schema.version != version:
+                    targets.clear()
+                    version = schema.version
+                ranges = targets.get(fmt.type)
+                if ranges is None:
+                    slices = fmt.column_slices()
+                    ranges = targets[fmt.type] = tuple(
+                        (slices[i].start, slices[i].stop, bytes(slices[i].stop - slices[i].start))
+                        for i in schema.targets(fmt.name) or ()
+                        if i < len(slices)
+                    )
+                if ranges:
+                    for start, stop, zeros in ranges:
+                        buf[pos + start:pos + stop] = zeros
+                    counts[fmt.name] += 1
+            buf.flush()
+    return counts
+
+
+def anonymize(input_path, output_path, units=()):
+    """Anonymize a .BIN or text .log file, chosen by its extension."""
+    if Path(input_path).suffix.lower() == ".bin":
+        return anonymize_bin(input_path, output_path, units=units)
+    return anonymize_gps_log(input_path, output_path, units=units)
+
+
+def file_sha256(path):
+    """Return the SHA-256 hex digest of a file, read in BUFFER_SIZE chunks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(BUFFER_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def tool_version():
+    """Return a hash of this tool's source, which decides every output."""
+    digest = hashlib.sha256()
+    for source in _SOURCES:
+        digest.update(source.read_bytes())
+    return digest.hexdigest()[:16]
+
+
+def find_logs(root, exclude=None):
+    """Return every .BIN/.log file below `root`, sorted, skipping `exclude`."""
+    root, exclude = Path(root), Path(exclude).resolve() if exclude else None
+    logs = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        if exclude is not None and Path(dirpath).resolve() == exclude:
+            dirnames.clear()
+            continue
+        logs.extend(
+            Path(dirpath) / name for name in filenames
+            if Path(name).suffix.lower() in LOG_SUFFIXES
+        )
+    return sorted(logs)
+
+
+def _anonymize_entry(src, dst, previous, version, units=()):
+    """Anonymize one file of a batch unless its manifest entry is current.
+
+    Returns:
+        (manifest entry, True if the file was processed or False if skipped)
+    """
+    digest = file_sha256(src)
+    if (
+        previous
+        and previous.get("tool") == version
+        and previous.get("units", []) == list(units)
+        and previous.get("input_sha256") == digest
+        and dst.exists()
+        and file_sha256(dst) == previous.get("output_sha256")
+    ):
+        return previous, False
+    dst.parent.mkdir(parents=True, exist_ok=True)
+    counts = anonymize(src, dst, units)
+    entry = {
+        "input_sha256": digest,
+        "output_sha256": file_sha256(dst),
+        "tool": version,
+        "units": list(units),
+        "rewritten": dict(sorted(counts.items())),
+    }
+    return entry, True
+
+
+def anonymize_tree(input_dir, output_dir, jobs=None, units=()):
+    """Anonymize every log below a directory into a mirrored tree.
+
+    Args:
+        input_dir: Directory to search for .BIN and .log files.
+        output_dir: Where to write them, at the same relative paths.
+        jobs: Worker processes (default: one per CPU).
+        units: UNIT labels whose columns are zeroed in every message type;
+            files anonymized with other units are redone.
+
+    Returns:
+        (processed, skipped) relative paths.
+    """
+    input_dir, output_dir = Path(input_dir), Path(output_dir)
+    manifest_path = output_dir / MANIFEST_NAME
+    try:
+        previous = json.loads(manifest_path.read_text())["files"]
+    except (FileNotFoundError, KeyError, ValueError):
+        previous = {}
+    version = tool_version()
+    logs = find_logs(input_dir, exclude=output_dir)
+    names = [src.relative_to(input_dir).as_posix() for src in logs]
+
+    processed, skipped, files = [], [], {}
+    with ProcessPoolExecutor(jobs) as pool:
+        futures = [
+            pool.submit(
+                _anonymize_entry, src, output_dir / name, previous.get(name), version, units
+            )
+            for src, name in zip(logs, names)
+        ]
+        for name, future in zip(names, futures):
+            files[name], done = future.result()
+            (processed if done else skipped).append(name)
 
-    with open(output_path, 'w') as f:
-        f.writelines(output_lines)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    partial = manifest_path.with_suffix(".tmp")
+    partial.write_text(json.dumps({"tool": version, "files": files}, indent=2) + "\n")
+    partial.replace(manifest_path)
+    return processed, skipped
 
-    print(f"✅ All GPS-related fields zeroed: {output_path}")
 
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Zero GPS-related location fields in ArduPilot .BIN or .log files"
+    )
+    parser.add_argument(
+        "input", type=Path, help="ArduPilot .BIN or text .log file, or a directory of them"
+    )
+    parser.add_argument(
+        "-o", "--output", type=Path,
+        help="Output file or directory (default: <input>-anonymized next to the input)",
+    )
+    parser.add_argument(
+        "-j", "--jobs", type=int, help="Directories: worker processes (default: one per CPU)"
+    )
+    parser.add_argument(
+        "--all-location-units", action="store_true",
+        help="Also zero every latitude/longitude-unit column of every message type "
+        "(mission items, camera triggers, fences, rally points, ...)",
+    )
+    args = parser.parse_args(argv)
+    units = LOCATION_UNITS if args.all_location_units else ()
 
+    source = args.input.resolve()
+    output = args.output or source.with_name(f"{source.stem}-anonymized{source.suffix}")
+    if output.resolve() == source:
+        parser.error("output would overwrite the input")
+    if args.input.is_dir():
+        processed, skipped = anonymize_tree(args.input, output, args.jobs, units)
+        for name in processed:
+            print(f"  {name}")
+        print(f"{len(processed)} logs anonymized, {len(skipped)} up to date: {output}")
+        return 0
+    counts = anonymize(args.input, output, units)
+    for msg_type, count in sorted(counts.items()):
+        print(f"  {msg_type:<5} {count}")
+    print(f"All GPS-related fields zeroed: {output}")
+    return 0
 
 
-anonymize_gps_log("2025-04-25 13-29-57.log", "007-2025-04-25 13-29-57.log")
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,349 @@
+"""Tests for anonymize_gps_log on small synthetic logs.
+
+Run from this directory:
+    python -m pytest test_anonymize_gps_log.py
+"""
+
+import json
+import struct
+from collections import Counter
+
+import pytest
+
+import anonymize_gps_log as tool
+from anonymize_gps_log import (
+    LOCATION_UNITS,
+    MANIFEST_NAME,
+    anonymize,
+    anonymize_bin,
+    anonymize_gps_log,
+    anonymize_lines,
+    anonymize_tree,
+    main,
+)
+from quiver.dataflash import FMT_STRUCT, FMT_TYPE, FORMAT_CODES, HEAD, iter_records
+
+# Synthetic message types: (type id, name, format, columns)
+GPS = (130, "GPS", "QBLLe", ("TimeUS", "Status", "Lat", "Lng", "Alt"))
+ATT = (131, "ATT", "Qcc", ("TimeUS", "Roll", "Pitch"))
+
+LAT, LNG, ALT = -353632610, 1491652370, 58420
+
+
+def _length(format_):
+    return 3 + struct.calcsize("<" + "".join(FORMAT_CODES[char] for char in format_))
+
+
+def fmt_record(message):
+    type_, name, format_, columns = message
+    return HEAD + bytes([FMT_TYPE]) + FMT_STRUCT.pack(
+        type_, _length(format_), name.encode(), format_.encode(), ",".join(columns).encode()
+    )
+
+
+def record(message, *values):
+    type_, _, format_, _ = message
+    codes = "".join(FORMAT_CODES[char] for char in format_)
+    return HEAD + bytes([type_]) + struct.pack("<" + codes, *values)
+
+
+def decode(data):
+    """Return [(name, {column: value})] for every non-FMT record of a log."""
+    return [
+        (fmt.name, fmt.unpack(data, pos))
+        for pos, fmt in iter_records(data)
+        if fmt.type != FMT_TYPE
+    ]
+
+
+def bin_log():
+    return b"".join([
+        fmt_record(GPS),
+        fmt_record(ATT),
+        record(GPS, 1000, 3, LAT, LNG, ALT),
+        record(ATT, 1010, 150, -20),
+        record(GPS, 1200, 3, LAT + 5, LNG - 5, ALT + 1),
+    ])
+
+
+def text_log():
+    return [
+        "FMT, 130, 23, GPS, QBLLe, TimeUS,Status,Lat,Lng,Alt\n",
+        "FMT, 131, 7, ATT, Qcc, TimeUS,Roll,Pitch\n",
+        f"GPS, 1000, 3, {LAT * 1e-7:.7f}, {LNG * 1e-7:.7f}, {ALT / 100}\n",
+        "ATT, 1010, 1.5, -0.2\n",
+        f"GPS, 1200, 3, {LAT * 1e-7:.7f}, {LNG * 1e-7:.7f}, {ALT / 100}\r\n",
+    ]
+
+
+def values(line):
+    return [part.strip() for part in line.rstrip("\r\n").split(",")]
+
+
+def test_bin_zeroes_location_fields(tmp_path):
+    src, dst = tmp_path / "00000001.BIN", tmp_path / "out.BIN"
+    src.write_bytes(bin_log())
+    counts = anonymize_bin(src, dst)
+    assert counts == {"GPS": 2}
+    original, anonymized = src.read_bytes(), dst.read_bytes()
+    assert len(anonymized) == len(original)
+    records = decode(anonymized)
+    assert [name for name, _ in records] == ["GPS", "ATT", "GPS"]
+    for (name, before), (_, after) in zip(decode(original), records):
+        if name == "GPS":
+            assert (after["Lat"], after["Lng"], after["Alt"]) == (0, 0, 0)
+            assert (after["TimeUS"], after["Status"]) == (before["TimeUS"], before["Status"])
+        else:
+            assert after == before
+
+
+def test_bin_leaves_other_bytes_alone(tmp_path):
+    src, dst = tmp_path / "00000001.BIN", tmp_path / "out.BIN"
+    src.write_bytes(bin_log())
+    anonymize_bin(src, dst)
+    original, anonymized = src.read_bytes(), dst.read_bytes()
+    changed = [i for i, (a, b) in enumerate(zip(original, anonymized)) if a != b]
+    gps = [pos for pos, fmt in iter_records(original) if fmt.name == "GPS"]
+    # Lat, Lng, Alt: 12 bytes from offset 3 + 8 + 1 of each GPS record
+    allowed = {pos + 12 + k for pos in gps for k in range(12)}
+    assert changed and set(changed) <= allowed
+
+
+def test_bin_tolerates_garbage_and_truncation(tmp_path):
+    src, dst = tmp_path / "00000001.BIN", tmp_path / "out.BIN"
+    log = bin_log()
+    src.write_bytes(b"\x00junk" + log + record(GPS, 1300, 3, LAT, LNG, ALT)[:-4])
+    assert anonymize_bin(src, dst) == {"GPS": 2}
+    assert dst.stat().st_size == src.stat().st_size
+
+
+def test_empty_bin(tmp_path):
+    src, dst = tmp_path / "00000001.BIN", tmp_path / "out.BIN"
+    src.write_bytes(b"")
+    assert anonymize_bin(src, dst) == {}
+    assert dst.read_bytes() == b""
+
+
+def test_text_zeroes_location_fields():
+    lines = text_log()
+    counts = Counter()
+    out = list(anonymize_lines(lines, counts))
+    assert counts == {"GPS": 2}
+    assert out[:2] == lines[:2]
+    assert values(out[2]) == ["GPS", "1000", "3", "0", "0", "0"]
+    assert out[3] == lines[3]
+    assert values(out[4]) == ["GPS", "1200", "3", "0", "0", "0"]
+    assert out[4].endswith("\r\n")
+
+
+def test_text_file_round_trip(tmp_path):
+    src, dst = tmp_path / "flight.log", tmp_path / "out.log"
+    src.write_bytes("".join(text_log()).encode())
+    assert anonymize_gps_log(src, dst) == {"GPS": 2}
+    out = dst.read_bytes().decode().splitlines(keepends=True)
+    assert len(out) == len(text_log())
+    assert all(values(line)[3:] == ["0", "0", "0"] for line in out if line.startswith("GPS"))
+
+
+def test_dispatch_by_extension(tmp_path):
+    (tmp_path / "a.BIN").write_bytes(bin_log())
+    (tmp_path / "a.log").write_text("".join(text_log()))
+    assert anonymize(tmp_path / "a.BIN", tmp_path / "b.BIN") == {"GPS": 2}
+    assert anonymize(tmp_path / "a.log", tmp_path / "b.log") == {"GPS": 2}
+
+
+# Schema-driven column resolution
+
+CMD = (132, "CMD", "QHLL", ("TimeUS", "CNum", "Lat", "Lng"))
+FMTU = (133, "FMTU", "QBNN", ("TimeUS", "FmtType", "UnitIds", "MultIds"))
+UNIT = (134, "UNIT", "QbZ", ("TimeUS", "Id", "Label"))
+
+
+def test_bin_columns_by_name_not_position(tmp_path):
+    reordered = (130, "GPS", "QeLLB", ("TimeUS", "Alt", "Lng", "Lat", "Status"))
+    src, dst = tmp_path / "00000001.BIN", tmp_path / "out.BIN"
+    src.write_bytes(fmt_record(reordered) + record(reordered, 1000, ALT, LNG, LAT, 3))
+    assert anonymize_bin(src, dst) == {"GPS": 1}
+    [(_, after)] = decode(dst.read_bytes())
+    assert after == {"TimeUS": 1000, "Alt": 0, "Lng": 0, "Lat": 0, "Status": 3}
+
+
+def test_bin_columns_by_unit(tmp_path):
+    src, dst = tmp_path / "00000001.BIN", tmp_path / "out.BIN"
+    src.write_bytes(b"".join([
+        fmt_record(CMD),
+        fmt_record(FMTU),
+        record(FMTU, 0, CMD[0], b"s-DU", b"F---"),
+        record(CMD, 1000, 7, LAT, LNG),
+    ]))
+    assert anonymize_bin(src, dst, units=LOCATION_UNITS) == {"CMD": 1}
+    assert decode(dst.read_bytes())[-1] == ("CMD", {"TimeUS": 1000, "CNum": 7, "Lat": 0, "Lng": 0})
+
+
+def test_bin_units_are_opt_in(tmp_path):
+    src, dst = tmp_path / "00000001.BIN", tmp_path / "out.BIN"
+    src.write_bytes(b"".join([
+        fmt_record(CMD),
+        fmt_record(FMTU),
+        record(FMTU, 0, CMD[0], b"s-DU", b"F---"),
+        record(CMD, 1000, 7, LAT, LNG),
+    ]))
+    assert anonymize_bin(src, dst) == {}
+    assert dst.read_bytes() == src.read_bytes()
+
+
+def test_bin_unit_records_define_unit_ids(tmp_path):
+    src, dst = tmp_path / "00000001.BIN", tmp_path / "out.BIN"
+    src.write_bytes(b"".join([
+        fmt_record(CMD),
+        fmt_record(FMTU),
+        fmt_record(UNIT),
+        record(UNIT, 0, ord("x"), b"deglatitude"),
+        record(UNIT, 0, ord("D"), b"m"),  # D no longer means latitude
+        record(FMTU, 0, CMD[0], b"s-xD", b"F---"),
+        record(CMD, 1000, 7, LAT, LNG),
+    ]))
+    anonymize_bin(src, dst, units=LOCATION_UNITS)
+    assert decode(dst.read_bytes())[-1][1] == {"TimeUS": 1000, "CNum": 7, "Lat": 0, "Lng": LNG}
+
+
+def test_text_columns_by_unit():
+    lines = [
+        "FMT, 132, 15, CMD, QHLL, TimeUS,CNum,Lat,Lng\n",
+        "UNIT, 0, 120, deglatitude\n",  # id printed as a number ('x')
+        "FMTU, 0, 132, s-xU, F---\n",
+        "CMD, 1000, 7, -35.3632610, 149.1652370\n",
+    ]
+    out = list(anonymize_lines(lines, units=LOCATION_UNITS))
+    assert out[:3] == lines[:3]
+    assert values(out[3]) == ["CMD", "1000", "7", "0", "0"]
+    assert list(anonymize_lines(lines)) == lines
+
+
+def test_text_columns_by_name_not_position():
+    lines = [
+        "FMT, 130, 23, GPS, QeLLB, TimeUS,Alt,Lng,Lat,Status\n",
+        "GPS, 1000, 584.2, 149.1652370, -35.3632610, 3\n",
+    ]
+    out = list(anonymize_lines(lines))
+    assert values(out[1]) == ["GPS", "1000", "0", "0", "0", "3"]
+
+
+def test_text_without_fmt_uses_fixed_indices(capsys):
+    line = "GPS, 1000, 3, 0, 0, 2, 17, -35.3632610, 149.1652370, 584.2, 0.1\n"
+    out = list(anonymize_lines([line, line]))
+    assert values(out[0])[7:10] == ["0", "0", "0"]
+    assert values(out[0])[:7] == values(line)[:7]
+    assert values(out[0])[10] == "0.1"
+    assert capsys.readouterr().err.count("no FMT line for GPS") == 1
+
+
+def test_custom_fields():
+    out = list(anonymize_lines(text_log(), fields={"GPS": ("Alt",), "ATT": ("Roll",)}))
+    lat = f"{LAT * 1e-7:.7f}"
+    assert values(out[2])[3:] == [lat, f"{LNG * 1e-7:.7f}", "0"]
+    assert values(out[3]) == ["ATT", "1010", "0", "-0.2"]
+
+
+# Batch mode
+
+
+@pytest.fixture
+def campaign(tmp_path):
+    """A flight-test tree with .BIN and .log files in nested folders."""
+    root = tmp_path / "flight-test"
+    for name in ("001/logs/00000001.BIN", "001/logs/00000002.bin", "002/00000003.BIN"):
+        (root / name).parent.mkdir(parents=True, exist_ok=True)
+        (root / name).write_bytes(bin_log())
+    (root / "002/flight.log").write_text("".join(text_log()))
+    (root / "002/notes.txt").write_text("not a log\n")
+    return root
+
+
+LOGS = ["001/logs/00000001.BIN", "001/logs/00000002.bin", "002/00000003.BIN", "002/flight.log"]
+
+
+def test_batch_mirrors_tree(campaign, tmp_path):
+    out = tmp_path / "public"
+    processed, skipped = anonymize_tree(campaign, out, jobs=2)
+    assert (sorted(processed), skipped) == (LOGS, [])
+    assert not (out / "002/notes.txt").exists()
+    for name in LOGS:
+        assert (out / name).read_bytes() != (campaign / name).read_bytes()
+    assert (out / LOGS[0]).read_bytes() == (out / LOGS[2]).read_bytes()
+    manifest = json.loads((out / MANIFEST_NAME).read_text())
+    assert sorted(manifest["files"]) == LOGS
+    assert manifest["files"]["002/flight.log"]["rewritten"] == {"GPS": 2}
+
+
+def test_batch_skips_up_to_date_files(campaign, tmp_path):
+    out = tmp_path / "public"
+    anonymize_tree(campaign, out, jobs=1)
+    before = (out / MANIFEST_NAME).read_text()
+    assert anonymize_tree(campaign, out, jobs=1) == ([], LOGS)
+    assert (out / MANIFEST_NAME).read_text() == before
+
+
+def test_batch_redoes_changed_files(campaign, tmp_path):
+    out = tmp_path / "public"
+    anonymize_tree(campaign, out, jobs=1)
+    (campaign / LOGS[0]).write_bytes(bin_log() + record(GPS, 1300, 3, LAT, LNG, ALT))
+    (out / LOGS[1]).write_bytes(b"tampered")
+    (out / LOGS[2]).unlink()
+    processed, skipped = anonymize_tree(campaign, out, jobs=1)
+    assert (processed, skipped) == (LOGS[:3], LOGS[3:])
+    assert (out / LOGS[1]).read_bytes() != b"tampered"
+    assert (out / LOGS[2]).exists()
+
+
+def test_batch_redoes_everything_for_a_new_tool_version(campaign, tmp_path, monkeypatch):
+    out = tmp_path / "public"
+    anonymize_tree(campaign, out, jobs=1)
+    monkeypatch.setattr(tool, "tool_version", lambda: "0123456789abcdef")
+    assert anonymize_tree(campaign, out, jobs=1) == (LOGS, [])
+
+
+def test_batch_skips_its_own_output(campaign):
+    out = campaign / "public"
+    anonymize_tree(campaign, out, jobs=1)
+    processed, skipped = anonymize_tree(campaign, out, jobs=1)
+    assert (processed, skipped) == ([], LOGS)
+
+
+def test_batch_ignores_a_corrupt_manifest(campaign, tmp_path):
+    out = tmp_path / "public"
+    anonymize_tree(campaign, out, jobs=1)
+    (out / MANIFEST_NAME).write_text("{not json")
+    assert anonymize_tree(campaign, out, jobs=1) == (LOGS, [])
+
+
+def test_cli_directory(campaign, tmp_path, capsys):
+    out = tmp_path / "public"
+    assert main([str(campaign), "-o", str(out), "-j", "1"]) == 0
+    assert "4 logs anonymized, 0 up to date" in capsys.readouterr().out
+
+
+def test_batch_redoes_files_for_other_units(campaign, tmp_path):
+    out = tmp_path / "public"
+    anonymize_tree(campaign, out, jobs=1)
+    assert anonymize_tree(campaign, out, jobs=1, units=LOCATION_UNITS) == (LOGS, [])
+    manifest = json.loads((out / MANIFEST_NAME).read_text())
+    assert manifest["files"][LOGS[0]]["units"] == list(LOCATION_UNITS)
+
+
+def test_cli_all_location_units(tmp_path):
+    src, dst = tmp_path / "flight.log", tmp_path / "out.log"
+    src.write_text(
+        "FMT, 132, 15, CMD, QHLL, TimeUS,CNum,Lat,Lng\n"
+        "FMTU, 0, 132, s-DU, F---\n"
+        "CMD, 1000, 7, -35.3632610, 149.1652370\n"
+    )
+    main([str(src), "-o", str(dst)])
+    assert dst.read_text() == src.read_text()
+    main([str(src), "-o", str(dst), "--all-location-units"])
+    assert values(dst.read_text().splitlines()[2]) == ["CMD", "1000", "7", "0", "0"]
+
+
+def test_cli_refuses_to_overwrite_input(campaign):
+    with pytest.raises(SystemExit):
+        main([str(campaign / LOGS[0]), "-o", str(campaign / LOGS[0])])